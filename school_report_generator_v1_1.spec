@@ -6,7 +6,7 @@ a = Analysis(
     pathex=['d:\\CNE_DNI\\src\\measure'],
     binaries=[],
     datas=[],
-    hiddenimports=['school_report_config_v1_1'],
+    hiddenimports=['school_report_config_v1_1', 'report_template', 'stats_snapshot', 'report_xml_filler', 'report_fingerprint'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
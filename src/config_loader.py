@@ -31,6 +31,7 @@ def load_paths() -> dict[str, str]:
 
     data.setdefault("output_root", "./output")
     data.setdefault("log_root", "./logs")
+    data.setdefault("cache_root", "./cache")
     return data
 
 
@@ -4,6 +4,7 @@
 - 장비 종류: PoE, AP, 스위치, 보안장비 (VA/CFG 공통, sheet_defs와 동기화)
 - 데이터 종류: 가상자산, 구성정보
 - 출력: df_{장비}_가상자산.csv, df_{장비}_구성정보.csv (대상 학교 필터 적용 후)
+- 추가 출력 형식: parquet, feather (같은 이름, 확장자만 다름. pyarrow 필요)
 """
 
 from __future__ import annotations
@@ -19,17 +20,21 @@ EQUIPMENT_TYPES: tuple[str, ...] = VA_DATA_SHEETS_EQUIPMENT
 # 데이터 종류(출력 파일 접미사)
 DATA_KINDS = ("가상자산", "구성정보")
 
+# 출력 형식(확장자). csv는 항상 생성, 나머지는 선택
+EXPORT_FORMATS = ("csv", "parquet", "feather")
+
+
 # 출력 파일명 패턴: df_{장비}_{가상자산|구성정보}.csv
-def get_export_filename(equipment: str, kind: str) -> str:
-    """장비·데이터종류별 출력 CSV 파일명."""
-    if equipment not in EQUIPMENT_TYPES or kind not in DATA_KINDS:
-        raise ValueError(f"equipment={equipment!r}, kind={kind!r}")
-    return f"df_{equipment}_{kind}.csv"
+def get_export_filename(equipment: str, kind: str, fmt: str = "csv") -> str:
+    """장비·데이터종류별 출력 파일명. fmt: csv | parquet | feather."""
+    if equipment not in EQUIPMENT_TYPES or kind not in DATA_KINDS or fmt not in EXPORT_FORMATS:
+        raise ValueError(f"equipment={equipment!r}, kind={kind!r}, fmt={fmt!r}")
+    return f"df_{equipment}_{kind}.{fmt}"
 
 
-def get_export_path(output_dir: Path, equipment: str, kind: str) -> Path:
+def get_export_path(output_dir: Path, equipment: str, kind: str, fmt: str = "csv") -> Path:
     """출력 디렉터리 + 파일명."""
-    return output_dir / get_export_filename(equipment, kind)
+    return output_dir / get_export_filename(equipment, kind, fmt)
 
 
 def list_export_tasks(
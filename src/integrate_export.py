@@ -2,13 +2,14 @@
 통합 데이터를 장비별·가상/구성별 CSV로 내보내기.
 
 - 대상 학교 리스트(CNE_LIST.xlsx) 기준으로 필터 후 df_{장비}_가상자산.csv, df_{장비}_구성정보.csv 생성
-- tqdm 진행률, 병렬 저장, 학교별 건수 로그
+- tqdm 진행률, 병렬 저장(스레드 또는 프로세스), 학교별 건수 로그
+- CSV는 chunk 단위로 나눠 기록. formats에 parquet/feather를 주면 같은 이름으로 함께 저장
 """
 
 from __future__ import annotations
 
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -17,9 +18,13 @@ import pandas as pd
 from tqdm import tqdm
 
 from .load_excel import load_va_data_sheets, load_cfg_data_sheets
-from .sheet_defs import CFG_DATA_SHEETS
+from .sheet_defs import (
+    CFG_DATA_SHEETS,
+    remember_school_code_prefixes,
+    school_code_prefixes,
+)
 from .verify_schools import get_target_school_codes, filter_va_data_by_target
-from .export_config import list_export_tasks
+from .export_config import EXPORT_FORMATS, get_export_path, list_export_tasks
 from .load_validation import (
     EXPECTED_MIN_SCHOOLS,
     EXPECTED_MIN_EQUIPMENT_ROWS,
@@ -35,15 +40,6 @@ DEFAULT_CFG_PATH = Path(
 )
 
 
-def _extract_school_code_prefix(series: pd.Series) -> pd.Series:
-    """관리번호 컬럼 시리즈에서 학교코드(prefix) 추출."""
-    def one(val):
-        if pd.isna(val) or "-" not in str(val):
-            return None
-        return str(val).strip().split("-", 1)[0].strip()
-    return series.apply(one)
-
-
 def filter_cfg_data_by_target(
     cfg_data: dict[str, pd.DataFrame],
     target_codes: set[str] | None = None,
@@ -58,8 +54,10 @@ def filter_cfg_data_by_target(
         if sheet not in cfg_data or "관리번호" not in cfg_data[sheet].columns:
             continue
         df = cfg_data[sheet]
-        prefixes = _extract_school_code_prefix(df["관리번호"])
-        out[sheet] = df[prefixes.isin(target_codes)].copy()
+        prefixes = school_code_prefixes(df)
+        mask = prefixes.isin(target_codes)
+        out[sheet] = df[mask].copy()
+        remember_school_code_prefixes(out[sheet], prefixes[mask])
     return out
 
 
@@ -67,23 +65,54 @@ def _school_counts(df: pd.DataFrame, mgmt_col: str = "관리번호") -> dict[str
     """DataFrame에서 관리번호 prefix별 행 수."""
     if df.empty or mgmt_col not in df.columns:
         return {}
-    prefixes = _extract_school_code_prefix(df[mgmt_col])
+    prefixes = school_code_prefixes(df, mgmt_col)
     return prefixes.dropna().value_counts().astype(int).to_dict()
 
 
+# CSV 기록 단위(행). 큰 시트도 한 번에 전체 문자열을 만들지 않고 나눠 씀
+CSV_CHUNK_ROWS = 20000
+
+
+def _arrow_ready(df: pd.DataFrame) -> pd.DataFrame:
+    """Parquet/Feather 저장용: 컬럼명은 문자열, 혼합 타입 object 컬럼은 문자열로(빈 값 유지)."""
+    out = df.copy(deep=False)
+    out.columns = [str(c) for c in out.columns]
+    for c in out.columns[out.dtypes == object]:
+        col = out[c]
+        out[c] = col.where(col.isna(), col.astype(str))
+    return out.reset_index(drop=True)
+
+
 def _export_one(
     df: pd.DataFrame,
     out_path: Path,
     equipment: str,
     kind: str,
+    formats: tuple[str, ...] = ("csv",),
+    chunk_rows: int | None = CSV_CHUNK_ROWS,
 ) -> dict[str, Any]:
-    """한 개 CSV 저장 및 학교별 건수 반환."""
+    """
+    한 개 CSV 저장(chunk_rows 단위로 나눠 기록) 및 학교별 건수 반환.
+    formats에 parquet/feather가 있으면 같은 폴더에 get_export_path 이름으로 함께 저장. 프로세스 풀에서도 실행 가능.
+    """
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(out_path, index=False, encoding="utf-8-sig")
+    df.to_csv(out_path, index=False, encoding="utf-8-sig", chunksize=chunk_rows)
+    outputs = [str(out_path)]
+    if "parquet" in formats or "feather" in formats:
+        arrow_df = _arrow_ready(df)
+        if "parquet" in formats:
+            pq_path = get_export_path(out_path.parent, equipment, kind, "parquet")
+            arrow_df.to_parquet(pq_path, index=False)
+            outputs.append(str(pq_path))
+        if "feather" in formats:
+            ft_path = get_export_path(out_path.parent, equipment, kind, "feather")
+            arrow_df.to_feather(ft_path)
+            outputs.append(str(ft_path))
     counts = _school_counts(df)
     return {
         "file": str(out_path.name),
         "path": str(out_path),
+        "outputs": outputs,
         "equipment": equipment,
         "kind": kind,
         "total_rows": len(df),
@@ -102,14 +131,21 @@ def run_integrate_export(
     use_revised_va: bool = False,
     min_schools: int | None = None,
     min_rows: int | None = None,
+    executor: str = "thread",
+    formats: tuple[str, ...] = ("csv",),
 ) -> dict[str, Any]:
     """
     가상자산·구성정보 로드 → 대상 리스트(CNE_LIST.xlsx) 필터 → 장비별·가상/구성별 CSV 저장 + 로그.
     va_data/cfg_data가 주어지면 파일 로드 생략(merge_raw_sources 등에서 사용).
     VA/CFG 경로는 인자 > config(va_file, cfg_file) > 기본 경로 순.
     min_schools/min_rows: None이면 기본값(717, 2000). 원본이 부분 자료일 때 완화 가능(예: min_schools=600).
-    Returns: {"output_dir", "files": [...], "log_path", "summary"}.
+    executor: "thread"(기본) | "process" — 저장 병렬 방식. CSV 변환은 GIL에 묶이므로 큰 데이터는 process가 유리.
+    formats: CSV 외 추가 출력 형식 ("parquet", "feather"). CSV는 항상 생성.
+    Returns: {"output_dir", "files": [...], "outputs": [...], "log_path", "summary"}.
     """
+    unknown = [f for f in formats if f not in EXPORT_FORMATS]
+    if unknown or executor not in ("thread", "process"):
+        raise ValueError(f"formats={formats!r}, executor={executor!r}")
     va_min_schools = min_schools if min_schools is not None else EXPECTED_MIN_SCHOOLS
     va_min_rows = min_rows if min_rows is not None else EXPECTED_MIN_EQUIPMENT_ROWS
     if output_dir is None:
@@ -199,9 +235,10 @@ def run_integrate_export(
     tasks = list_export_tasks(va_data, cfg_data, output_dir)
 
     results = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    with pool_cls(max_workers=max_workers) as pool:
         futures = {
-            executor.submit(_export_one, df, path, eq, kind): (eq, kind)
+            pool.submit(_export_one, df, path, eq, kind, tuple(formats)): (eq, kind)
             for df, path, eq, kind in tasks
         }
         for fut in tqdm(as_completed(futures), total=len(futures), desc="CSV 저장", unit="파일"):
@@ -274,6 +311,7 @@ def run_integrate_export(
     return {
         "output_dir": str(output_dir),
         "files": [r["file"] for r in results],
+        "outputs": [p for r in results for p in r["outputs"]],
         "log_path": str(log_path),
         "summary_path": str(summary_path),
         "summary": summary,
@@ -304,16 +342,24 @@ def main() -> None:
     n = int(args[0]) if args else 4
     min_schools = None
     min_rows = None
+    executor = "thread"
+    formats: tuple[str, ...] = ("csv",)
     for a in sys.argv[1:]:
         if a.startswith("--min-schools="):
             min_schools = int(a.split("=", 1)[1])
         elif a.startswith("--min-rows="):
             min_rows = int(a.split("=", 1)[1])
+        elif a == "--process":
+            executor = "process"
+        elif a.startswith("--formats="):
+            formats = tuple(f.strip() for f in a.split("=", 1)[1].split(",") if f.strip())
     r = run_integrate_export(
         output_dir=output_dir,
         max_workers=n,
         min_schools=min_schools,
         min_rows=min_rows,
+        executor=executor,
+        formats=formats,
     )
     print("저장된 파일:", r["files"])
     print("로그:", r["log_path"])
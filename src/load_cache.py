@@ -0,0 +1,272 @@
+"""
+VA/CFG 로드 결과(정규화된 시트별 DataFrame) 디스크 캐시.
+
+- 키: 파일 경로 + 크기 + 수정시각 + 로드 옵션(헤더 탐지 여부 등). 원본이 바뀌면 키가 달라져 새로 읽음
+- 저장: 항목(파일)마다 폴더 1개, 시트별 Parquet. 다시 읽었을 때 원본과 똑같은 DataFrame이 되는 경우에만 Parquet,
+  아니면(pyarrow 없음, 문자열 아닌 컬럼명, object/혼합 타입 컬럼 등) pickle → 캐시 적중·미적중 결과가 항상 같음
+- 용량: 캐시 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제(LRU)
+- 위치: config의 cache_root(기본 ./cache) 아래 load_excel/
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable
+
+import pandas as pd
+
+# 저장 형식·키 구성이 바뀌면 올려서 기존 캐시 무효화
+CACHE_VERSION = 2
+# 캐시 전체 최대 크기 (이보다 크면 LRU 삭제)
+DEFAULT_MAX_CACHE_BYTES = 2 * 1024 ** 3
+
+_META_NAME = "meta.json"
+_HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+def get_cache_dir() -> Path:
+    """캐시 폴더. config의 cache_root 우선, 없으면 프로젝트/cache."""
+    try:
+        from .config_loader import get_path
+        root = get_path("cache_root")
+    except Exception:
+        root = Path(__file__).resolve().parent.parent / "cache"
+    return root / "load_excel"
+
+
+def file_fingerprint(path: Path | str) -> dict[str, Any]:
+    """원본 파일 식별 정보: 절대경로·크기·수정시각(ns)."""
+    p = Path(path).resolve()
+    st = p.stat()
+    return {"path": str(p), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def file_content_hash(path: Path | str, chunk_size: int = 1024 * 1024) -> str:
+    """파일 내용 sha1 (수정시각만 바뀐 동일 파일 판별용)."""
+    h = hashlib.sha1()
+    with Path(path).open("rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_key(
+    path: Path | str,
+    kind: str,
+    options: dict[str, Any] | None = None,
+    fingerprint: dict[str, Any] | None = None,
+) -> str:
+    """
+    경로+크기+수정시각+종류(va/cfg 등)+옵션으로 만든 캐시 키(sha1 hex).
+    fingerprint를 주면 파일 식별 정보 대신 사용(예: {"sha1": 내용 해시} → 내용이 같으면 같은 키).
+    """
+    payload = {
+        "v": CACHE_VERSION,
+        "file": fingerprint if fingerprint is not None else file_fingerprint(path),
+        "kind": kind,
+        "options": options or {},
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _parquet_safe(df: pd.DataFrame) -> bool:
+    """
+    Parquet 왕복 후에도 그대로인지 미리 판단.
+    pyarrow는 문자열 아닌 컬럼명(예: 12)을 경고만 내고 "12"로 바꾸고, object 컬럼은 문자열 dtype 등으로 바꿔 읽으므로 제외.
+    """
+    if not isinstance(df.index, pd.RangeIndex):
+        return False
+    if not all(isinstance(c, str) for c in df.columns):
+        return False
+    return not any(dtype == object for dtype in df.dtypes)
+
+
+def _write_frame(df: pd.DataFrame, base: Path) -> str:
+    """DataFrame 1개 저장. Parquet으로 왕복해도 같은 DataFrame일 때만 Parquet, 아니면 pickle. 저장한 파일명 반환."""
+    if _HAS_PYARROW and _parquet_safe(df):
+        pq_path = base.with_suffix(".parquet")
+        try:
+            df.to_parquet(pq_path)
+            # 적중 시 반환값이 미적중(loader 결과)과 같아야 하므로 다시 읽어 확인
+            pd.testing.assert_frame_equal(pd.read_parquet(pq_path), df, check_exact=True)
+            return pq_path.name
+        except Exception:
+            pq_path.unlink(missing_ok=True)
+    pkl_path = base.with_suffix(".pkl")
+    df.to_pickle(pkl_path)
+    return pkl_path.name
+
+
+def _read_frame(path: Path) -> pd.DataFrame:
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.iterdir() if f.is_file())
+
+
+def _read_meta(entry_dir: Path) -> dict[str, Any] | None:
+    try:
+        with (entry_dir / _META_NAME).open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def _write_meta(entry_dir: Path, meta: dict[str, Any]) -> None:
+    tmp = entry_dir / f"{_META_NAME}.{uuid.uuid4().hex}.tmp"
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, entry_dir / _META_NAME)
+
+
+def load_cached(
+    path: Path | str,
+    kind: str,
+    options: dict[str, Any] | None = None,
+    cache_dir: Path | None = None,
+    fingerprint: dict[str, Any] | None = None,
+) -> dict[str, pd.DataFrame] | None:
+    """캐시 적중 시 {시트명: DataFrame}, 없거나 손상이면 None. 적중하면 last_used 갱신."""
+    cache_dir = Path(cache_dir) if cache_dir is not None else get_cache_dir()
+    try:
+        key = cache_key(path, kind, options, fingerprint)
+    except OSError:
+        return None
+    entry_dir = cache_dir / key
+    meta = _read_meta(entry_dir)
+    if meta is None:
+        return None
+    try:
+        out = {sheet: _read_frame(entry_dir / fname) for sheet, fname in meta["sheets"].items()}
+    except Exception:
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        return None
+    meta["last_used"] = time.time()
+    try:
+        _write_meta(entry_dir, meta)
+    except OSError:
+        pass
+    return out
+
+
+def store_cached(
+    path: Path | str,
+    kind: str,
+    data: dict[str, pd.DataFrame],
+    options: dict[str, Any] | None = None,
+    cache_dir: Path | None = None,
+    max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+    fingerprint: dict[str, Any] | None = None,
+) -> Path | None:
+    """
+    로드 결과 저장 후 LRU 정리. 임시 폴더에 쓰고 이름 변경으로 교체하므로 병렬 프로세스가 같은 키를 써도 안전.
+    Returns: 항목 폴더 (저장 실패 시 None).
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else get_cache_dir()
+    try:
+        key = cache_key(path, kind, options, fingerprint)
+        fp = file_fingerprint(path)
+    except OSError:
+        return None
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    entry_dir = cache_dir / key
+    tmp_dir = cache_dir / f".{key}.{uuid.uuid4().hex}.tmp"
+    try:
+        tmp_dir.mkdir()
+        sheets = {}
+        for i, (sheet, df) in enumerate(data.items()):
+            sheets[sheet] = _write_frame(df, tmp_dir / f"sheet_{i:02d}")
+        now = time.time()
+        _write_meta(tmp_dir, {
+            "key": key,
+            "source": fp,
+            "kind": kind,
+            "options": options or {},
+            "sheets": sheets,
+            "created": now,
+            "last_used": now,
+        })
+        if entry_dir.exists():
+            shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(tmp_dir, entry_dir)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return None
+    evict_lru(cache_dir, max_bytes)
+    return entry_dir
+
+
+def evict_lru(cache_dir: Path | None = None, max_bytes: int = DEFAULT_MAX_CACHE_BYTES) -> list[str]:
+    """캐시 전체 크기가 max_bytes 이하가 될 때까지 last_used가 오래된 항목부터 삭제. 삭제한 키 목록 반환."""
+    cache_dir = Path(cache_dir) if cache_dir is not None else get_cache_dir()
+    if not cache_dir.exists():
+        return []
+    entries = []
+    for d in cache_dir.iterdir():
+        if not d.is_dir() or d.name.startswith("."):
+            continue
+        meta = _read_meta(d)
+        last_used = meta.get("last_used", 0) if meta else 0
+        entries.append((last_used, _dir_size(d), d))
+    total = sum(size for _, size, _ in entries)
+    removed = []
+    for _, size, d in sorted(entries, key=lambda x: x[0]):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(d, ignore_errors=True)
+        total -= size
+        removed.append(d.name)
+    return removed
+
+
+def cached_load(
+    path: Path | str,
+    kind: str,
+    loader: Callable[[], dict[str, pd.DataFrame]],
+    options: dict[str, Any] | None = None,
+    cache_dir: Path | None = None,
+    max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+    fingerprint: dict[str, Any] | None = None,
+) -> dict[str, pd.DataFrame]:
+    """캐시에 있으면 그대로 반환, 없으면 loader() 실행 후 저장하고 반환."""
+    hit = load_cached(path, kind, options, cache_dir, fingerprint)
+    if hit is not None:
+        return hit
+    data = loader()
+    store_cached(path, kind, data, options, cache_dir, max_bytes, fingerprint)
+    return data
+
+
+def clear_cache(cache_dir: Path | None = None) -> None:
+    """캐시 폴더 전체 삭제."""
+    cache_dir = Path(cache_dir) if cache_dir is not None else get_cache_dir()
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    import sys
+
+    d = get_cache_dir()
+    if "--clear" in sys.argv[1:]:
+        clear_cache(d)
+        print("캐시 삭제:", d)
+    else:
+        n = 0
+        total = 0
+        if d.exists():
+            for e in d.iterdir():
+                if e.is_dir() and not e.name.startswith("."):
+                    n += 1
+                    total += _dir_size(e)
+        print(f"캐시: {d} | 항목 {n}개, {total / 1024 ** 2:.1f}MB")
@@ -4,6 +4,7 @@
 - 가상자산: PoE, AP, 스위치, 보안장비, 학교정보 시트만 로딩 (관리번호·설명 시트 제외)
 - 구성정보: AP, PoE, 스위치, 보안장비 시트만 로딩
 - 717 = 학교 수; 장비 행은 그보다 훨씬 많음. 유니크 학교 수·총 행 수 검증은 load_validation.
+- 로드 결과는 load_cache에 저장(경로+크기+수정시각+옵션 기준). 같은 파일을 다시 읽으면 엑셀 파싱 생략.
 """
 
 from __future__ import annotations
@@ -11,6 +12,7 @@ from __future__ import annotations
 from pathlib import Path
 
 import pandas as pd
+from pandas.io.parsers import TextParser
 
 from .sheet_defs import (
     get_data_start_row,
@@ -21,14 +23,15 @@ from .sheet_defs import (
     normalize_mgmt_column,
 )
 from .load_validation import EXPECTED_MIN_ROWS, _count_data_rows
+from .load_cache import cached_load
 
 
 def _read_sheet(
-    path: Path,
+    path: Path | pd.ExcelFile,
     sheet_name: str,
     header_row: int,
 ) -> pd.DataFrame:
-    """엑셀 시트를 header_row(1-based)를 헤더로 읽어 DataFrame 반환."""
+    """엑셀 시트를 header_row(1-based)를 헤더로 읽어 DataFrame 반환. path 대신 열린 ExcelFile을 주면 재파싱 없이 재사용."""
     return pd.read_excel(
         path,
         sheet_name=sheet_name,
@@ -37,26 +40,56 @@ def _read_sheet(
     )
 
 
-def load_va_sheet(path: Path, sheet_name: str, header_row_1based: int | None = None) -> pd.DataFrame:
+def load_va_sheet(path: Path | pd.ExcelFile, sheet_name: str, header_row_1based: int | None = None) -> pd.DataFrame:
     """가상자산 파일에서 지정 시트만 로딩. header_row_1based 없으면 시트별 기본값."""
     header_row = header_row_1based if header_row_1based is not None else get_va_header_row(sheet_name)
     return _read_sheet(path, sheet_name, header_row)
 
 
-def load_cfg_sheet(path: Path, sheet_name: str, header_row_1based: int | None = None) -> pd.DataFrame:
+def load_cfg_sheet(path: Path | pd.ExcelFile, sheet_name: str, header_row_1based: int | None = None) -> pd.DataFrame:
     """구성정보 파일에서 지정 시트만 로딩. header_row_1based 없으면 1행."""
     header_row = header_row_1based if header_row_1based is not None else get_cfg_header_row(sheet_name)
     return _read_sheet(path, sheet_name, header_row)
 
 
-def _load_va_sheet_robust(path: Path, sheet_name: str) -> pd.DataFrame:
-    """장비 시트: 헤더 1..4행 시도. 관리번호/관리코드(2개면 학교코드-장비 형식 있는 쪽) 해석 후 '관리번호'로 정규화."""
+def _read_sheet_grid(path: Path | pd.ExcelFile, sheet_name: str) -> list[list]:
+    """
+    엑셀 시트를 한 번만 읽어 원시 셀 행 목록 반환. 헤더 행 탐지용.
+    변환 없이(dtype=object, na_filter=False) 읽으므로 read_excel 내부 파서에 들어가는 셀 값과 같음.
+    """
+    grid = pd.read_excel(
+        path,
+        sheet_name=sheet_name,
+        header=None,
+        dtype=object,
+        na_filter=False,
+        engine="openpyxl",
+    )
+    return grid.values.tolist()
+
+
+def _frame_from_grid(grid: list[list], header_row: int) -> pd.DataFrame:
+    """
+    원시 셀 행 목록에서 header_row(1-based)를 헤더로 하는 DataFrame 구성.
+    read_excel(header=header_row-1)과 같은 파서(TextParser)로 만들어 컬럼명·결측값·숫자 변환("00123" → 123)까지 동일.
+    """
+    if header_row < 1 or header_row > len(grid):
+        raise ValueError(f"header_row={header_row} 범위 밖 (행 수 {len(grid)})")
+    rows = [list(r) for r in grid]
+    return TextParser(rows, header=header_row - 1, skip_blank_lines=False).read()
+
+
+def _pick_best_header(grid: list[list], file_kind: str) -> pd.DataFrame | None:
+    """
+    원시 격자에서 헤더 후보 1..4행을 메모리 상에서 평가.
+    관리번호 정규화 후 유효 데이터 행이 가장 많은 헤더로 만든 DataFrame 반환. 없으면 None.
+    """
     best_df: pd.DataFrame | None = None
     best_count = 0
     for header_1 in range(1, 5):
         try:
-            df = _read_sheet(path, sheet_name, header_1)
-            normalized = normalize_mgmt_column(df, "va")
+            df = _frame_from_grid(grid, header_1)
+            normalized = normalize_mgmt_column(df, file_kind)
             if "관리번호" not in normalized.columns:
                 continue
             n = _count_data_rows(normalized)
@@ -65,62 +98,85 @@ def _load_va_sheet_robust(path: Path, sheet_name: str) -> pd.DataFrame:
                 best_df = normalized
         except Exception:
             continue
+    return best_df
+
+
+def _load_va_sheet_robust(path: Path | pd.ExcelFile, sheet_name: str) -> pd.DataFrame:
+    """장비 시트: 헤더 1..4행 시도(시트는 한 번만 읽음). 관리번호/관리코드(2개면 학교코드-장비 형식 있는 쪽) 해석 후 '관리번호'로 정규화."""
+    try:
+        best_df = _pick_best_header(_read_sheet_grid(path, sheet_name), "va")
+    except Exception:
+        best_df = None
     if best_df is not None:
         return best_df
     df = load_va_sheet(path, sheet_name)
     return normalize_mgmt_column(df, "va")
 
 
-def _load_cfg_sheet_robust(path: Path, sheet_name: str) -> pd.DataFrame:
-    """구성정보 시트: 헤더 1..4행 시도. 장비관리번호/장비관리코드/관리번호/관리코드 해석 후 '관리번호'로 정규화."""
-    best_df: pd.DataFrame | None = None
-    best_count = 0
-    for header_1 in range(1, 5):
-        try:
-            df = _read_sheet(path, sheet_name, header_1)
-            normalized = normalize_mgmt_column(df, "cfg")
-            if "관리번호" not in normalized.columns:
-                continue
-            n = _count_data_rows(normalized)
-            if n > best_count:
-                best_count = n
-                best_df = normalized
-        except Exception:
-            continue
+def _load_cfg_sheet_robust(path: Path | pd.ExcelFile, sheet_name: str) -> pd.DataFrame:
+    """구성정보 시트: 헤더 1..4행 시도(시트는 한 번만 읽음). 장비관리번호/장비관리코드/관리번호/관리코드 해석 후 '관리번호'로 정규화."""
+    try:
+        best_df = _pick_best_header(_read_sheet_grid(path, sheet_name), "cfg")
+    except Exception:
+        best_df = None
     if best_df is not None:
         return best_df
     df = load_cfg_sheet(path, sheet_name)
     return normalize_mgmt_column(df, "cfg")
 
 
-def load_va_data_sheets(path: Path, robust_headers: bool = True) -> dict[str, pd.DataFrame]:
-    """가상자산 파일에서 실데이터 시트만 로딩. robust_headers=True면 장비 시트는 헤더 1~4행 중 데이터 많은 행 사용."""
-    xl = pd.ExcelFile(path, engine="openpyxl")
-    to_load = va_sheets_to_load(xl.sheet_names)
-    xl.close()
+def load_va_data_sheets(
+    path: Path,
+    robust_headers: bool = True,
+    use_cache: bool = True,
+) -> dict[str, pd.DataFrame]:
+    """
+    가상자산 파일에서 실데이터 시트만 로딩. robust_headers=True면 장비 시트는 헤더 1~4행 중 데이터 많은 행 사용.
+    워크북은 호출당 한 번만 열어(ExcelFile) 모든 시트·헤더 탐지에 재사용.
+    use_cache=True면 파일이 바뀌지 않은 한 디스크 캐시(load_cache)에서 바로 반환.
+    """
+    if use_cache:
+        return cached_load(
+            path, "va",
+            lambda: load_va_data_sheets(path, robust_headers, use_cache=False),
+            options={"robust_headers": robust_headers},
+        )
     out = {}
-    for name in to_load:
-        if name == "학교정보":
-            out[name] = load_va_sheet(path, name)
-        else:
-            if robust_headers:
-                out[name] = _load_va_sheet_robust(path, name)
+    with pd.ExcelFile(path, engine="openpyxl") as xl:
+        for name in va_sheets_to_load(xl.sheet_names):
+            if name == "학교정보":
+                out[name] = load_va_sheet(xl, name)
             else:
-                out[name] = normalize_mgmt_column(load_va_sheet(path, name), "va")
+                if robust_headers:
+                    out[name] = _load_va_sheet_robust(xl, name)
+                else:
+                    out[name] = normalize_mgmt_column(load_va_sheet(xl, name), "va")
     return out
 
 
-def load_cfg_data_sheets(path: Path, robust_headers: bool = True) -> dict[str, pd.DataFrame]:
-    """구성정보 파일에서 실데이터 시트만 로딩. robust_headers=True면 헤더 1~4행 중 데이터 많은 행 사용."""
-    xl = pd.ExcelFile(path, engine="openpyxl")
-    to_load = cfg_sheets_to_load(xl.sheet_names)
-    xl.close()
+def load_cfg_data_sheets(
+    path: Path,
+    robust_headers: bool = True,
+    use_cache: bool = True,
+) -> dict[str, pd.DataFrame]:
+    """
+    구성정보 파일에서 실데이터 시트만 로딩. robust_headers=True면 헤더 1~4행 중 데이터 많은 행 사용.
+    워크북은 호출당 한 번만 열어(ExcelFile) 모든 시트·헤더 탐지에 재사용.
+    use_cache=True면 파일이 바뀌지 않은 한 디스크 캐시(load_cache)에서 바로 반환.
+    """
+    if use_cache:
+        return cached_load(
+            path, "cfg",
+            lambda: load_cfg_data_sheets(path, robust_headers, use_cache=False),
+            options={"robust_headers": robust_headers},
+        )
     out = {}
-    for name in to_load:
-        if robust_headers:
-            out[name] = _load_cfg_sheet_robust(path, name)
-        else:
-            out[name] = normalize_mgmt_column(load_cfg_sheet(path, name), "cfg")
+    with pd.ExcelFile(path, engine="openpyxl") as xl:
+        for name in cfg_sheets_to_load(xl.sheet_names):
+            if robust_headers:
+                out[name] = _load_cfg_sheet_robust(xl, name)
+            else:
+                out[name] = normalize_mgmt_column(load_cfg_sheet(xl, name), "cfg")
     return out
 
 
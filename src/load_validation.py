@@ -13,7 +13,7 @@ from typing import Any
 
 import pandas as pd
 
-from .sheet_defs import VA_DATA_SHEETS_EQUIPMENT, CFG_DATA_SHEETS
+from .sheet_defs import VA_DATA_SHEETS_EQUIPMENT, CFG_DATA_SHEETS, school_code_prefixes
 
 # 정상 719개 학교, 최소 717개 학교. 장비 시트에 등장하는 유니크 학교 수가 717 미만이면 잘못 읽은 것.
 EXPECTED_MIN_SCHOOLS = 717
@@ -39,15 +39,7 @@ def _count_unique_schools(df: pd.DataFrame, mgmt_col: str = "관리번호") -> i
     """관리번호 컬럼에서 '학교코드-...' prefix(학교코드) 유니크 개수."""
     if df.empty or mgmt_col not in df.columns:
         return 0
-    col = df[mgmt_col]
-    if isinstance(col, pd.DataFrame):
-        col = col.iloc[:, 0]
-    prefixes = col.dropna().astype(str).str.strip()
-    codes = set()
-    for v in prefixes:
-        if "-" in v:
-            codes.add(v.split("-", 1)[0].strip())
-    return len(codes)
+    return int(school_code_prefixes(df, mgmt_col).nunique())
 
 
 def validate_va_loaded(
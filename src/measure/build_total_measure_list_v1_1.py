@@ -10,8 +10,10 @@ import sys
 import io
 import os
 
-if hasattr(sys.stdout, "buffer"):
+# 이미 UTF-8이면 다시 감싸지 않음 (다른 모듈이 먼저 감싼 래퍼를 교체하면 그 래퍼가 정리되며 버퍼가 닫힘)
+if hasattr(sys.stdout, "buffer") and (sys.stdout.encoding or "").lower() != "utf-8":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+if hasattr(sys.stderr, "buffer") and (sys.stderr.encoding or "").lower() != "utf-8":
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
 
 from openpyxl import load_workbook, Workbook
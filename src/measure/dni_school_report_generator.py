@@ -3,6 +3,8 @@
 대전(DNI) 학교별 측정 리포트 생성 (템플릿 사용)
 
 측정값_템플릿.xlsx 복사 → J열 측정값, L열 판정 입력 → 학교명_학교코드.xlsx 저장
+
+배치 실행: --stats/--template/--out/--layout/--schools 로 설정 경로 대신 지정 (run_batch()는 개수·소요 시간 dict 반환)
 """
 from __future__ import print_function
 import sys
@@ -11,10 +13,14 @@ import os
 import csv
 import re
 import shutil
+import time
+import argparse
 from datetime import datetime
 
-if hasattr(sys.stdout, "buffer"):
+# 이미 UTF-8이면 다시 감싸지 않음 (다른 모듈이 먼저 감싼 래퍼를 교체하면 그 래퍼가 정리되며 버퍼가 닫힘)
+if hasattr(sys.stdout, "buffer") and (sys.stdout.encoding or "").lower() != "utf-8":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+if hasattr(sys.stderr, "buffer") and (sys.stderr.encoding or "").lower() != "utf-8":
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
 
 from openpyxl import load_workbook
@@ -43,6 +49,7 @@ from dni_school_report_config import (
     SCHOOL_LIST_FILES,
     ROUND_1_ROWS,
 )
+from report_template import TemplateCache, open_template, parse_school_codes
 
 SCHOOL_LIST_SEARCH_DIRS = [_MEASURE_DIR, os.path.join(os.path.dirname(_MEASURE_DIR), "split")]
 
@@ -279,8 +286,8 @@ def format_output_value(v1, v2, row_def):
     return format_value(v1)
 
 
-def generate_school_report(template_path, wb_stats, school_code, school_data):
-    wb = load_workbook(template_path)
+def generate_school_report(template, wb_stats, school_code, school_data):
+    wb = open_template(template)
     ws = wb[TEMPLATE_SHEET] if TEMPLATE_SHEET in wb.sheetnames else wb.active
     l_map = {row: (op, th) for row, op, th in L_JUDGMENT_MAP}
     for row_def in J_OUTPUT_MAP:
@@ -324,30 +331,41 @@ def generate_school_report(template_path, wb_stats, school_code, school_data):
     return wb
 
 
-def main():
-    print("=" * 50)
-    print("[대전(DNI) 학교별 측정 리포트] 생성 (템플릿 사용)")
-    print("=" * 50)
-    template_path = find_template()
-    if not template_path:
-        print(f"[오류] 템플릿 없음. 확인: {TEMPLATE_CANDIDATES}")
-        sys.exit(1)
+def run_batch(template_path=None, stats_path=None, output_dir=None, layout="region", schools=None):
+    """리포트 일괄 생성 (입력 없음). 인자 None이면 설정값(TEMPLATE_CANDIDATES, TOTAL_MEASURE_LIST, OUTPUT_DIR) 사용.
+    layout: region=생성 후 지역별 폴더 복사, flat=복사 생략. schools: 학교코드 목록 (None이면 전체).
+    반환: dict — generated/missing/not_found, log_path, 단계별 소요 시간(초)
+    템플릿·통계 파일이 없으면 FileNotFoundError, 통계에 학교별 데이터가 없으면 ValueError (종료하지 않음).
+    """
+    t_start = time.perf_counter()
+    template_path = template_path or find_template()
+    stats_path = stats_path or TOTAL_MEASURE_LIST
+    output_dir = output_dir or OUTPUT_DIR
+    if not template_path or not os.path.isfile(template_path):
+        raise FileNotFoundError(f"템플릿 없음. 확인: {template_path or TEMPLATE_CANDIDATES}")
     print(f"템플릿: {template_path}")
-    if not os.path.isfile(TOTAL_MEASURE_LIST):
-        print(f"[오류] 통계 파일 없음: {TOTAL_MEASURE_LIST}")
-        sys.exit(1)
-    print(f"통계: {TOTAL_MEASURE_LIST}")
+    if not os.path.isfile(stats_path):
+        raise FileNotFoundError(f"통계 파일 없음: {stats_path}")
+    print(f"통계: {stats_path}")
     all_schools, code_to_name = load_full_school_list()
     if not all_schools:
         print("[경고] 학교 리스트 없음. 통계에 있는 학교만 처리합니다.")
-    wb_stats = load_workbook(TOTAL_MEASURE_LIST, data_only=True)
+    wb_stats = load_workbook(stats_path, data_only=True)
     by_school = load_stats_by_school(wb_stats)
     if not by_school:
-        print("[오류] 학교별 데이터 없음")
-        sys.exit(1)
+        wb_stats.close()
+        raise ValueError(f"학교별 데이터 없음: {stats_path}")
+    not_found = []
+    if schools:
+        selected = list(dict.fromkeys(str(sc).strip() for sc in schools if str(sc).strip()))
+        not_found = [sc for sc in selected if sc not in by_school]
+        by_school = {sc: by_school[sc] for sc in selected if sc in by_school}
+        all_schools = selected
+        print(f"[안내] 지정 학교 {len(selected)}개 중 통계 데이터 있음 {len(by_school)}개")
+    t_loaded = time.perf_counter()
     schools_with_data = set(by_school.keys())
     missing = [sc for sc in all_schools if sc not in schools_with_data]
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
     os.makedirs(LOG_DIR, exist_ok=True)
     log_path = os.path.join(LOG_DIR, f"{LOG_PREFIX}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
     log_lines = [
@@ -363,26 +381,69 @@ def main():
             log_lines.append(f"  {sc}  {code_to_name.get(sc, '')}")
     with open(log_path, "w", encoding="utf-8") as f:
         f.write("\n".join(log_lines))
-    print(f"출력: {OUTPUT_DIR}")
+    print(f"출력: {output_dir}")
     if missing:
         print(f"[로그] 통계 데이터 없는 학교 {len(missing)}개 → {log_path}")
+    template = TemplateCache(template_path)
     for school_code in tqdm(sorted(by_school.keys()), desc="학교별 생성", unit="교"):
         school_name = code_to_name.get(school_code, "")
         safe_name = sanitize_filename(school_name) or school_code
         school_data = by_school[school_code]
-        wb = generate_school_report(template_path, wb_stats, school_code, school_data)
+        wb = generate_school_report(template, wb_stats, school_code, school_data)
         out_name = f"{safe_name}_{school_code}.xlsx"
-        out_path = os.path.join(OUTPUT_DIR, out_name)
+        out_path = os.path.join(output_dir, out_name)
         try:
             wb.save(out_path)
         except PermissionError:
-            out_path = os.path.join(OUTPUT_DIR, f"{safe_name}_{school_code}_백업.xlsx")
+            out_path = os.path.join(output_dir, f"{safe_name}_{school_code}_백업.xlsx")
             wb.save(out_path)
     wb_stats.close()
+    t_generated = time.perf_counter()
     print(f"[완료] {len(by_school)}개 학교 리포트 생성")
 
     # 지역별 폴더 복사
-    copy_reports_by_region(wb_stats_path=TOTAL_MEASURE_LIST, output_dir=OUTPUT_DIR)
+    if layout == "region":
+        copy_reports_by_region(wb_stats_path=stats_path, output_dir=output_dir)
+    return {
+        "template": template_path,
+        "stats": stats_path,
+        "output_dir": output_dir,
+        "log_path": log_path,
+        "generated": len(by_school),
+        "missing": missing,
+        "not_found": not_found,
+        "load_sec": round(t_loaded - t_start, 3),
+        "generate_sec": round(t_generated - t_loaded, 3),
+        "total_sec": round(time.perf_counter() - t_start, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대전(DNI) 학교별 측정 리포트 생성 (템플릿 사용)")
+    parser.add_argument("--stats", help=f"통합 통계 파일 경로 (기본: {TOTAL_MEASURE_LIST})")
+    parser.add_argument("--template", help="리포트 템플릿 경로 (기본: 설정 후보 탐색)")
+    parser.add_argument("--out", help=f"출력 폴더 (기본: {OUTPUT_DIR})")
+    parser.add_argument("--layout", choices=("region", "flat"), default="region",
+                        help="region=생성 후 지역명(개수) 폴더로 복사(기본), flat=출력 폴더에만 저장")
+    parser.add_argument("--schools", help="생성할 학교코드 (쉼표 구분 또는 목록 파일 경로, 기본: 전체)")
+    args = parser.parse_args(argv)
+    print("=" * 50)
+    print("[대전(DNI) 학교별 측정 리포트] 생성 (템플릿 사용)")
+    print("=" * 50)
+    try:
+        result = run_batch(
+            template_path=args.template,
+            stats_path=args.stats,
+            output_dir=os.path.abspath(args.out) if args.out else None,
+            layout=args.layout,
+            schools=parse_school_codes(args.schools),
+        )
+    except (FileNotFoundError, ValueError) as e:
+        print(f"[오류] {e}")
+        sys.exit(1)
+    if result["not_found"]:
+        print(f"[주의] 통계 데이터 없는 지정 학교: {', '.join(result['not_found'])}")
+    return result
 
 
 def load_region_map(wb_stats_path):
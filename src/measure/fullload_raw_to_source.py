@@ -4,7 +4,7 @@
 
 1. FULLLOAD_RAWA_1.xlsx에서 1차/2차 선택 로직 적용 → 통계용 원본 생성
 2. 학교코드 수정 (학교명 기준)
-3. 학교별 평균 및 판정
+3. 학교별 평균 및 판정 (measure_aggregate: 열 단위 숫자 변환, groupby 평균, 배열 판정)
 4. 전체 로그 기록
 """
 from __future__ import print_function
@@ -13,6 +13,7 @@ import io
 import os
 import csv
 from datetime import datetime
+import pandas as pd
 from openpyxl import load_workbook, Workbook
 from tqdm import tqdm
 
@@ -25,6 +26,9 @@ sys.path.insert(0, _MEASURE_DIR)
 
 try:
     from measure_utils import extract_school_code_from_mgmt_num
+    from measure_aggregate import (
+        parse_numeric, group_mean, diagnose, diagnose_both, cell_value, optional_float,
+    )
     from fullload_raw_config import (
         FULLLOAD_RAW_CANDIDATES,
         FULLLOAD_OUTPUT,
@@ -157,32 +161,6 @@ def find_columns(ws, header_row, search_rows=3):
     return cols
 
 
-def is_numeric(v):
-    if v is None:
-        return False
-    try:
-        float(str(v).replace(",", "").replace("%", ""))
-        return True
-    except ValueError:
-        return False
-
-
-def get_num(v):
-    if not is_numeric(v):
-        return None
-    try:
-        return float(str(v).replace(",", "").replace("%", ""))
-    except ValueError:
-        return None
-
-
-def diagnose(dl, ul):
-    """375 Mbps 기준: 둘 다 >= 375 → 양호, 아니면 미흡"""
-    if dl is None or ul is None:
-        return "미흡"
-    return "양호" if (dl >= THRESHOLD_MBPS and ul >= THRESHOLD_MBPS) else "미흡"
-
-
 def read_sheet_data(wb, sheet_name, name_to_code):
     """시트에서 데이터 읽기, 학교코드 수정"""
     ws = wb[sheet_name]
@@ -192,17 +170,33 @@ def read_sheet_data(wb, sheet_name, name_to_code):
         log(f"  [경고] {sheet_name}: 필수 열 없음 (mgmt, dl, ul) - cols={cols}")
         return [], []
 
+    # 필요한 열만 행 튜플로 읽고, 측정값은 열 단위로 한 번에 숫자 변환 + 375 Mbps 판정(Down·Up 둘 다)
+    rows = list(ws.iter_rows(min_row=hr + 1, max_row=ws.max_row, values_only=True))
+
+    def _column(key):
+        c = cols.get(key)
+        if not c:
+            return [None] * len(rows)
+        return [row[c - 1] if c <= len(row) else None for row in rows]
+
+    mgmts = _column("mgmt")
+    names = _column("school_name")
+    dls = parse_numeric(_column("dl")).to_numpy()
+    uls = parse_numeric(_column("ul")).to_numpy()
+    rssis = parse_numeric(_column("rssi")).to_numpy()
+    chs = parse_numeric(_column("ch")).to_numpy()
+    diags = diagnose_both(dls, uls, THRESHOLD_MBPS)
+
     data = []
     fixes = []
-    for r in range(hr + 1, ws.max_row + 1):
-        mgmt = ws.cell(r, cols["mgmt"]).value
-        school_name = ws.cell(r, cols.get("school_name", 0) or 2).value if cols.get("school_name") else None
-        school_name = str(school_name or "").strip()
+    for i, r in enumerate(range(hr + 1, hr + 1 + len(rows))):
+        mgmt = mgmts[i]
+        school_name = str(names[i] or "").strip()
 
-        dl = get_num(ws.cell(r, cols["dl"]).value)
-        ul = get_num(ws.cell(r, cols["ul"]).value)
-        rssi = get_num(ws.cell(r, cols["rssi"]).value) if cols.get("rssi") else None
-        ch = get_num(ws.cell(r, cols["ch"]).value) if cols.get("ch") else None
+        dl = optional_float(dls[i])
+        ul = optional_float(uls[i])
+        rssi = optional_float(rssis[i])
+        ch = optional_float(chs[i])
 
         sc_from_mgmt = extract_school_code_from_mgmt_num(mgmt)
         sc_from_name = name_to_code.get(school_name, "") if school_name else ""
@@ -220,7 +214,7 @@ def read_sheet_data(wb, sheet_name, name_to_code):
             "ul": ul,
             "rssi": rssi,
             "ch": ch,
-            "diag": diagnose(dl, ul),
+            "diag": diags[i],
             "src_row": r,  # 원본 시트 행 번호 (1-based)
             "src_sheet": sheet_name,
             "sc_from_mgmt": sc_from_mgmt or "",  # 장비관리번호에서 추출한 코드
@@ -519,43 +513,42 @@ def main():
         ws_src.cell(ri, 7, value=row["ch"])
         ws_src.cell(ri, 8, value=row["diag"])
 
-    # 학교별 평균 (다운로드/업로드 있는 장비만, rssi/ch는 있으면 포함)
-    school_rows = {}
+    # 학교별 평균 (다운로드/업로드 있는 장비만, rssi/ch는 있으면 포함) — groupby 평균, 배열 판정
+    frame = pd.DataFrame({
+        "dl": [r["dl"] for r in selected],
+        "ul": [r["ul"] for r in selected],
+        "rssi": [r.get("rssi") for r in selected],
+        "ch": [r.get("ch") for r in selected],
+    }, dtype=float)
+    means, _counts = group_mean(
+        [r["school_code"] for r in selected], frame,
+        mask=(frame["dl"].notna() & frame["ul"].notna()).to_numpy(),
+    )
+    avg_dl = [cell_value(v, 1) for v in means["dl"]]
+    avg_ul = [cell_value(v, 1) for v in means["ul"]]
+    avg_rssi = [cell_value(v, 1) for v in means["rssi"]]
+    avg_ch = [cell_value(v, 1) for v in means["ch"]]
+    diag_dl = diagnose(avg_dl, THRESHOLD_MBPS)
+    diag_ul = diagnose(avg_ul, THRESHOLD_MBPS)
+
+    # 학교명: 통계용 원본에서 그 학교코드의 첫 행 학교명 (없으면 학교 리스트 → 첫 행 학교명)
+    first_name = {}
     for r in selected:
-        if r["dl"] is None or r["ul"] is None:
-            continue
-        sc = r["school_code"]
-        if not sc:
-            continue
-        if sc not in school_rows:
-            school_rows[sc] = []
-        school_rows[sc].append((r["dl"], r["ul"], r.get("rssi"), r.get("ch")))
+        first_name.setdefault(r["school_code"], r["school_name"])
+    fallback_name = selected[0]["school_name"] if selected else ""
 
     avg_rows = []
-    for sc in sorted(school_rows.keys()):
-        rows = school_rows[sc]
-        avg_dl = round(sum(r[0] for r in rows) / len(rows), 1)
-        avg_ul = round(sum(r[1] for r in rows) / len(rows), 1)
-        rssi_vals = [r[2] for r in rows if r[2] is not None]
-        ch_vals = [r[3] for r in rows if r[3] is not None]
-        avg_rssi = round(sum(rssi_vals) / len(rssi_vals), 1) if rssi_vals else ""
-        avg_ch = round(sum(ch_vals) / len(ch_vals), 1) if ch_vals else ""
-        diag_dl = "양호" if avg_dl >= THRESHOLD_MBPS else "미흡"
-        diag_ul = "양호" if avg_ul >= THRESHOLD_MBPS else "미흡"
-        school_name = code_to_name.get(sc) or (selected[0]["school_name"] if selected else "")
-        for r in selected:
-            if r["school_code"] == sc:
-                school_name = r["school_name"] or school_name
-                break
+    for i, sc in enumerate(means.index):
+        school_name = first_name.get(sc) or code_to_name.get(sc) or fallback_name
         avg_rows.append({
             "school_code": sc,
             "school_name": school_name,
-            "download": avg_dl,
-            "upload": avg_ul,
-            "rssi": avg_rssi,
-            "ch": avg_ch,
-            "diag_dl": diag_dl,
-            "diag_ul": diag_ul,
+            "download": avg_dl[i],
+            "upload": avg_ul[i],
+            "rssi": avg_rssi[i],
+            "ch": avg_ch[i],
+            "diag_dl": diag_dl[i],
+            "diag_ul": diag_ul[i],
         })
 
     ws_avg = wb_out.create_sheet(SHEET_AVG)
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+측정 전처리 공통 학교별 집계 (pandas/NumPy)
+
+- 기존: 전처리마다 학교 × 열 × 행 중첩 루프에서 셀마다 is_numeric / float(str(v).replace(...)) 반복
+- 여기: 열 단위로 한 번에 숫자 변환(쉼표·% 제거 후 to_numeric) → groupby로 학교별 평균·개수
+  (평균은 기존과 같은 순서의 sum(값)/len(값) — pandas mean은 더하는 순서가 달라 반올림 경계값에서 끝자리가 바뀜)
+  → 기준값 판정(양호/미흡)도 배열 비교로 처리
+- 엑셀에 쓸 때만 cell_value()로 파이썬 값(반올림, 값 없으면 "")으로 바꿈
+
+사용: wired_preprocess_v1, wireless_preprocess_v1, fullload_raw_to_source
+"""
+import numpy as np
+import pandas as pd
+
+GOOD = "양호"
+BAD = "미흡"
+
+
+def parse_numeric(values):
+    """
+    값 목록 → float Series (숫자로 읽을 수 없으면 NaN)
+    기존 float(str(v).replace(",", "").replace("%", ""))와 같은 기준: 숫자 문자열·숫자는 값, bool·날짜·빈 칸은 NaN
+    """
+    s = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    text = s.astype(str).str.strip().str.replace(",", "", regex=False).str.replace("%", "", regex=False)
+    return pd.to_numeric(text, errors="coerce").astype(float)
+
+
+def numeric_frame(rows, n_cols, offset=0):
+    """
+    행 목록 → 열 1..n_cols 숫자 DataFrame (열 c = row[offset + c - 1], 짧은 행의 빈 칸은 NaN)
+    """
+    raw = pd.DataFrame.from_records(rows) if rows else pd.DataFrame()
+    cols = {}
+    for c in range(1, n_cols + 1):
+        src = offset + c - 1
+        if src in raw.columns:
+            cols[c] = parse_numeric(raw[src].astype(object))
+        else:
+            cols[c] = pd.Series(np.nan, index=raw.index, dtype=float)
+    return pd.DataFrame(cols, index=raw.index)
+
+
+def _ordered_mean(s):
+    """값 있는 칸만 행 순서대로 sum(값)/len(값) (기존 계산과 같은 부동소수 결과, 없으면 NaN)"""
+    vals = s.dropna().tolist()
+    return sum(vals) / len(vals) if vals else np.nan
+
+
+def group_mean(keys, frame, mask=None):
+    """
+    키(학교코드)별 평균·개수 (NaN 칸은 제외, 키가 빈 행도 제외, 키 정렬)
+    keys: frame 행 순서와 같은 키 목록, mask: 포함할 행 (bool 배열, None이면 전체)
+    반환: (평균 DataFrame, 개수 DataFrame) — 인덱스는 키
+    """
+    key_s = pd.Series(list(keys), index=frame.index, dtype=object)
+    keep = (key_s.notna() & (key_s != "")).to_numpy()
+    if mask is not None:
+        keep = keep & np.asarray(mask, dtype=bool)
+    frame = frame[keep]
+    key_s = key_s[keep]
+    grouped = frame.groupby(key_s, sort=True)
+    return grouped.agg(_ordered_mean), grouped.count()
+
+
+def column_mean(values):
+    """값 목록 평균 (숫자만, 없으면 NaN) — 학교별 평균들의 전체 평균 등"""
+    return _ordered_mean(parse_numeric(values))
+
+
+def diagnose(values, threshold, missing=BAD):
+    """values >= threshold → 양호, 미만 → 미흡, 값 없음(NaN·"") → missing (배열)"""
+    arr = parse_numeric(values).to_numpy() if not isinstance(values, np.ndarray) else values.astype(float)
+    with np.errstate(invalid="ignore"):
+        out = np.where(arr >= threshold, GOOD, BAD).astype(object)
+    out[np.isnan(arr)] = missing
+    return out
+
+
+def diagnose_both(a, b, threshold):
+    """a, b 둘 다 >= threshold → 양호, 아니면(값 없음 포함) 미흡 (배열)"""
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    with np.errstate(invalid="ignore"):
+        return np.where((a >= threshold) & (b >= threshold), GOOD, BAD).astype(object)
+
+
+def cell_value(v, ndigits):
+    """집계값 → 엑셀 셀 값 (NaN·None이면 "", 아니면 round(v, ndigits))"""
+    if v is None or v == "" or pd.isna(v):
+        return ""
+    return round(float(v), ndigits)
+
+
+def optional_float(v):
+    """NaN → None, 그 외 float (행 단위 dict에 넣을 때)"""
+    return None if pd.isna(v) else float(v)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+학교별 리포트 입력 지문(fingerprint) 저장소
+
+- 학교마다 리포트에 쓰이는 입력(통계 시트별 해당 학교 행 값) + 템플릿·행 계획 지문을 해시로 기록
+- 출력 폴더의 .report_fingerprints.json 에 {학교코드: {hash, path}} 로 저장 (출력과 함께 이동·삭제됨)
+- 다음 실행(--changed-only)에서 해시·저장 경로가 같고 파일이 남아 있는 학교는 다시 만들지 않음
+- 생성 로직(포맷·판정 코드)을 바꾸면 FINGERPRINT_VERSION을 올려 전체 재생성
+"""
+import hashlib
+import json
+import os
+
+FINGERPRINT_VERSION = 1
+FINGERPRINT_FILE = ".report_fingerprints.json"
+
+
+def file_sha1(path):
+    """파일 내용 SHA-1 (템플릿 변경 감지용)"""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def values_hash(*parts):
+    """값 튜플/리스트의 repr 기준 SHA-1 (셀 값: 문자열·숫자·날짜·None)"""
+    return hashlib.sha1(repr((FINGERPRINT_VERSION,) + parts).encode("utf-8")).hexdigest()
+
+
+def get_fingerprint_path(output_dir):
+    return os.path.join(output_dir, FINGERPRINT_FILE)
+
+
+def load_fingerprints(output_dir):
+    """저장된 지문 {학교코드: {"hash", "path"}} (없거나 버전이 다르면 빈 dict)"""
+    path = get_fingerprint_path(output_dir)
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != FINGERPRINT_VERSION:
+        return {}
+    return data.get("schools") or {}
+
+
+def save_fingerprints(output_dir, schools):
+    """지문 저장 (임시 파일에 쓴 뒤 교체). path는 출력 폴더 기준 상대 경로."""
+    path = get_fingerprint_path(output_dir)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": FINGERPRINT_VERSION, "schools": schools}, f, ensure_ascii=False, indent=0, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def is_unchanged(saved, school_code, fp_hash, rel_path, output_dir):
+    """지난 저장과 지문·경로가 같고 파일이 있으면 True"""
+    entry = saved.get(school_code)
+    if not entry or entry.get("hash") != fp_hash or entry.get("path") != rel_path:
+        return False
+    return os.path.isfile(os.path.join(output_dir, rel_path))
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+학교별 리포트 템플릿 캐시
+
+- 기존: 학교마다 load_workbook(템플릿) → 같은 xlsx(zip/XML)를 학교 수만큼 다시 파싱
+- 캐시: 템플릿을 한 번만 파싱해 워크북 객체를 메모리에 직렬화(pickle)해 두고,
+  학교마다 직렬화본에서 새 워크북을 복원 (XML 파싱 없음, 학교별 워크북은 서로 독립)
+- 직렬화가 안 되는 템플릿(특수 객체 포함 등)이면 기존처럼 학교마다 load_workbook
+- parse_school_codes: 리포트 생성기 공통 --schools 인자 해석
+"""
+import csv
+import os
+import pickle
+
+from openpyxl import load_workbook
+
+
+class TemplateCache:
+    """템플릿 워크북 1회 파싱 → new_workbook()마다 독립된 복제본 반환"""
+
+    def __init__(self, template_path):
+        self.template_path = template_path
+        wb = load_workbook(template_path)
+        try:
+            self._blob = pickle.dumps(wb, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            self._blob = None
+        finally:
+            wb.close()
+
+    def new_workbook(self):
+        """템플릿과 같은 내용의 새 워크북 (수정해도 캐시·다른 학교 워크북에 영향 없음)"""
+        if self._blob is None:
+            return load_workbook(self.template_path)
+        return pickle.loads(self._blob)
+
+
+def open_template(template):
+    """TemplateCache면 복제본, 경로면 load_workbook (generate_school_report 공용)"""
+    if isinstance(template, TemplateCache):
+        return template.new_workbook()
+    return load_workbook(template)
+
+
+def parse_school_codes(value):
+    """--schools 값 → 학교코드 목록. 쉼표 구분 코드 또는 파일 경로(한 줄에 하나, CSV면 첫 열)."""
+    if not value:
+        return []
+    if os.path.isfile(value):
+        codes = []
+        with open(value, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.reader(f):
+                if row and row[0].strip():
+                    codes.append(row[0].strip())
+        return codes
+    return [c.strip() for c in str(value).split(",") if c.strip()]
@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+"""
+학교별 리포트 직접 XML 채우기 (템플릿 xlsx를 zip으로 다룸)
+
+- 기존: 학교마다 템플릿 워크북 복제(openpyxl) → 셀 값·글꼴 변경 → 전체 워크북 직렬화 저장
+- 이 방식: 템플릿 zip을 한 번 읽어 대상 시트 XML에서 바뀔 수 있는 셀 위치만 미리 찾아 두고,
+  학교마다 그 셀 <c> 요소만 새 값(인라인 문자열/숫자)으로 바꿔 끼운 시트 XML + 나머지 zip 항목(원본 그대로)으로 저장
+- 글꼴 색 변경: 대상 셀의 원래 서식(xf)마다 색만 다른 글꼴·서식을 styles.xml에 미리 추가해 두고 서식 번호만 바꿈
+  (openpyxl Font(color=...) 지정과 같은 글꼴 정의)
+- 대상 셀에 수식이 있는 등 이 방식으로 안전하게 바꿀 수 없는 템플릿이면 ValueError → 호출 측에서 openpyxl 방식 사용
+- 다른 셀의 수식(대상 셀 참조 가능)은 템플릿 계산값(<v>)을 지우고 calcChain 제거 + fullCalcOnLoad 설정
+  → 열 때 다시 계산 (openpyxl 저장처럼 오래된 계산값이 남지 않음)
+"""
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.cell import coordinate_from_string, column_index_from_string
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_ROW_RE = re.compile(r"<row\b[^>]*?(?:/>|>.*?</row>)", re.S)
+_CELL_RE = re.compile(r"<c\b[^>]*?(?:/>|>.*?</c>)", re.S)
+_ATTR_RE = re.compile(r'\b([\w:]+)="([^"]*)"')
+_XF_RE = re.compile(r"<xf\b[^>]*?(?:/>|>.*?</xf>)", re.S)
+_FORMULA_CELL_RE = re.compile(r"<c\b[^>]*?(?<!/)>(?:(?!</c>).)*?<f[\s>/].*?</c>", re.S)
+_CALC_CHAIN = "xl/calcChain.xml"
+# XML 1.0에서 쓸 수 없는 제어 문자 (openpyxl ILLEGAL_CHARACTERS_RE와 같은 범위)
+_ILLEGAL_XML_RE = re.compile(r"[\000-\010]|[\013-\014]|[\016-\037]")
+
+
+def _attrs(tag_text):
+    """시작 태그 문자열의 속성 dict"""
+    head = tag_text[:tag_text.index(">") + 1]
+    return dict(_ATTR_RE.findall(head))
+
+
+def _escape(text):
+    text = _ILLEGAL_XML_RE.sub("", text)
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _sheet_xml_path(members, sheet_name):
+    """workbook.xml + rels에서 시트 이름 → zip 내부 XML 경로 (없으면 첫 시트)"""
+    wb_xml = ET.fromstring(members["xl/workbook.xml"])
+    sheets = list(wb_xml.iter(f"{_NS_MAIN}sheet"))
+    if not sheets:
+        raise ValueError("workbook.xml에 시트 없음")
+    target = next((sh for sh in sheets if sh.get("name") == sheet_name), sheets[0])
+    rid = target.get(f"{_NS_REL}id")
+    rels = ET.fromstring(members["xl/_rels/workbook.xml.rels"])
+    for rel in rels.iter(f"{_NS_PKG_REL}Relationship"):
+        if rel.get("Id") == rid:
+            t = rel.get("Target", "")
+            return t.lstrip("/") if t.startswith("/") else posixpath.normpath(posixpath.join("xl", t))
+    raise ValueError(f"시트 관계 없음: {sheet_name}")
+
+
+def _shared_strings(members):
+    data = members.get("xl/sharedStrings.xml")
+    if not data:
+        return []
+    root = ET.fromstring(data)
+    return ["".join(t.text or "" for t in si.iter(f"{_NS_MAIN}t")) for si in root.iter(f"{_NS_MAIN}si")]
+
+
+def _cell_value(cell_text, shared):
+    """기존 <c> 요소의 값 (공유/인라인 문자열, 숫자, 불리언)"""
+    attrs = _attrs(cell_text)
+    t = attrs.get("t", "n")
+    if t == "inlineStr":
+        m = re.search(r"<is>(.*?)</is>", cell_text, re.S)
+        if not m:
+            return None
+        return "".join(ET.fromstring(f'<is xmlns="{_NS_MAIN[1:-1]}">{m.group(1)}</is>').itertext())
+    m = re.search(r"<v>(.*?)</v>", cell_text, re.S)
+    if not m:
+        return None
+    raw = m.group(1)
+    if t == "s":
+        return shared[int(raw)]
+    if t in ("str", "e"):
+        return ET.fromstring(f"<v>{raw}</v>").text
+    if t == "b":
+        return raw == "1"
+    try:
+        n = float(raw)
+    except ValueError:
+        return raw
+    return int(n) if n.is_integer() and "." not in raw and "E" not in raw.upper() else n
+
+
+def _drop_formula_caches(members):
+    """
+    모든 시트의 수식 셀에서 계산값(<v>)·값 형식(t)을 지우고, 수식이 있으면 calcChain 제거 + 열 때 전체 재계산.
+    반환: 수식이 하나라도 있었으면 True (members는 그 자리에서 수정)
+    """
+    found = False
+    for name in list(members):
+        if not (name.startswith("xl/worksheets/") and name.endswith(".xml")):
+            continue
+        xml = members[name].decode("utf-8")
+        if "<f" not in xml:
+            continue
+
+        def _strip(m):
+            cell = m.group(0)
+            head_end = cell.index(">")
+            head = re.sub(r'\st="[^"]*"', "", cell[:head_end])
+            return head + re.sub(r"<v>.*?</v>|<v\s*/>", "", cell[head_end:], flags=re.S)
+
+        new_xml, n = _FORMULA_CELL_RE.subn(_strip, xml)
+        if n:
+            found = True
+            members[name] = new_xml.encode("utf-8")
+    if not found:
+        return False
+
+    members.pop(_CALC_CHAIN, None)
+    ct = members["[Content_Types].xml"].decode("utf-8")
+    ct = re.sub(r'<Override\b[^>]*PartName="/xl/calcChain\.xml"[^>]*/>', "", ct)
+    members["[Content_Types].xml"] = ct.encode("utf-8")
+    rels = members["xl/_rels/workbook.xml.rels"].decode("utf-8")
+    rels = re.sub(r'<Relationship\b[^>]*Target="/?(?:xl/)?calcChain\.xml"[^>]*/>', "", rels)
+    members["xl/_rels/workbook.xml.rels"] = rels.encode("utf-8")
+
+    wb = members["xl/workbook.xml"].decode("utf-8")
+    m = re.search(r"<calcPr\b[^>]*?/?>", wb)
+    if m:
+        tag = re.sub(r'\sfullCalcOnLoad="[^"]*"', "", m.group(0))
+        end = len(tag) - (2 if tag.endswith("/>") else 1)
+        wb = wb[:m.start()] + tag[:end].rstrip() + ' fullCalcOnLoad="1"' + tag[end:] + wb[m.end():]
+    else:
+        # calcPr는 sheets/functionGroups/externalReferences/definedNames 다음 위치
+        pos = max(wb.rfind(f"</{t}>") + len(f"</{t}>") if wb.rfind(f"</{t}>") >= 0 else -1
+                  for t in ("sheets", "functionGroups", "externalReferences", "definedNames"))
+        if pos < 0:
+            raise ValueError("workbook.xml에 sheets 없음")
+        wb = wb[:pos] + '<calcPr fullCalcOnLoad="1"/>' + wb[pos:]
+    members["xl/workbook.xml"] = wb.encode("utf-8")
+    return True
+
+
+def _render_cell(ref, style, value):
+    """새 <c> 요소 (문자열은 인라인 문자열, 빈 값은 서식만)"""
+    s_attr = f' s="{style}"' if style else ""
+    if value is None or value == "":
+        return f'<c r="{ref}"{s_attr}/>'
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{s_attr} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}"{s_attr}><v>{value!r}</v></c>'
+    return f'<c r="{ref}"{s_attr} t="inlineStr"><is><t xml:space="preserve">{_escape(str(value))}</t></is></c>'
+
+
+class XmlReportTemplate:
+    """
+    템플릿 xlsx 1개 + 바뀔 수 있는 셀 목록으로 준비. save(updates, out_path)로 학교별 파일 저장.
+    updates: {(행, 열): (값, 글꼴색 또는 None)} — 글꼴색은 font_colors 중 하나 (None이면 원래 서식)
+    """
+
+    def __init__(self, template_path, sheet_name, cells, font_colors=()):
+        with zipfile.ZipFile(template_path) as zf:
+            self._infos = zf.infolist()
+            members = {info.filename: zf.read(info) for info in self._infos}
+        if _drop_formula_caches(members):
+            self._infos = [info for info in self._infos if info.filename in members]
+        self._sheet_path = _sheet_xml_path(members, sheet_name)
+        shared = _shared_strings(members)
+        xml = members[self._sheet_path].decode("utf-8")
+        self._members = members
+        self._base_values = {}
+        self._base_styles = {}
+        self._segments = self._compile_sheet(xml, sorted(set(cells)), shared)
+        self._font_styles = {}
+        if font_colors:
+            members["xl/styles.xml"] = self._add_font_styles(
+                members["xl/styles.xml"].decode("utf-8"), font_colors
+            ).encode("utf-8")
+
+    # ----- 준비 (템플릿 1회) -----
+
+    def _compile_sheet(self, xml, cells, shared):
+        """
+        시트 XML → [고정 문자열 | 슬롯] 목록. 슬롯은 학교마다 바뀌는 부분:
+        ("cell", 행, 열, 원래 텍스트), ("cells", 행, [열...]), ("row_open", 행, 원래 텍스트, [열...]), ("row", 행, [열...])
+        """
+        sd_start = xml.find("<sheetData")
+        if sd_start < 0:
+            raise ValueError("sheetData 없음")
+        sd_head_end = xml.index(">", sd_start) + 1
+        if xml[sd_head_end - 2] == "/":
+            # <sheetData/> → 여는/닫는 태그로 풀어서 처리
+            xml = xml[:sd_start] + "<sheetData></sheetData>" + xml[sd_head_end:]
+            sd_head_end = sd_start + len("<sheetData>")
+        sd_end = xml.index("</sheetData>", sd_head_end)
+
+        rows = {}
+        for m in _ROW_RE.finditer(xml, sd_head_end, sd_end):
+            r = _attrs(m.group(0)).get("r")
+            if not r:
+                raise ValueError("행 번호(r) 없는 row")
+            rows[int(r)] = m
+        by_row = {}
+        for r, c in cells:
+            by_row.setdefault(r, []).append(c)
+
+        edits = []  # (start, end, slot)
+        for r, cols in sorted(by_row.items()):
+            m = rows.get(r)
+            if m is None:
+                pos = next((rows[k].start() for k in sorted(rows) if k > r), sd_end)
+                edits.append((pos, pos, ("row", r, cols)))
+                continue
+            row_text = m.group(0)
+            if row_text.endswith("/>"):
+                edits.append((m.start(), m.end(), ("row_open", r, row_text[:-2] + ">", cols)))
+                continue
+            cell_ms = {}
+            for cm in _CELL_RE.finditer(xml, m.start(), m.end()):
+                ref = _attrs(cm.group(0)).get("r")
+                if not ref:
+                    raise ValueError(f"셀 주소(r) 없는 c ({r}행)")
+                cell_ms[column_index_from_string(coordinate_from_string(ref)[0])] = cm
+            missing = {}
+            for c in cols:
+                cm = cell_ms.get(c)
+                if cm is None:
+                    pos = next((cell_ms[k].start() for k in sorted(cell_ms) if k > c), m.end() - len("</row>"))
+                    missing.setdefault(pos, []).append(c)
+                    continue
+                text = cm.group(0)
+                if "<f>" in text or "<f " in text:
+                    raise ValueError(f"대상 셀에 수식 있음: {get_column_letter(c)}{r}")
+                self._base_values[(r, c)] = _cell_value(text, shared)
+                self._base_styles[(r, c)] = int(_attrs(text).get("s", 0))
+                edits.append((cm.start(), cm.end(), ("cell", r, c, text)))
+            for pos, mcols in missing.items():
+                edits.append((pos, pos, ("cells", r, mcols)))
+        for r, c in cells:
+            self._base_styles.setdefault((r, c), 0)
+
+        edits.sort(key=lambda e: e[0])
+        segments = []
+        last = 0
+        for start, end, slot in edits:
+            segments.append(xml[last:start])
+            segments.append(slot)
+            last = end
+        segments.append(xml[last:])
+        max_row = max((r for r, _ in cells), default=0)
+        segments[0] = self._expand_dimension(segments[0], max_row, max((c for _, c in cells), default=0))
+        return segments
+
+    @staticmethod
+    def _expand_dimension(head, max_row, max_col):
+        """<dimension ref>가 새로 쓸 수 있는 셀까지 포함하도록 확장"""
+        m = re.search(r'<dimension ref="([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?"', head)
+        if not m:
+            return head
+        c1, r1 = m.group(1), int(m.group(2))
+        c2 = m.group(3) or c1
+        r2 = int(m.group(4) or r1)
+        c2 = get_column_letter(max(column_index_from_string(c2), max_col))
+        r2 = max(r2, max_row)
+        return head[:m.start()] + f'<dimension ref="{c1}{r1}:{c2}{r2}"' + head[m.end():]
+
+    def _add_font_styles(self, styles_xml, font_colors):
+        """대상 셀 서식마다 글꼴 색만 다른 font/xf를 추가하고 (원래 서식, 색) → 새 서식 번호 기록"""
+        fm = re.search(r"<fonts\b[^>]*>", styles_xml)
+        fe = styles_xml.index("</fonts>")
+        n_fonts = len(re.findall(r"<font\b", styles_xml[fm.end():fe]))
+        xm = re.search(r"<cellXfs\b[^>]*>", styles_xml)
+        xe = styles_xml.index("</cellXfs>")
+        xfs = _XF_RE.findall(styles_xml, xm.end(), xe)
+        new_fonts = []
+        new_xfs = []
+        font_ids = {}
+        for color in font_colors:
+            font_ids[color] = n_fonts + len(new_fonts)
+            # openpyxl Font(color="RRGGBB")와 같은 정의 (알파 00)
+            new_fonts.append(f'<font><color rgb="00{color[-6:].upper()}"/></font>')
+        for base in sorted(set(self._base_styles.values())):
+            if base >= len(xfs):
+                raise ValueError(f"서식 번호 범위 밖: {base}")
+            xf = xfs[base]
+            cut = xf.index(">")
+            head = re.sub(r'\s(?:fontId|applyFont)="[^"]*"', "", xf[:cut].rstrip("/"))
+            rest = "/>" if cut == len(xf) - 1 else xf[cut:]
+            for color in font_colors:
+                self._font_styles[(base, color)] = len(xfs) + len(new_xfs)
+                new_xfs.append(f'{head} fontId="{font_ids[color]}" applyFont="1"{rest}')
+        out = (
+            styles_xml[:fe] + "".join(new_fonts) + styles_xml[fe:xm.start()]
+            + styles_xml[xm.start():xe] + "".join(new_xfs) + styles_xml[xe:]
+        )
+        out = re.sub(r'(<fonts\b[^>]*?\bcount=")\d+', lambda m: f"{m.group(1)}{n_fonts + len(new_fonts)}", out, count=1)
+        out = re.sub(r'(<cellXfs\b[^>]*?\bcount=")\d+', lambda m: f"{m.group(1)}{len(xfs) + len(new_xfs)}", out, count=1)
+        return out
+
+    # ----- 학교별 -----
+
+    def base_value(self, row, col):
+        """템플릿에 원래 있던 대상 셀 값 (없으면 None)"""
+        return self._base_values.get((row, col))
+
+    def _cell_text(self, row, col, update):
+        value, color = update
+        style = self._base_styles[(row, col)]
+        if color is not None:
+            style = self._font_styles[(style, color)]
+        return _render_cell(f"{get_column_letter(col)}{row}", style, value)
+
+    def render_sheet(self, updates):
+        """updates를 반영한 시트 XML 문자열"""
+        parts = []
+        for seg in self._segments:
+            if isinstance(seg, str):
+                parts.append(seg)
+                continue
+            kind = seg[0]
+            if kind == "cell":
+                _, r, c, original = seg
+                u = updates.get((r, c))
+                parts.append(original if u is None else self._cell_text(r, c, u))
+                continue
+            r = seg[1]
+            cols = seg[-1]
+            cells = "".join(self._cell_text(r, c, updates[(r, c)]) for c in cols if (r, c) in updates)
+            if kind == "cells":
+                parts.append(cells)
+            elif kind == "row_open":
+                parts.append(seg[2] + cells + "</row>" if cells else seg[2][:-1] + "/>")
+            elif cells:
+                parts.append(f'<row r="{r}">{cells}</row>')
+        return "".join(parts)
+
+    def save(self, updates, out_path):
+        """시트 XML만 새로 만들고 나머지 zip 항목은 템플릿 내용 그대로 저장"""
+        sheet = self.render_sheet(updates).encode("utf-8")
+        with zipfile.ZipFile(out_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for info in self._infos:
+                data = sheet if info.filename == self._sheet_path else self._members[info.filename]
+                zf.writestr(info, data)
@@ -10,10 +10,16 @@
 - 섹션 2: 파일/경로 (파일명 정리, 템플릿/통계/출력 경로 해석)
 - 섹션 3: 사용자 입력 (선택 프롬프트)
 - 섹션 4: 학교 목록 로딩 (전체 목록, 통계 내 메타, 학교별 행 인덱스)
+  ※ 통계 파일은 값 스냅샷(stats_snapshot.StatsSnapshot)으로 1회 로드, 시트 조회는 ws.value(r, c)
 - 섹션 5: 측정값 추출·포맷 (시트→값, 숫자/문자 포맷, 출력 문자열)
 - 섹션 6: 판정 (기준값 연산 → 정상/개선필요)
-- 섹션 7: 리포트 생성 (템플릿 채우기: J열, L열, 요약 셀)
+- 섹션 7: 리포트 생성 (행 계획 1회 해석 → 템플릿 채우기: J열, L열, 요약 셀)
+  ※ 기본 저장은 템플릿 zip의 시트 XML에서 대상 셀만 바꾸는 방식(report_xml_filler),
+    템플릿이 맞지 않거나 --openpyxl 지정 시 openpyxl 워크북 복제·저장
 - 섹션 8: 오케스트레이션 (경로 설정, 데이터 로드, 로그, 일괄 생성)
+  ※ run_batch(): 입력 프롬프트 없이 경로·옵션을 인자로 받아 실행, 개수·소요 시간 dict 반환
+    (CLI: --stats/--template/--out/--layout/--schools 또는 --batch 지정 시 배치 모드)
+  ※ 학교별 입력 지문(report_fingerprint)을 출력 폴더에 기록, --changed-only면 입력·템플릿이 바뀐 학교만 생성
 
 TODO(2차): load_full_school_list 내 CSV/Excel 헤더 파싱 공통화(_parse_school_table).
 TODO(2차): format_output_value 를 fmt별 _format_output_* 로 분리 검토.
@@ -24,11 +30,17 @@ import io
 import os
 import csv
 import re
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from collections import Counter
+from collections import Counter, namedtuple
 
-if hasattr(sys.stdout, "buffer"):
+# 이미 UTF-8이면 다시 감싸지 않음 (다른 모듈이 먼저 감싼 래퍼를 교체하면 그 래퍼가 정리되며 버퍼가 닫힘)
+if hasattr(sys.stdout, "buffer") and (sys.stdout.encoding or "").lower() != "utf-8":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+if hasattr(sys.stderr, "buffer") and (sys.stderr.encoding or "").lower() != "utf-8":
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
 
 from openpyxl import load_workbook
@@ -59,6 +71,10 @@ from school_report_config_v1_1 import (
     LOG_DIR,
     LOG_PREFIX,
 )
+from report_template import TemplateCache, open_template, parse_school_codes
+from report_xml_filler import XmlReportTemplate
+from report_fingerprint import file_sha1, values_hash, load_fingerprints, save_fingerprints, is_unchanged
+from stats_snapshot import load_stats_snapshot
 
 SCHOOL_LIST_SEARCH_DIRS = [_RUN_DIR, _MEASURE_DIR, os.path.join(os.path.dirname(_MEASURE_DIR), "split")]
 TEMPLATE_SHEET = "문제점분석"
@@ -126,13 +142,8 @@ def _resolve_sheet_name(wb_stats, target_name):
     return None
 
 
-def _pick_best_row(ws, rows, row_def):
-    """동일 학교 다중행 중 매핑 열 기준으로 가장 값이 많은 행 선택."""
-    if not rows:
-        return None
-    if len(rows) == 1:
-        return rows[0]
-
+def _pick_cols(row_def):
+    """_pick_best_row 점수 계산에 쓰는 열 (정렬·중복 제거)."""
     col1, col2 = row_def[2], row_def[3]
     cols = []
     if isinstance(col1, list):
@@ -141,29 +152,39 @@ def _pick_best_row(ws, rows, row_def):
         cols.append(col1)
     if isinstance(col2, int):
         cols.append(col2)
-    cols = sorted(set(cols))
-    if not cols:
-        return rows[0]
+    return sorted(set(cols))
+
 
+def _pick_best_row_by_cols(ws, rows, cols):
+    """rows 중 cols 값이 가장 많이 채워진 행 (동점이면 앞 행)."""
+    if len(rows) == 1 or not cols:
+        return rows[0]
     best_row = rows[0]
     best_score = -1
     for r in rows:
-        score = sum(
-            1
-            for c in cols
-            if ws.cell(r, c).value is not None and str(ws.cell(r, c).value).strip() != ""
-        )
+        score = 0
+        for c in cols:
+            v = ws.value(r, c)
+            if v is not None and str(v).strip() != "":
+                score += 1
         if score > best_score:
             best_row = r
             best_score = score
     return best_row
 
 
+def _pick_best_row(ws, rows, row_def):
+    """동일 학교 다중행 중 매핑 열 기준으로 가장 값이 많은 행 선택."""
+    if not rows:
+        return None
+    return _pick_best_row_by_cols(ws, rows, _pick_cols(row_def))
+
+
 def _find_header_col(ws, include_keywords, exclude_keywords=None):
     """헤더 키워드로 열 번호 탐색."""
     exclude_keywords = exclude_keywords or []
     for c in range(1, min(80, ws.max_column + 1)):
-        h = str(ws.cell(1, c).value or "").strip().lower()
+        h = str(ws.value(1, c) or "").strip().lower()
         if not h:
             continue
         if any(k in h for k in include_keywords) and not any(k in h for k in exclude_keywords):
@@ -427,7 +448,7 @@ def load_school_meta_from_sheet1(wb_stats):
         return [], {}, {}
 
     ws = wb_stats[target_sheet]
-    headers = [str(ws.cell(1, c).value or "").strip().lower() for c in range(1, ws.max_column + 1)]
+    headers = [str(ws.value(1, c) or "").strip().lower() for c in range(1, ws.max_column + 1)]
 
     code_col = name_col = region_col = None
     for i, h in enumerate(headers, 1):
@@ -445,11 +466,11 @@ def load_school_meta_from_sheet1(wb_stats):
     code_to_name = {}
     code_to_region = {}
     for r in range(2, ws.max_row + 1):
-        code = str(ws.cell(r, code_col).value or "").strip()
+        code = str(ws.value(r, code_col) or "").strip()
         if not code:
             continue
-        name = str(ws.cell(r, name_col).value or "").strip()
-        region = str(ws.cell(r, region_col).value or "").strip() if region_col else ""
+        name = str(ws.value(r, name_col) or "").strip()
+        region = str(ws.value(r, region_col) or "").strip() if region_col else ""
         codes.append(code)
         code_to_name[code] = name
         code_to_region[code] = region
@@ -463,12 +484,12 @@ def load_stats_by_school(wb_stats):
         ws = wb_stats[real_sheet_name]
         code_col = 1
         for c in range(1, min(50, ws.max_column + 1)):
-            v = ws.cell(1, c).value
+            v = ws.value(1, c)
             if v and ("학교코드" in str(v) or "code" in str(v).lower()):
                 code_col = c
                 break
         for r in range(2, ws.max_row + 1):
-            sc = str(ws.cell(r, code_col).value or "").strip()
+            sc = str(ws.value(r, code_col) or "").strip()
             if not sc:
                 continue
             if sc not in by_school:
@@ -490,13 +511,13 @@ def get_school_name_from_stats(wb_stats, school_data):
             continue
         name_col = None
         for c in range(1, min(50, ws.max_column + 1)):
-            v = ws.cell(1, c).value
+            v = ws.value(1, c)
             s = str(v or "").strip().lower()
             if "학교명" in s or s == "name":
                 name_col = c
                 break
         if name_col:
-            n = str(ws.cell(row, name_col).value or "").strip()
+            n = str(ws.value(row, name_col) or "").strip()
             if n:
                 return n
     return ""
@@ -533,15 +554,15 @@ def get_school_values(wb_stats, school_code, school_data, row_def):
         dynamic_cols = _resolve_isp_cols_by_header(ws)
         report_row = row_def[0]
         if report_row in dynamic_cols and dynamic_cols[report_row]:
-            v = ws.cell(data_row, dynamic_cols[report_row]).value
+            v = ws.value(data_row, dynamic_cols[report_row])
             return v, None
 
     col1, col2 = row_def[2], row_def[3]
     if isinstance(col1, list):
-        vals = [ws.cell(data_row, c).value for c in col1]
+        vals = [ws.value(data_row, c) for c in col1]
         return vals, None
-    v1 = ws.cell(data_row, col1).value if col1 else None
-    v2 = ws.cell(data_row, col2).value if col2 else None
+    v1 = ws.value(data_row, col1) if col1 else None
+    v2 = ws.value(data_row, col2) if col2 else None
     return v1, v2
 
 
@@ -674,11 +695,77 @@ def judge(val, op, threshold, val2=None):
 # 섹션 7: 리포트 생성 (J열 측정값, L열 판정, 요약 셀)
 # ---------------------------------------------------------------------------
 
-def _compute_row_output(wb_stats, school_data, row_def):
-    """한 출력행에 대한 J열 문자열과 판정용 원시값 (v1, v2) 계산.
+# 통계 워크북 1개당 1회 해석한 J_OUTPUT_MAP 행 계획
+# kind: fixed(고정값) / h_only / missing(시트 없음) / isp(헤더로 찾은 열 1개) / list(열 목록) / pair(col1, col2)
+RowPlan = namedtuple(
+    "RowPlan",
+    ["row", "row_def", "kind", "sheet", "ws", "pick_cols", "col1", "col2", "fmt", "write_j", "black_font", "judgment"],
+)
+
+
+def compile_row_plan(wb_stats):
+    """J_OUTPUT_MAP 전체를 통계 워크북 기준으로 1회 해석 (시트명 보정, ISP 헤더 열, 판정 기준).
+    반환: [RowPlan, ...] (J_OUTPUT_MAP 순서) — 학교별 채우기에서는 조회만 함."""
+    l_map = {row: (op, th) for row, op, th in L_JUDGMENT_MAP}
+    resolved = {}
+    isp_cols = {}
+    plan = []
+    for row_def in J_OUTPUT_MAP:
+        row, sheet_name = row_def[0], row_def[1]
+        fmt = row_def[4] if len(row_def) >= 5 else None
+        sheet = ws = None
+        col1, col2 = row_def[2], row_def[3]
+        if sheet_name == "fixed":
+            kind = "fixed"
+        elif sheet_name == "h_only":
+            kind = "h_only"
+        else:
+            if sheet_name not in resolved:
+                resolved[sheet_name] = _resolve_sheet_name(wb_stats, sheet_name)
+            sheet = resolved[sheet_name]
+            if not sheet:
+                kind = "missing"
+            else:
+                ws = wb_stats[sheet]
+                kind = "list" if isinstance(col1, list) else "pair"
+                if "isp" in _norm_sheet_name(sheet_name) and "학교별평균" in sheet_name:
+                    if sheet not in isp_cols:
+                        isp_cols[sheet] = _resolve_isp_cols_by_header(ws)
+                    dyn_col = isp_cols[sheet].get(row)
+                    if dyn_col:
+                        kind, col1, col2 = "isp", dyn_col, None
+        plan.append(RowPlan(
+            row=row, row_def=row_def, kind=kind, sheet=sheet, ws=ws, pick_cols=_pick_cols(row_def),
+            col1=col1, col2=col2, fmt=fmt, write_j=fmt != "h_only", black_font=row in FONT_BLACK_ROWS,
+            judgment=l_map.get(row),
+        ))
+    return plan
+
+
+def _plan_values(p, school_data):
+    """행 계획 1개로 학교 원시값 (v1, v2) 조회 (get_school_values 와 같은 결과)."""
+    if p.kind == "fixed":
+        return p.row_def[2], None
+    if p.kind in ("h_only", "missing"):
+        return None, None
+    rows = school_data.get(p.sheet)
+    if not rows:
+        return None, None
+    row_list = rows if isinstance(rows, list) else [rows]
+    data_row = _pick_best_row_by_cols(p.ws, row_list, p.pick_cols)
+    value = p.ws.value
+    if p.kind == "list":
+        return [value(data_row, c) for c in p.col1], None
+    v1 = value(data_row, p.col1) if p.col1 else None
+    v2 = value(data_row, p.col2) if p.col2 else None
+    return v1, v2
+
+
+def _compute_row_output(p, school_data):
+    """행 계획 1개에 대한 J열 문자열과 판정용 원시값 (v1, v2) 계산.
     반환: (j_str, v1, v2) — J열에 쓸 문자열과 L열 판정에 쓸 값."""
-    v1, v2 = get_school_values(wb_stats, None, school_data, row_def)
-    j_str = format_output_value(v1, v2, row_def)
+    v1, v2 = _plan_values(p, school_data)
+    j_str = format_output_value(v1, v2, p.row_def)
     return j_str, v1, v2
 
 
@@ -697,19 +784,39 @@ def _compute_judgment_for_row(row, v1, v2, l_map):
     return result
 
 
-def _fill_measurement_and_judgment(ws, wb_stats, school_data):
-    """J열 측정값과 L열 판정을 채운다 (계산은 _compute_* 에 위임)."""
-    l_map = {row: (op, th) for row, op, th in L_JUDGMENT_MAP}
-    for row_def in J_OUTPUT_MAP:
-        row = row_def[0]
-        j_str, v1, v2 = _compute_row_output(wb_stats, school_data, row_def)
-        fmt = row_def[4] if len(row_def) >= 5 else None
-        if fmt != "h_only":
+def _row_results(plan, school_data):
+    """행 계획마다 (p, J열 문자열, L열 판정 또는 None) — openpyxl/XML 채우기 공용."""
+    l_map = {p.row: p.judgment for p in plan if p.judgment is not None}
+    for p in plan:
+        j_str, v1, v2 = _compute_row_output(p, school_data)
+        result = _compute_judgment_for_row(p.row, v1, v2, l_map) if p.judgment is not None else None
+        yield p, j_str, result
+
+
+def _count_judgments(values):
+    """L열 값들에서 (정상 개수, 개선필요 개수)."""
+    count_정상 = 0
+    count_개선필요 = 0
+    for val in values:
+        s = str(val or "").strip()
+        if s == "정상":
+            count_정상 += 1
+        elif s == "개선필요":
+            count_개선필요 += 1
+    return count_정상, count_개선필요
+
+
+def _fill_measurement_and_judgment(ws, wb_stats, school_data, plan=None):
+    """J열 측정값과 L열 판정을 채운다. plan(compile_row_plan 결과)이 없으면 이 자리에서 해석."""
+    if plan is None:
+        plan = compile_row_plan(wb_stats)
+    for p, j_str, result in _row_results(plan, school_data):
+        row = p.row
+        if p.write_j:
             cell = ws.cell(row=row, column=J_COL)
             cell.value = j_str
-            if row in FONT_BLACK_ROWS:
+            if p.black_font:
                 cell.font = Font(color="000000")
-        result = _compute_judgment_for_row(row, v1, v2, l_map)
         if result is not None:
             l_cell = ws.cell(row=row, column=L_COL, value=result)
             if result == "개선필요":
@@ -719,30 +826,68 @@ def _fill_measurement_and_judgment(ws, wb_stats, school_data):
 def _fill_summary_cells(ws):
     """G21 고정값, G36/L36·G37/L37 정상·개선필요 개수 채우기."""
     ws.cell(row=21, column=G_COL, value="375 Mhz 이상")
-    count_정상 = 0
-    count_개선필요 = 0
-    for r in range(JUDGMENT_ROW_START, JUDGMENT_ROW_END + 1):
-        val = ws.cell(row=r, column=L_COL).value
-        s = str(val or "").strip()
-        if s == "정상":
-            count_정상 += 1
-        elif s == "개선필요":
-            count_개선필요 += 1
+    count_정상, count_개선필요 = _count_judgments(
+        ws.cell(row=r, column=L_COL).value for r in range(JUDGMENT_ROW_START, JUDGMENT_ROW_END + 1)
+    )
     ws.cell(row=36, column=G_COL, value="정상")
     ws.cell(row=36, column=L_COL, value=count_정상)
     ws.cell(row=37, column=G_COL, value="개선필요")
     ws.cell(row=37, column=L_COL, value=count_개선필요)
 
 
-def generate_school_report(template_path, wb_stats, school_code, school_data):
-    """템플릿을 열어 J열(측정값), L열(판정), 요약 셀을 채운 워크북 반환."""
-    wb = load_workbook(template_path)
+def generate_school_report(template, wb_stats, school_code, school_data, plan=None):
+    """템플릿을 열어 J열(측정값), L열(판정), 요약 셀을 채운 워크북 반환.
+    template: TemplateCache(1회 파싱 후 복제) 또는 템플릿 경로.
+    plan: compile_row_plan(wb_stats) 결과 (일괄 생성 시 1회 만들어 전달)."""
+    wb = open_template(template)
     ws = wb[TEMPLATE_SHEET] if TEMPLATE_SHEET in wb.sheetnames else wb.active
-    _fill_measurement_and_judgment(ws, wb_stats, school_data)
+    _fill_measurement_and_judgment(ws, wb_stats, school_data, plan)
     _fill_summary_cells(ws)
     return wb
 
 
+def report_target_cells():
+    """리포트에서 바뀔 수 있는 셀 (행, 열) 목록 — XML 채우기 준비용 (설정만으로 결정)."""
+    cells = {(row_def[0], J_COL) for row_def in J_OUTPUT_MAP
+             if not (len(row_def) >= 5 and row_def[4] == "h_only")}
+    cells.update((row, L_COL) for row, _op, _th in L_JUDGMENT_MAP)
+    cells.update((r, L_COL) for r in range(JUDGMENT_ROW_START, JUDGMENT_ROW_END + 1))
+    cells.update([(21, G_COL), (36, G_COL), (36, L_COL), (37, G_COL), (37, L_COL)])
+    return sorted(cells)
+
+
+def build_report_cell_updates(xml_template, school_data, plan):
+    """XML 채우기용 {(행, 열): (값, 글꼴색 또는 None)} — generate_school_report 와 같은 셀·글꼴."""
+    updates = {}
+    for p, j_str, result in _row_results(plan, school_data):
+        if p.write_j:
+            updates[(p.row, J_COL)] = (j_str, "000000" if p.black_font else None)
+        if result is not None:
+            updates[(p.row, L_COL)] = (result, "FF0000" if result == "개선필요" else None)
+    updates[(21, G_COL)] = ("375 Mhz 이상", None)
+    count_정상, count_개선필요 = _count_judgments(
+        updates[(r, L_COL)][0] if (r, L_COL) in updates else xml_template.base_value(r, L_COL)
+        for r in range(JUDGMENT_ROW_START, JUDGMENT_ROW_END + 1)
+    )
+    updates[(36, G_COL)] = ("정상", None)
+    updates[(36, L_COL)] = (count_정상, None)
+    updates[(37, G_COL)] = ("개선필요", None)
+    updates[(37, L_COL)] = (count_개선필요, None)
+    return updates
+
+
+def load_report_template(template_path, use_xml=True):
+    """리포트 템플릿 준비. use_xml이면 XML 직접 채우기, 안 맞는 템플릿이면 TemplateCache로 대체."""
+    if use_xml:
+        try:
+            return XmlReportTemplate(
+                template_path, TEMPLATE_SHEET, report_target_cells(), font_colors=("000000", "FF0000"),
+            )
+        except (ValueError, KeyError) as e:
+            print(f"[안내] 템플릿 XML 직접 채우기 불가({e}) → openpyxl 방식으로 생성")
+    return TemplateCache(template_path)
+
+
 # ---------------------------------------------------------------------------
 # 섹션 8: 오케스트레이션 (경로 설정, 데이터 로드, 로그, 일괄 생성)
 # ---------------------------------------------------------------------------
@@ -780,13 +925,13 @@ def _setup_paths():
 
 
 def _load_workbook_and_school_lists(total_measure_path):
-    """통계 워크북 로드 및 학교 목록·메타·학교별 데이터 준비.
-    반환: (wb_stats, all_schools, code_to_name, code_to_region, by_school)
+    """통계 파일 값 스냅샷 로드 및 학교 목록·메타·학교별 데이터 준비.
+    반환: (wb_stats(StatsSnapshot), all_schools, code_to_name, code_to_region, by_school)
+    통계 파일이 없으면 FileNotFoundError, 학교별 데이터가 없으면 ValueError.
     """
     if not os.path.isfile(total_measure_path):
-        print(f"[오류] 통계 파일 없음: {total_measure_path}")
-        sys.exit(1)
-    wb_stats = load_workbook(total_measure_path, data_only=True)
+        raise FileNotFoundError(f"통계 파일 없음: {total_measure_path}")
+    wb_stats = load_stats_snapshot(total_measure_path)
     sheet_codes, sheet_code_to_name, sheet_code_to_region = load_school_meta_from_sheet1(wb_stats)
     if sheet_codes:
         all_schools = sheet_codes
@@ -800,8 +945,8 @@ def _load_workbook_and_school_lists(total_measure_path):
 
     by_school = load_stats_by_school(wb_stats)
     if not by_school:
-        print("[오류] 학교별 데이터 없음")
-        sys.exit(1)
+        wb_stats.close()
+        raise ValueError(f"학교별 데이터 없음: {total_measure_path}")
     return wb_stats, all_schools, code_to_name, code_to_region, by_school
 
 
@@ -832,17 +977,50 @@ def _write_missing_schools_log(log_path, all_schools, schools_with_data, code_to
     return missing
 
 
-def _generate_and_save_all(
-    template_path,
-    wb_stats,
-    output_dir,
-    output_layout,
-    by_school,
-    code_to_name,
-    code_to_region,
-):
-    """리포트 생성 및 저장. 저장 실패/이름 없는 학교는 제외하고 로그용 목록 반환.
-    반환: (generated_count, skipped_codes)
+# 프로세스 풀 워커별 상태 (_init_report_worker 에서 1회 설정)
+_WORKER_STATE = {}
+
+
+def _init_report_worker(template, wb_stats):
+    """워커 초기화: 템플릿 캐시·통계 스냅샷을 워커당 1회 받고 행 계획을 만들어 둔다."""
+    _WORKER_STATE["template"] = template
+    _WORKER_STATE["wb_stats"] = wb_stats
+    _WORKER_STATE["plan"] = compile_row_plan(wb_stats)
+
+
+def _save_school_report(template, wb_stats, plan, school_code, school_data, out_path):
+    """리포트 1개 생성·저장. 반환: 저장 성공 여부 (PermissionError면 False)."""
+    if isinstance(template, XmlReportTemplate):
+        try:
+            template.save(build_report_cell_updates(template, school_data, plan), out_path)
+            return True
+        except PermissionError:
+            return False
+    wb = generate_school_report(template, wb_stats, school_code, school_data, plan)
+    try:
+        wb.save(out_path)
+        return True
+    except PermissionError:
+        return False
+    finally:
+        try:
+            wb.close()
+        except Exception:
+            pass
+
+
+def _save_school_report_in_worker(school_code, school_data, out_path):
+    """프로세스 풀 작업 단위. 반환: (school_code, 저장 성공 여부)."""
+    ok = _save_school_report(
+        _WORKER_STATE["template"], _WORKER_STATE["wb_stats"], _WORKER_STATE["plan"],
+        school_code, school_data, out_path,
+    )
+    return school_code, ok
+
+
+def _build_save_jobs(wb_stats, output_dir, output_layout, by_school, code_to_name, code_to_region):
+    """학교별 저장 경로 결정 및 지역 폴더 생성 (부모 프로세스에서만 실행).
+    반환: (jobs[(school_code, out_path)], 학교명 없어 제외된 코드 목록)
     """
     os.makedirs(output_dir, exist_ok=True)
     save_codes = sorted(by_school.keys())
@@ -850,9 +1028,9 @@ def _generate_and_save_all(
     for sc in save_codes:
         region_totals[_normalize_region(code_to_region.get(sc, ""))] += 1
 
+    jobs = []
     skipped_codes = []
-    generated_count = 0
-    for school_code in tqdm(save_codes, desc="학교별 생성", unit="교"):
+    for school_code in save_codes:
         school_name = code_to_name.get(school_code, "")
         if not school_name:
             school_name = get_school_name_from_stats(wb_stats, by_school[school_code])
@@ -860,8 +1038,6 @@ def _generate_and_save_all(
         if not safe_name:
             skipped_codes.append(school_code)
             continue
-        school_data = by_school[school_code]
-        wb = generate_school_report(template_path, wb_stats, school_code, school_data)
         out_name = f"{school_code}_{safe_name}.xlsx"
         region = _normalize_region(code_to_region.get(school_code, ""))
         if output_layout == "region":
@@ -870,17 +1046,113 @@ def _generate_and_save_all(
             out_path = os.path.join(region_dir, out_name)
         else:
             out_path = os.path.join(output_dir, out_name)
-        try:
-            wb.save(out_path)
-            generated_count += 1
-        except PermissionError:
-            skipped_codes.append(school_code)
-        finally:
-            try:
-                wb.close()
-            except Exception:
-                pass
-    return generated_count, skipped_codes
+        jobs.append((school_code, out_path))
+    return jobs, skipped_codes
+
+
+def _generate_and_save_all(
+    template_path,
+    wb_stats,
+    output_dir,
+    output_layout,
+    by_school,
+    code_to_name,
+    code_to_region,
+    workers=1,
+    use_xml=True,
+    changed_only=False,
+):
+    """리포트 생성 및 저장. 저장 실패/이름 없는 학교는 제외하고 로그용 목록 반환.
+    workers > 1이면 생성·저장만 프로세스 풀에서 실행 (경로·폴더·제외 목록은 부모가 관리).
+    use_xml=False면 XML 직접 채우기 대신 openpyxl로 생성.
+    changed_only면 입력 지문·저장 경로가 지난 저장과 같고 파일이 있는 학교는 생성하지 않음.
+    반환: (generated_count, skipped_codes, unchanged_codes)
+    """
+    jobs, skipped_codes = _build_save_jobs(
+        wb_stats, output_dir, output_layout, by_school, code_to_name, code_to_region,
+    )
+    plan = compile_row_plan(wb_stats)
+    base_fp = _plan_fingerprint(template_path, plan)
+    fingerprints = {
+        sc: school_input_fingerprint(base_fp, wb_stats, plan, by_school[sc]) for sc, _ in jobs
+    }
+    saved = load_fingerprints(output_dir)
+    unchanged_codes = []
+    if changed_only:
+        jobs, unchanged_codes = _filter_changed_jobs(jobs, output_dir, fingerprints, saved)
+        print(f"[변경 감지] 생성 대상 {len(jobs)}개, 변경 없음 {len(unchanged_codes)}개")
+    saved_paths = dict(jobs)
+
+    template = load_report_template(template_path, use_xml) if jobs else None
+    generated_count = 0
+    if workers <= 1 or not jobs:
+        for school_code, out_path in tqdm(jobs, desc="학교별 생성", unit="교"):
+            if _save_school_report(template, wb_stats, plan, school_code, by_school[school_code], out_path):
+                generated_count += 1
+                saved[school_code] = {
+                    "hash": fingerprints[school_code], "path": os.path.relpath(out_path, output_dir),
+                }
+            else:
+                skipped_codes.append(school_code)
+                saved.pop(school_code, None)
+        save_fingerprints(output_dir, saved)
+        return generated_count, skipped_codes, unchanged_codes
+
+    # 워커마다 템플릿(XML 조각 또는 직렬화 바이트)·통계 스냅샷(값 튜플)을 1회 전달, 작업은 학교별 행 인덱스만 전달
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_report_worker, initargs=(template, wb_stats),
+    ) as executor:
+        futures = [
+            executor.submit(_save_school_report_in_worker, school_code, by_school[school_code], out_path)
+            for school_code, out_path in jobs
+        ]
+        for fut in tqdm(as_completed(futures), total=len(futures), desc=f"학교별 생성(x{workers})", unit="교"):
+            school_code, ok = fut.result()
+            if ok:
+                generated_count += 1
+                saved[school_code] = {
+                    "hash": fingerprints[school_code],
+                    "path": os.path.relpath(saved_paths[school_code], output_dir),
+                }
+            else:
+                skipped_codes.append(school_code)
+                saved.pop(school_code, None)
+    save_fingerprints(output_dir, saved)
+    return generated_count, skipped_codes, unchanged_codes
+
+
+def _plan_fingerprint(template_path, plan):
+    """템플릿 내용 + 행 계획(시트·열·포맷·판정 기준) 지문 — 바뀌면 모든 학교 재생성."""
+    plan_sig = [
+        (p.row_def, p.kind, p.sheet, p.col1, p.col2, p.judgment, p.black_font, p.write_j) for p in plan
+    ]
+    layout = (J_COL, L_COL, G_COL, JUDGMENT_ROW_START, JUDGMENT_ROW_END,
+              tuple(JUDGE_BY_V2_ROWS), tuple(JUDGE_BOTH_ROWS))
+    return values_hash(file_sha1(template_path), plan_sig, layout)
+
+
+def school_input_fingerprint(base_fp, wb_stats, plan, school_data):
+    """학교 입력 지문: 행 계획이 참조하는 시트마다 이 학교 행 값 전체 (+ 템플릿·행 계획 지문)."""
+    sheets = sorted({p.sheet for p in plan if p.sheet})
+    slices = []
+    for sheet in sheets:
+        rows = school_data.get(sheet) or []
+        ws = wb_stats[sheet]
+        slices.append((sheet, tuple(ws.rows[r - 1] for r in rows if r <= ws.max_row)))
+    return values_hash(base_fp, slices)
+
+
+def _filter_changed_jobs(jobs, output_dir, fingerprints, saved):
+    """지난 저장과 지문·경로가 같고 파일이 있는 학교 제외. 반환: (변경된 jobs, 변경 없음 학교코드)."""
+    changed = []
+    unchanged = []
+    for school_code, out_path in jobs:
+        rel_path = os.path.relpath(out_path, output_dir)
+        if is_unchanged(saved, school_code, fingerprints[school_code], rel_path, output_dir):
+            unchanged.append(school_code)
+        else:
+            changed.append((school_code, out_path))
+    return changed, unchanged
 
 
 def _append_skipped_log(log_path, skipped_codes):
@@ -893,18 +1165,39 @@ def _append_skipped_log(log_path, skipped_codes):
             f.write(f"  {sc}\n")
 
 
-def main():
-    """진입점: 경로 설정 → 데이터 로드 → 로그 초기화 → 학교별 리포트 생성 → 로그 보완."""
-    print("=" * 50)
-    print("[학교별 측정 리포트 V1.1] 생성 (템플릿 사용)")
-    print("=" * 50)
-
-    template_path, total_measure_path, output_dir, log_dir, output_layout = _setup_paths()
-    print(f"템플릿: {template_path}")
-    print(f"통계: {total_measure_path}")
+def run_batch(
+    template_path,
+    total_measure_path,
+    output_dir,
+    output_layout="region",
+    log_dir=None,
+    schools=None,
+    workers=1,
+    use_xml=True,
+    changed_only=False,
+):
+    """입력 프롬프트 없이 리포트 일괄 생성 (스케줄 실행·벤치마크·다른 스크립트에서 호출용).
+    schools: 학교코드 목록 (None이면 통계에 있는 전체 학교).
+    changed_only: 입력 지문이 지난 저장과 같은 학교는 생성 생략.
+    반환: dict — generated/skipped/unchanged/missing/not_found 개수·목록, log_path, 단계별 소요 시간(초)
+    템플릿·통계 파일이 없으면 FileNotFoundError, 통계에 학교별 데이터가 없으면 ValueError (종료하지 않음).
+    """
+    t_start = time.perf_counter()
+    if not template_path or not os.path.isfile(template_path):
+        raise FileNotFoundError(f"템플릿 없음: {template_path}")
+    log_dir = log_dir or resolve_log_dir()
+    workers = max(1, int(workers or 1))
 
     wb_stats, all_schools, code_to_name, code_to_region, by_school = _load_workbook_and_school_lists(total_measure_path)
+    not_found = []
+    if schools:
+        selected = list(dict.fromkeys(str(sc).strip() for sc in schools if str(sc).strip()))
+        not_found = [sc for sc in selected if sc not in by_school]
+        by_school = {sc: by_school[sc] for sc in selected if sc in by_school}
+        all_schools = selected
+        print(f"[안내] 지정 학교 {len(selected)}개 중 통계 데이터 있음 {len(by_school)}개")
     schools_with_data = set(by_school.keys())
+    t_loaded = time.perf_counter()
 
     os.makedirs(log_dir, exist_ok=True)
     log_path = os.path.join(log_dir, f"{LOG_PREFIX}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
@@ -913,21 +1206,113 @@ def main():
 
     print(f"출력: {output_dir}")
     print(f"출력 구조: {'지역 폴더' if output_layout == 'region' else '단일 폴더'}")
+    if workers > 1:
+        print(f"병렬 생성: 프로세스 {workers}개")
     if missing:
         print(f"[로그] 통계 데이터 없는 학교 {len(missing)}개 → {log_path}")
 
-    generated_count, skipped_codes = _generate_and_save_all(
+    generated_count, skipped_codes, unchanged_codes = _generate_and_save_all(
         template_path, wb_stats, output_dir, output_layout,
-        by_school, code_to_name, code_to_region,
+        by_school, code_to_name, code_to_region, workers=workers, use_xml=use_xml, changed_only=changed_only,
     )
     wb_stats.close()
+    t_generated = time.perf_counter()
 
     # 로그 출력 지점 2: 학교명 없음/저장 실패로 제외된 학교
     _append_skipped_log(log_path, skipped_codes)
     if skipped_codes:
         print(f"[주의] 학교명/저장문제로 제외된 학교: {len(skipped_codes)}개")
-    print(f"[완료] {generated_count}개 학교 리포트 생성")
+    if unchanged_codes:
+        print(f"[완료] {generated_count}개 학교 리포트 생성 (변경 없음 {len(unchanged_codes)}개 생략)")
+    else:
+        print(f"[완료] {generated_count}개 학교 리포트 생성")
+    return {
+        "template": template_path,
+        "stats": total_measure_path,
+        "output_dir": output_dir,
+        "log_path": log_path,
+        "schools": len(by_school),
+        "generated": generated_count,
+        "skipped": sorted(set(skipped_codes)),
+        "unchanged": len(unchanged_codes),
+        "missing": missing,
+        "not_found": not_found,
+        "workers": workers,
+        "load_sec": round(t_loaded - t_start, 3),
+        "generate_sec": round(t_generated - t_loaded, 3),
+        "total_sec": round(time.perf_counter() - t_start, 3),
+    }
+
+
+def main(workers=1, use_xml=True, changed_only=False):
+    """진입점(대화형): 경로 선택 → run_batch (데이터 로드 → 로그 → 학교별 리포트 생성 → 로그 보완)."""
+    print("=" * 50)
+    print("[학교별 측정 리포트 V1.1] 생성 (템플릿 사용)")
+    print("=" * 50)
+
+    template_path, total_measure_path, output_dir, log_dir, output_layout = _setup_paths()
+    print(f"템플릿: {template_path}")
+    print(f"통계: {total_measure_path}")
+    try:
+        return run_batch(
+            template_path, total_measure_path, output_dir, output_layout,
+            log_dir=log_dir, workers=workers, use_xml=use_xml, changed_only=changed_only,
+        )
+    except (FileNotFoundError, ValueError) as e:
+        print(f"[오류] {e}")
+        sys.exit(1)
+
+
+def main_batch(args):
+    """진입점(배치): 프롬프트 없이 인자·기본 경로로 실행. 지정하지 않은 값은 기본 탐색 결과 사용."""
+    print("=" * 50)
+    print("[학교별 측정 리포트 V1.1] 배치 생성 (템플릿 사용)")
+    print("=" * 50)
+    template_path = args.template or _ensure_template_path()
+    total_measure_path = args.stats or resolve_total_measure_path()
+    output_dir = os.path.abspath(args.out) if args.out else resolve_output_dir()
+    print(f"템플릿: {template_path}")
+    print(f"통계: {total_measure_path}")
+    try:
+        result = run_batch(
+            template_path, total_measure_path, output_dir, args.layout or "region",
+            schools=parse_school_codes(args.schools), workers=max(1, args.workers), use_xml=not args.openpyxl,
+            changed_only=args.changed_only,
+        )
+    except (FileNotFoundError, ValueError) as e:
+        print(f"[오류] {e}")
+        sys.exit(1)
+    if result["not_found"]:
+        print(f"[주의] 통계 데이터 없는 지정 학교: {', '.join(result['not_found'])}")
+    print(
+        f"[시간] 로드 {result['load_sec']}초, 생성 {result['generate_sec']}초, 전체 {result['total_sec']}초"
+    )
+    return result
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="학교별 측정 리포트 V1.1 생성 (템플릿 사용)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="리포트 생성·저장 프로세스 수 (기본 1: 순차, 예: --workers 4)")
+    parser.add_argument("--openpyxl", action="store_true",
+                        help="템플릿 XML 직접 채우기 대신 openpyxl로 워크북 복제·저장 (기존 방식)")
+    parser.add_argument("--changed-only", action="store_true",
+                        help="입력(학교별 통계 행)·템플릿이 지난 생성과 같은 학교는 건너뜀 (출력 폴더 .report_fingerprints.json 기준)")
+    batch = parser.add_argument_group("배치 모드 (하나라도 지정하면 입력 프롬프트 없이 실행)")
+    batch.add_argument("--batch", action="store_true", help="프롬프트 없이 기본 경로로 실행")
+    batch.add_argument("--stats", help="통합 통계 파일 경로 (기본: 자동 탐색 첫 후보)")
+    batch.add_argument("--template", help="리포트 템플릿 경로 (기본: 자동 탐색)")
+    batch.add_argument("--out", help="출력 폴더 (기본: 실행 폴더/학교별_리포트)")
+    batch.add_argument("--layout", choices=("region", "flat"),
+                       help="출력 구조: region=지역명(개수) 하위 폴더, flat=한 폴더 (기본 region)")
+    batch.add_argument("--schools", help="생성할 학교코드 (쉼표 구분 또는 목록 파일 경로, 기본: 전체)")
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    main()
+    multiprocessing.freeze_support()  # exe(PyInstaller) 빌드에서 워커 프로세스 실행용
+    args = _parse_args()
+    if args.batch or any((args.stats, args.template, args.out, args.layout, args.schools)):
+        main_batch(args)
+    else:
+        main(workers=max(1, args.workers), use_xml=not args.openpyxl, changed_only=args.changed_only)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+통계 워크북(TOTAL_MEASURE_LIST) 값 스냅샷
+
+- 기존: load_workbook(data_only=True)로 시트 전체 셀 객체를 만든 뒤 학교·항목마다 ws.cell(r, c) 조회
+- 스냅샷: read_only로 시트마다 iter_rows(values_only=True) 한 번만 읽어 행 값 튜플 리스트로 보관
+  → 셀 객체 없이 값만 들고 있어 메모리가 적고, 조회는 리스트 인덱싱
+- 리포트 생성기는 워크북 대신 이 스냅샷을 받음 (sheetnames, wb[시트명], ws.value(r, c), max_row/max_column)
+"""
+from openpyxl import load_workbook
+
+
+class SheetSnapshot:
+    """시트 1개 값 (행·열 번호는 openpyxl과 같이 1부터)"""
+
+    __slots__ = ("title", "rows", "max_row", "max_column")
+
+    def __init__(self, title, rows):
+        self.title = title
+        self.rows = rows
+        self.max_row = len(rows)
+        self.max_column = max((len(r) for r in rows), default=0)
+
+    def value(self, row, col):
+        """셀 값 (범위 밖이면 None)"""
+        if row < 1 or col < 1 or row > self.max_row:
+            return None
+        values = self.rows[row - 1]
+        return values[col - 1] if col <= len(values) else None
+
+    def header(self):
+        """1행 값 튜플"""
+        return self.rows[0] if self.rows else ()
+
+
+class StatsSnapshot:
+    """통계 워크북 전체 값 스냅샷 (openpyxl 워크북처럼 sheetnames, [시트명] 지원)"""
+
+    def __init__(self, sheets):
+        self._sheets = sheets
+        self.sheetnames = list(sheets)
+
+    def __getitem__(self, name):
+        return self._sheets[name]
+
+    def __contains__(self, name):
+        return name in self._sheets
+
+    def close(self):
+        """워크북과 같은 호출 형태 유지용 (파일은 로드 직후 이미 닫힘)"""
+
+
+def load_stats_snapshot(path):
+    """통계 xlsx를 read_only로 시트마다 한 번 읽어 StatsSnapshot 반환 (수식은 저장된 계산값)."""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheets = {}
+        for ws in wb.worksheets:
+            sheets[ws.title] = SheetSnapshot(ws.title, [tuple(r) for r in ws.iter_rows(values_only=True)])
+        return StatsSnapshot(sheets)
+    finally:
+        wb.close()
@@ -2,8 +2,8 @@
 """
 유선망 1차 측정 결과 전처리 - 충남/대전 공통
 
-1. 학교별 파일 통합 → {지역}_TOTAL 시트
-2. 학교별 평균 계산 → {지역}_WIRED_MEANSURE_AVG 시트
+1. 학교별 파일 통합 → {지역}_TOTAL 시트 (파일마다 iter_rows 1회, --workers N이면 프로세스 N개로 병렬 읽기)
+2. 학교별 평균 계산 → {지역}_WIRED_MEANSURE_AVG 시트 (measure_aggregate: 열 단위 숫자 변환 + groupby 평균)
 3. {지역}_WIRED_MEANSURE_V1.XLSX 저장
 """
 from __future__ import print_function
@@ -15,12 +15,15 @@ if hasattr(sys.stdout, "buffer"):
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
 
-print("[유선망 전처리] 스크립트 시작", flush=True)
+if __name__ == "__main__":  # 병렬 읽기 워커(spawn)에서는 출력 안 함
+    print("[유선망 전처리] 스크립트 시작", flush=True)
 
 # ========== 실행 지역 선택 ==========
 RUN_REGION = "CNE"   # "CNE" = 충남  |  "DNI" = 대전  |  "ALL" = 둘 다
 
 import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 # 실행 시작 즉시 출력 (버퍼링 방지)
 def _log(msg):
@@ -35,6 +38,7 @@ if _MEASURE_DIR not in sys.path:
     sys.path.insert(0, _MEASURE_DIR)
 
 try:
+    from measure_aggregate import numeric_frame, group_mean, diagnose, cell_value
     from wired_preprocess_config import (
         WIRED_1ST_SOURCE,
         WIRED_OUTPUT_FILE,
@@ -134,11 +138,11 @@ def extract_school_code_from_filename(filename):
     return m.group(1) if m else base[:20]  # 못 찾으면 파일명 앞 20자
 
 
-def find_header_row(ws):
-    """헤더 행 찾기 (1~5행 중 '학교코드','관리번호','측정' 등 포함된 행)"""
-    for row in range(1, min(6, ws.max_row + 1)):
-        for col in range(1, min(ws.max_column + 1, 30)):
-            val = ws.cell(row=row, column=col).value
+def find_header_row(rows):
+    """헤더 행 찾기 (1~5행 중 '학교코드','관리번호','측정' 등 포함된 행). rows: 시트 행 값 튜플 목록"""
+    for row in range(1, min(6, len(rows) + 1)):
+        values = rows[row - 1]
+        for val in values[:29]:
             if val and isinstance(val, str):
                 s = val.strip()
                 if any(kw in s for kw in ["학교코드", "관리번호", "측정", "대역폭", "지연", "패킷"]):
@@ -162,44 +166,61 @@ def is_numeric(val):
         return False
 
 
-def get_numeric_columns(ws, header_row):
-    """헤더 행 기준으로 숫자형 데이터 열 인덱스 목록 (1-based)"""
+def get_numeric_columns(rows, header_row, n_cols):
+    """헤더 행 기준으로 숫자형 데이터 열 인덱스 목록 (1-based). 헤더 다음 3행을 샘플로 확인"""
+    samples = rows[header_row:header_row + 3]
     numeric_cols = []
-    for col in range(1, ws.max_column + 1):
-        # 데이터 행 샘플로 확인 (헤더 다음 3행)
-        for r in range(header_row + 1, min(header_row + 4, ws.max_row + 1)):
-            v = ws.cell(row=r, column=col).value
-            if is_numeric(v):
-                numeric_cols.append(col)
-                break
+    for col in range(1, n_cols + 1):
+        if any(col <= len(r) and is_numeric(r[col - 1]) for r in samples):
+            numeric_cols.append(col)
     return numeric_cols
 
 
 def read_school_file(path, school_code):
-    """학교별 엑셀 파일 읽기 → (header_row, headers, data_rows, numeric_cols)"""
+    """
+    학교별 엑셀 파일 읽기 → (header_row, headers, data_rows, numeric_cols)
+    read_only 시트를 iter_rows(values_only=True)로 한 번만 훑어 행 값 튜플로 보관 (셀 단위 조회 없음)
+    """
     wb = load_workbook(path, read_only=True, data_only=True)
-    ws = wb.active
-    if ws.max_row < 2:
+    try:
+        ws = wb.active
+        n_cols = ws.max_column or 0
+        rows = list(ws.iter_rows(values_only=True))
+    finally:
         wb.close()
+    if len(rows) < 2:
         return None, [], [], []
+    n_cols = max([n_cols] + [len(r) for r in rows])
+    rows = [r if len(r) == n_cols else tuple(r) + (None,) * (n_cols - len(r)) for r in rows]
 
-    header_row = find_header_row(ws)
-    headers = [ws.cell(row=header_row, column=c).value for c in range(1, ws.max_column + 1)]
-    numeric_cols = get_numeric_columns(ws, header_row)
+    header_row = find_header_row(rows)
+    headers = list(rows[header_row - 1])
+    numeric_cols = get_numeric_columns(rows, header_row, n_cols)
+    data_rows = rows[header_row:]
+    return header_row, headers, data_rows, numeric_cols
 
-    data_rows = []
-    for r in range(header_row + 1, ws.max_row + 1):
-        row = []
-        for c in range(1, ws.max_column + 1):
-            row.append(ws.cell(row=r, column=c).value)
-        data_rows.append(row)
 
-    wb.close()
-    return header_row, headers, data_rows, numeric_cols
+def _read_school_file_job(args):
+    """프로세스 풀 작업 단위: (경로, 학교코드) → read_school_file 결과"""
+    return read_school_file(*args)
+
+
+def _iter_school_files(jobs, region, workers):
+    """학교 파일을 정렬 순서대로 읽어 (학교코드, 결과) 반환. workers > 1이면 프로세스 풀 (결과 순서는 동일)"""
+    desc = f"[{region}] 파일 읽기"
+    if workers <= 1 or len(jobs) < 2:
+        for job in tqdm(jobs, desc=desc, unit="파일"):
+            yield job[1], read_school_file(*job)
+        return
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_read_school_file_job, jobs, chunksize=chunksize)
+        for job, result in tqdm(zip(jobs, results), total=len(jobs), desc=f"{desc}(x{workers})", unit="파일"):
+            yield job[1], result
 
 
-def integrate_and_average(region="CNE"):
-    """통합 + 학교별 평균 계산"""
+def integrate_and_average(region="CNE", workers=1):
+    """통합 + 학교별 평균 계산. workers > 1이면 학교 파일 읽기를 프로세스 풀로 병렬 처리."""
     source_dir = WIRED_1ST_SOURCE[region]
     output_path = WIRED_OUTPUT_FILE[region]
     sheet_names = SHEET_NAMES[region]
@@ -222,12 +243,12 @@ def integrate_and_average(region="CNE"):
     all_headers = None
     all_rows = []
     school_data = {}  # school_code -> {headers, rows, numeric_cols}
-    for fname in tqdm(sorted(files), desc=f"[{region}] 파일 읽기", unit="파일"):
+    jobs = []
+    for fname in sorted(files):
         fpath = os.path.join(source_dir, fname)
-        if not os.path.isfile(fpath):
-            continue
-        school_code = extract_school_code_from_filename(fname)
-        result = read_school_file(fpath, school_code)
+        if os.path.isfile(fpath):
+            jobs.append((fpath, extract_school_code_from_filename(fname)))
+    for school_code, result in _iter_school_files(jobs, region, workers):
         if result[0] is None:
             continue
         _, headers, data_rows, numeric_cols = result
@@ -236,7 +257,7 @@ def integrate_and_average(region="CNE"):
             all_headers = ["학교코드"] + [str(h) if h is not None else "" for h in headers]
 
         for row in data_rows:
-            all_rows.append([school_code] + row)
+            all_rows.append([school_code, *row])
 
         if school_code not in school_data:
             school_data[school_code] = {"headers": headers, "rows": [], "numeric_cols": numeric_cols}
@@ -246,9 +267,14 @@ def integrate_and_average(region="CNE"):
     # 학교코드/학교명: TOTAL B열(학교코드), C열(학교명) = 소스 파일 1열, 2열
     throughput_col_idx = find_throughput_column_index(all_headers)
 
-    # 학교별 평균 계산
-    avg_rows = []
+    # 학교별 평균 계산: 전체 행을 열 단위로 한 번 숫자 변환 → 학교코드별 groupby 평균
     n_cols = len(all_headers) - 1  # 학교코드 제외
+    num = numeric_frame(all_rows, n_cols, offset=1)
+    means, _counts = group_mean([row[0] for row in all_rows], num)
+
+    avg_rows = []
+    tp_values = []
+    tp_idx = (throughput_col_idx - 1) if throughput_col_idx and throughput_col_idx > 0 else None
     for school_code, data in tqdm(sorted(school_data.items()), desc=f"[{region}] 평균 계산", unit="학교"):
         rows = data["rows"]
         numeric_cols = data["numeric_cols"]
@@ -258,39 +284,23 @@ def integrate_and_average(region="CNE"):
         school_name_val = rows[0][1] if rows and len(rows[0]) > 1 else ""
 
         if not rows:
-            avg_rows.append([school_code_val, school_name_val, 0] + [""] * n_cols + [""])
+            avg_rows.append([school_code_val, school_name_val, 0] + [""] * n_cols)
+            tp_values.append("")
             continue
 
-        avg_line = []
-        for c in range(1, n_cols + 1):
-            if c in numeric_cols:
-                vals = []
-                for r in rows:
-                    if c <= len(r):
-                        v = r[c - 1]
-                        if is_numeric(v):
-                            try:
-                                x = float(str(v).replace(",", "").replace("%", ""))
-                                vals.append(x)
-                            except ValueError:
-                                pass
-                avg_line.append(round(sum(vals) / len(vals), 4) if vals else "")
-            else:
-                avg_line.append(rows[0][c - 1] if c <= len(rows[0]) else "")
-
-        # 진단결과: Avg Throughput >= 700 → 양호, 이하면 미흡
-        diagnosis = ""
-        tp_idx = (throughput_col_idx - 1) if throughput_col_idx and throughput_col_idx > 0 else None
-        if tp_idx is not None and tp_idx < len(avg_line):
-            try:
-                tp_val = avg_line[tp_idx]
-                if is_numeric(tp_val):
-                    tp = float(str(tp_val).replace(",", ""))
-                    diagnosis = "양호" if tp >= THROUGHPUT_THRESHOLD_MBPS else "미흡"
-            except (ValueError, TypeError):
-                pass
+        school_means = means.loc[school_code]
+        first = rows[0]
+        avg_line = [
+            cell_value(school_means[c], 4) if c in numeric_cols else (first[c - 1] if c <= len(first) else "")
+            for c in range(1, n_cols + 1)
+        ]
+        tp_values.append(avg_line[tp_idx] if tp_idx is not None and tp_idx < len(avg_line) else "")
+        avg_rows.append([school_code_val, school_name_val, equip_count] + avg_line)
 
-        avg_rows.append([school_code_val, school_name_val, equip_count] + avg_line + [diagnosis])
+    # 진단결과: Avg Throughput >= 700 → 양호, 이하면 미흡 (값 없으면 빈칸) — 학교 전체 배열 비교
+    diagnoses = diagnose(tp_values, THROUGHPUT_THRESHOLD_MBPS, missing="") if avg_rows else []
+    for row, diagnosis in zip(avg_rows, diagnoses):
+        row.append(diagnosis)
 
     # 엑셀 저장
     wb = Workbook()
@@ -359,15 +369,20 @@ def main():
     parser = argparse.ArgumentParser(description="유선망 1차 측정 결과 전처리")
     parser.add_argument("--region", "-r", choices=["CNE", "DNI", "ALL"], default=RUN_REGION,
                         help=f"지역 (CNE=충남, DNI=대전, ALL=둘 다, 기본값: {RUN_REGION})")
+    parser.add_argument("--workers", "-w", type=int, default=1,
+                        help="학교 파일 읽기 프로세스 수 (기본 1: 순차, 예: --workers 4)")
     args = parser.parse_args()
     region = args.region
+    workers = max(1, args.workers)
     _log(f"실행 지역: {region}")
+    if workers > 1:
+        _log(f"병렬 읽기: 프로세스 {workers}개")
     try:
         if region == "ALL":
             for r in ["CNE", "DNI"]:
-                integrate_and_average(r)
+                integrate_and_average(r, workers=workers)
         else:
-            integrate_and_average(region)
+            integrate_and_average(region, workers=workers)
     except Exception as e:
         _log(f"[오류] {e}")
         import traceback
@@ -378,4 +393,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # exe(PyInstaller) 빌드에서 워커 프로세스 실행용
     main()
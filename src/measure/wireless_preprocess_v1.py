@@ -7,6 +7,7 @@
 3. 열: 학교명, 학교코드, 다운로드, 업로드, RTT, RSSI, CH, 다운로드 진단, 업로드 진단
 4. 진단 기준: 375 Mbps 이상 → 양호, 미만 → 미흡
 5. 마지막에 "전체" 행 추가 (전체 평균)
+6. 숫자 변환·학교별 평균·진단은 measure_aggregate (열 단위 변환 + groupby, 배열 비교)
 """
 from __future__ import print_function
 import sys
@@ -30,6 +31,7 @@ if _MEASURE_DIR not in sys.path:
 
 try:
     from measure_utils import extract_school_code_from_mgmt_num
+    from measure_aggregate import numeric_frame, group_mean, column_mean, diagnose, cell_value
     from wireless_preprocess_config import (
         ISP_MEASURE_FILE,
         ISP_MEASURE_CANDIDATES,
@@ -111,21 +113,6 @@ def load_school_name_map(region):
     return {}
 
 
-def is_numeric(val):
-    if val is None:
-        return False
-    if isinstance(val, (int, float)):
-        return True
-    s = str(val).strip()
-    if not s:
-        return False
-    try:
-        float(s.replace(",", "").replace("%", ""))
-        return True
-    except ValueError:
-        return False
-
-
 def find_header_row(ws):
     """헤더 행 찾기 (1~5행 중 '장비관리번호','다운로드','업로드' 등 포함된 행)"""
     for row in range(1, min(6, ws.max_row + 1)):
@@ -166,100 +153,53 @@ def process_isp_measure(region="CNE"):
     max_row = ws_src.max_row
     max_col = ws_src.max_column
 
-    # 학교별 데이터 수집
-    school_data = {}  # school_code -> {downloads, uploads, rtts, rssis, chs}
-    for r in tqdm(range(header_row + 1, max_row + 1), desc=f"[{region}] 데이터 읽기", unit="행"):
-        mgmt = ws_src.cell(row=r, column=COL_MGMT_NUM).value
-        school_code = extract_school_code_from_mgmt_num(mgmt)
-        if not school_code:
-            continue
-
-        def _get_num(col):
-            v = ws_src.cell(row=r, column=col).value
-            if is_numeric(v):
-                try:
-                    return float(str(v).replace(",", "").replace("%", ""))
-                except ValueError:
-                    return None
-            return None
-
-        dl = _get_num(COL_DOWNLOAD)
-        ul = _get_num(COL_UPLOAD)
-        rtt = _get_num(COL_RTT)
-        rssi = _get_num(COL_RSSI)
-        ch = _get_num(COL_CH)
-
-        # 데이터가 있는 장비만 포함 (5개 측정값 모두 있는 행만)
-        if dl is None or ul is None or rtt is None or rssi is None or ch is None:
-            continue
+    # 학교별 데이터 수집: 필요한 6개 열만 행 튜플로 읽음
+    src_cols = (COL_MGMT_NUM, COL_DOWNLOAD, COL_UPLOAD, COL_RTT, COL_RSSI, COL_CH)
+    picked = []
+    for row in tqdm(
+        ws_src.iter_rows(min_row=header_row + 1, max_row=max_row, max_col=max(src_cols), values_only=True),
+        total=max(0, max_row - header_row), desc=f"[{region}] 데이터 읽기", unit="행",
+    ):
+        picked.append(tuple(row[c - 1] if c <= len(row) else None for c in src_cols))
+    codes = [extract_school_code_from_mgmt_num(p[0]) for p in picked]
 
-        if school_code not in school_data:
-            school_data[school_code] = {"rows": []}
-        school_data[school_code]["rows"].append((dl, ul, rtt, rssi, ch))
-
-    # 학교별 평균 계산 (데이터 있는 장비들만)
-    def _avg_from_rows(rows, idx):
-        if not rows:
-            return ""
-        return round(sum(r[idx] for r in rows) / len(rows), 2)
+    # 숫자 변환(열 단위 1회) → 5개 측정값이 모두 있는 장비만 학교별 평균
+    num = numeric_frame(picked, 5, offset=1)
+    means, _counts = group_mean(codes, num, mask=num.notna().all(axis=1).to_numpy())
 
     avg_rows = []
-    for school_code in tqdm(sorted(school_data.keys()), desc=f"[{region}] 평균 계산", unit="학교"):
-        rows = school_data[school_code]["rows"]
-        if not rows:
-            continue
+    school_codes = list(means.index)
+    avg_cols = [[cell_value(v, 2) for v in means[c]] for c in range(1, 6)]
+    diag_dl = diagnose(avg_cols[0], ISP_THRESHOLD_MBPS)
+    diag_ul = diagnose(avg_cols[1], ISP_THRESHOLD_MBPS)
+    for i, school_code in enumerate(school_codes):
         school_name = code_to_name.get(school_code) or code_to_name.get(school_code[:12]) or ""
-
-        avg_dl = _avg_from_rows(rows, 0)
-        avg_ul = _avg_from_rows(rows, 1)
-        avg_rtt = _avg_from_rows(rows, 2)
-        avg_rssi = _avg_from_rows(rows, 3)
-        avg_ch = _avg_from_rows(rows, 4)
-
-        if isinstance(avg_dl, str):
-            avg_dl = ""
-        if isinstance(avg_ul, str):
-            avg_ul = ""
-
-        diag_dl = "양호" if (isinstance(avg_dl, (int, float)) and avg_dl >= ISP_THRESHOLD_MBPS) else "미흡"
-        diag_ul = "양호" if (isinstance(avg_ul, (int, float)) and avg_ul >= ISP_THRESHOLD_MBPS) else "미흡"
-
         avg_rows.append({
             "school_name": school_name,
             "school_code": school_code,
-            "download": avg_dl,
-            "upload": avg_ul,
-            "rtt": avg_rtt,
-            "rssi": avg_rssi,
-            "ch": avg_ch,
-            "diag_dl": diag_dl,
-            "diag_ul": diag_ul,
+            "download": avg_cols[0][i],
+            "upload": avg_cols[1][i],
+            "rtt": avg_cols[2][i],
+            "rssi": avg_cols[3][i],
+            "ch": avg_cols[4][i],
+            "diag_dl": diag_dl[i],
+            "diag_ul": diag_ul[i],
         })
 
-    # 전체 평균 행 (전부하)
+    # 전체 평균 행 (학교별 평균의 평균)
     if avg_rows:
-        all_dl = [r["download"] for r in avg_rows if isinstance(r["download"], (int, float))]
-        all_ul = [r["upload"] for r in avg_rows if isinstance(r["upload"], (int, float))]
-        all_rtt = [r["rtt"] for r in avg_rows if isinstance(r["rtt"], (int, float))]
-        all_rssi = [r["rssi"] for r in avg_rows if isinstance(r["rssi"], (int, float))]
-        all_ch = [r["ch"] for r in avg_rows if isinstance(r["ch"], (int, float))]
-        total_dl = round(sum(all_dl) / len(all_dl), 2) if all_dl else ""
-        total_ul = round(sum(all_ul) / len(all_ul), 2) if all_ul else ""
-        total_rtt = round(sum(all_rtt) / len(all_rtt), 2) if all_rtt else ""
-        total_rssi = round(sum(all_rssi) / len(all_rssi), 2) if all_rssi else ""
-        total_ch = round(sum(all_ch) / len(all_ch), 2) if all_ch else ""
-        diag_dl = "양호" if (isinstance(total_dl, (int, float)) and total_dl >= ISP_THRESHOLD_MBPS) else "미흡"
-        diag_ul = "양호" if (isinstance(total_ul, (int, float)) and total_ul >= ISP_THRESHOLD_MBPS) else "미흡"
+        totals = [cell_value(column_mean(col), 2) for col in avg_cols]
+        total_diag = diagnose(totals[:2], ISP_THRESHOLD_MBPS)
         avg_rows.append({
             "school_name": "전체",
             "school_code": "",
-            "download": total_dl,
-            "upload": total_ul,
-            "rtt": total_rtt,
-            "rssi": total_rssi,
-            "ch": total_ch,
-            "diag_dl": diag_dl,
-            "diag_ul": diag_ul,
+            "download": totals[0],
+            "upload": totals[1],
+            "rtt": totals[2],
+            "rssi": totals[3],
+            "ch": totals[4],
+            "diag_dl": total_diag[0],
+            "diag_ul": total_diag[1],
         })
 
     # 기존 AVG 시트가 있으면 제거 후 새로 생성
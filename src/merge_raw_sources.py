@@ -2,11 +2,17 @@
 raw_data/구성, 자산, 충남을 모두 스캔해 로드한 뒤 병합합니다.
 - 충남(학교별) 데이터를 기준으로, 구성·자산에만 있는 행을 추가해 최종 VA/CFG를 만듦.
 - 장비: AP, PoE, 스위치, 보안장비 (파일명 SW→스위치, FW→보안장비)
+- 실행: python -m src.merge_raw_sources [--workers=N] [--incremental]
+  (N>1이면 파일 로드를 N개 프로세스로 병렬. --incremental이면 매니페스트와 비교해 새로/바뀐 파일만 다시 파싱)
 """
 
 from __future__ import annotations
 
+import json
 import unicodedata
+import time
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any
 
@@ -19,8 +25,12 @@ from .sheet_defs import (
     normalize_mgmt_column,
 )
 from .load_validation import _count_data_rows
+from .load_cache import cached_load, file_content_hash, get_cache_dir
 
 
+# 증분 모드 매니페스트 파일명 (cache_root 아래)
+RAW_MANIFEST_NAME = "raw_data_manifest.json"
+
 EQUIPMENT_ALIAS = {
     "AP": "AP",
     "PoE": "PoE",
@@ -48,7 +58,7 @@ def _list_구성_xlsx(root: Path) -> list[tuple[Path, str]]:
     dir_ = root / "구성"
     if not dir_.exists():
         return out
-    for p in dir_.rglob("*.xlsx"):
+    for p in sorted(dir_.rglob("*.xlsx")):
         n = _norm(p.name)
         if "일괄업로드용" not in n or "구성정보" not in n:
             continue
@@ -63,7 +73,7 @@ def _list_자산_xlsx(root: Path) -> list[tuple[Path, str]]:
     dir_ = root / "자산"
     if not dir_.exists():
         return out
-    for p in dir_.rglob("*.xlsx"):
+    for p in sorted(dir_.rglob("*.xlsx")):
         n = _norm(p.name)
         if "일괄업로드용" not in n or "가상자산" not in n:
             continue
@@ -79,7 +89,7 @@ def _list_충남_xlsx(root: Path) -> list[tuple[Path, str, str]]:
     dir_ = root / "충남"
     if not dir_.exists():
         return out
-    for p in dir_.rglob("*.xlsx"):
+    for p in sorted(dir_.rglob("*.xlsx")):
         n = _norm(p.name)
         if "일괄업로드용" not in n:
             continue
@@ -117,12 +127,126 @@ def _load_sheet_robust(path: Path, file_kind: str) -> pd.DataFrame | None:
     return best_df
 
 
-def _load_one_cfg(path: Path) -> pd.DataFrame | None:
-    return _load_sheet_robust(path, "cfg")
+def _load_one_cached(
+    path: Path,
+    file_kind: str,
+    fingerprint: dict[str, Any] | None = None,
+) -> pd.DataFrame | None:
+    """
+    _load_sheet_robust 결과를 load_cache에 저장/재사용. 파일이 바뀌지 않았으면 엑셀 파싱 생략.
+    fingerprint(예: {"sha1": 내용 해시})를 주면 경로·수정시각 대신 그것으로 캐시 키 구성.
+    """
+    def load() -> dict[str, pd.DataFrame]:
+        df = _load_sheet_robust(path, file_kind)
+        return {} if df is None else {file_kind: df}
+    return cached_load(path, f"raw_{file_kind}", load, fingerprint=fingerprint).get(file_kind)
+
+
+def _load_one_cfg(path: Path, fingerprint: dict[str, Any] | None = None) -> pd.DataFrame | None:
+    return _load_one_cached(path, "cfg", fingerprint)
+
+
+def _load_one_va(path: Path, fingerprint: dict[str, Any] | None = None) -> pd.DataFrame | None:
+    return _load_one_cached(path, "va", fingerprint)
 
 
-def _load_one_va(path: Path) -> pd.DataFrame | None:
-    return _load_sheet_robust(path, "va")
+def _load_one_timed(
+    path: Path,
+    file_kind: str,
+    fingerprint: dict[str, Any] | None = None,
+) -> tuple[pd.DataFrame | None, float]:
+    """파일 1개 로드 + 소요 시간(초). 프로세스 풀 작업 단위(모듈 최상위 함수여야 pickle 가능)."""
+    t0 = time.perf_counter()
+    if file_kind == "va":
+        df = _load_one_va(path, fingerprint)
+    else:
+        df = _load_one_cfg(path, fingerprint)
+    return df, time.perf_counter() - t0
+
+
+def _load_files(
+    jobs: list[tuple[str, Path, str, str]],
+    max_workers: int = 1,
+    progress: bool = True,
+    fingerprints: list[dict[str, Any] | None] | None = None,
+) -> list[tuple[pd.DataFrame | None, float]]:
+    """
+    jobs [(그룹, 경로, 장비, va|cfg), ...]를 로드해 같은 순서의 [(df, 초), ...] 반환.
+    max_workers > 1이면 프로세스 풀로 병렬 로드(완료 순서와 무관하게 결과는 jobs 순서로 정렬).
+    fingerprints: jobs와 같은 길이의 캐시 키용 식별 정보(증분 모드의 내용 해시). None이면 경로·수정시각 기준.
+    """
+    if fingerprints is None:
+        fingerprints = [None] * len(jobs)
+    results: list[tuple[pd.DataFrame | None, float]] = [(None, 0.0)] * len(jobs)
+    if max_workers <= 1:
+        it = tqdm(jobs, desc="raw_data 로드", unit="파일") if progress else jobs
+        for i, (_, path, _, kind) in enumerate(it):
+            results[i] = _load_one_timed(path, kind, fingerprints[i])
+        return results
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_load_one_timed, path, kind, fingerprints[i]): i
+            for i, (_, path, _, kind) in enumerate(jobs)
+        }
+        done = as_completed(futures)
+        if progress:
+            done = tqdm(done, total=len(futures), desc=f"raw_data 로드({max_workers}프로세스)", unit="파일")
+        for fut in done:
+            results[futures[fut]] = fut.result()
+    return results
+
+
+def get_manifest_path() -> Path:
+    """증분 모드 매니페스트 경로 (cache_root/raw_data_manifest.json)."""
+    return get_cache_dir().parent / RAW_MANIFEST_NAME
+
+
+def _read_manifest(path: Path) -> dict[str, Any]:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and isinstance(data.get("files"), dict):
+            return data
+    except Exception:
+        pass
+    return {"files": {}}
+
+
+def _write_manifest(path: Path, manifest: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    tmp.replace(path)
+
+
+def _plan_incremental(
+    jobs: list[tuple[str, Path, str, str]],
+    manifest: dict[str, Any],
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """
+    jobs 각 파일을 매니페스트와 비교. 크기·수정시각이 같으면 기록된 해시 재사용, 다르면 내용 해시 계산.
+    Returns: (파일별 {"sha1": 해시} 캐시 키, 파일별 상태 '신규'|'변경'|'동일').
+    """
+    prev_files = manifest.get("files", {})
+    fingerprints = []
+    statuses = []
+    for _, path, _, _ in jobs:
+        key = str(Path(path).resolve())
+        st = Path(path).stat()
+        prev = prev_files.get(key)
+        if prev and prev.get("size") == st.st_size and prev.get("mtime_ns") == st.st_mtime_ns and prev.get("sha1"):
+            digest = prev["sha1"]
+        else:
+            digest = file_content_hash(path)
+        if prev is None:
+            statuses.append("신규")
+        elif prev.get("sha1") == digest:
+            statuses.append("동일")
+        else:
+            statuses.append("변경")
+        fingerprints.append({"sha1": digest})
+    return fingerprints, statuses
 
 
 def _extract_mgmt_set(df: pd.DataFrame) -> set:
@@ -167,10 +291,17 @@ def _merge_adding_missing(base_dfs: list[pd.DataFrame], add_dfs: list[pd.DataFra
 def load_and_merge_raw(
     raw_data_root: Path | None = None,
     progress: bool = True,
+    max_workers: int = 1,
+    incremental: bool = False,
+    manifest_path: Path | None = None,
 ) -> tuple[dict[str, pd.DataFrame], dict[str, pd.DataFrame], dict[str, Any]]:
     """
     구성/자산/충남을 로드해 장비별 VA/CFG 병합.
     충남을 기준으로, 구성(CFG)·자산(VA)에서 충남에 없는 행만 추가.
+    max_workers > 1이면 파일 로드를 프로세스 풀로 병렬 실행(병합 순서는 파일 목록 순서 그대로).
+    report["파일별_로드"]에 파일별 행 수·소요 시간(초) 기록.
+    incremental=True면 매니페스트(경로·크기·수정시각·내용 해시·장비·종류·행 수)와 비교해
+    내용이 같은 파일은 캐시된 정규화 DataFrame을 재사용하고, 새로/바뀐 파일만 다시 파싱. report["증분"]에 건수 기록.
     Returns: (va_data, cfg_data, report).
     """
     if raw_data_root is None:
@@ -205,28 +336,70 @@ def load_and_merge_raw(
     자산_va: dict[str, list[pd.DataFrame]] = {eq: [] for eq in VA_DATA_SHEETS_EQUIPMENT}
     구성_cfg: dict[str, list[pd.DataFrame]] = {eq: [] for eq in CFG_DATA_SHEETS}
 
-    it_충남 = tqdm(list_충남, desc="충남 로드", unit="파일") if progress else list_충남
-    for path, eq, kind in it_충남:
-        if kind == "va":
-            df = _load_one_va(path)
-            if df is not None and not df.empty and eq in 충남_va:
-                충남_va[eq].append(df)
-        else:
-            df = _load_one_cfg(path)
-            if df is not None and not df.empty and eq in 충남_cfg:
-                충남_cfg[eq].append(df)
-
-    it_구성 = tqdm(list_구성, desc="구성 로드", unit="파일") if progress else list_구성
-    for path, eq in it_구성:
-        df = _load_one_cfg(path)
-        if df is not None and not df.empty and eq in 구성_cfg:
-            구성_cfg[eq].append(df)
-
-    it_자산 = tqdm(list_자산, desc="자산 로드", unit="파일") if progress else list_자산
-    for path, eq in it_자산:
-        df = _load_one_va(path)
-        if df is not None and not df.empty and eq in 자산_va:
-            자산_va[eq].append(df)
+    # 로드 작업 목록: (그룹, 경로, 장비, va|cfg). 이 순서가 곧 병합 순서(_merge_adding_missing은 먼저 온 행 유지)
+    jobs: list[tuple[str, Path, str, str]] = [("충남", p, eq, kind) for p, eq, kind in list_충남]
+    jobs += [("구성", p, eq, "cfg") for p, eq in list_구성]
+    jobs += [("자산", p, eq, "va") for p, eq in list_자산]
+    fingerprints: list[dict[str, Any] | None] | None = None
+    statuses: list[str] | None = None
+    manifest: dict[str, Any] = {"files": {}}
+    if incremental:
+        manifest_path = Path(manifest_path) if manifest_path is not None else get_manifest_path()
+        manifest = _read_manifest(manifest_path)
+        fingerprints, statuses = _plan_incremental(jobs, manifest)
+    loaded = _load_files(jobs, max_workers=max_workers, progress=progress, fingerprints=fingerprints)
+
+    buckets = {
+        ("충남", "va"): 충남_va,
+        ("충남", "cfg"): 충남_cfg,
+        ("구성", "cfg"): 구성_cfg,
+        ("자산", "va"): 자산_va,
+    }
+    file_timings = []
+    new_files: dict[str, dict[str, Any]] = {}
+    for i, ((group, path, eq, kind), (df, seconds)) in enumerate(zip(jobs, loaded)):
+        rows = 0 if df is None else len(df)
+        timing = {
+            "그룹": group,
+            "파일": str(path),
+            "장비": eq,
+            "종류": kind,
+            "행": rows,
+            "초": round(seconds, 3),
+        }
+        if incremental:
+            timing["상태"] = statuses[i]
+            st = Path(path).stat()
+            new_files[str(Path(path).resolve())] = {
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "sha1": fingerprints[i]["sha1"],
+                "group": group,
+                "equipment": eq,
+                "kind": kind,
+                "rows": rows,
+            }
+        file_timings.append(timing)
+        target = buckets[(group, kind)]
+        if df is not None and not df.empty and eq in target:
+            target[eq].append(df)
+    report["파일별_로드"] = file_timings
+    report["로드_작업자_수"] = max_workers
+
+    if incremental:
+        removed = [p for p in manifest.get("files", {}) if p not in new_files]
+        report["증분"] = {
+            "신규": statuses.count("신규"),
+            "변경": statuses.count("변경"),
+            "동일": statuses.count("동일"),
+            "삭제": len(removed),
+            "매니페스트": str(manifest_path),
+        }
+        _write_manifest(manifest_path, {
+            "raw_data_root": str(root),
+            "updated": datetime.now().isoformat(),
+            "files": new_files,
+        })
 
     va_data: dict[str, pd.DataFrame] = {}
     cfg_data: dict[str, pd.DataFrame] = {}
@@ -260,9 +433,13 @@ def run_full(
     raw_data_root: Path | None = None,
     output_dir: Path | None = None,
     max_workers: int = 4,
+    load_workers: int = 1,
+    incremental: bool = False,
 ) -> dict[str, Any]:
     """
     구성/자산/충남 스캔 → 병합 → 대상 필터 → 장비별 CSV 저장 → 데이터 없는 학교 리스트 생성 → 보고서 저장.
+    max_workers: CSV 저장 병렬 수. load_workers: raw_data 파일 로드 프로세스 수(1이면 순차).
+    incremental: 매니페스트 기준으로 새로/바뀐 파일만 다시 파싱.
     """
     import json
     from datetime import datetime
@@ -276,7 +453,12 @@ def run_full(
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    va_data, cfg_data, report = load_and_merge_raw(raw_data_root=raw_data_root, progress=True)
+    va_data, cfg_data, report = load_and_merge_raw(
+        raw_data_root=raw_data_root,
+        progress=True,
+        max_workers=load_workers,
+        incremental=incremental,
+    )
     from .integrate_export import run_integrate_export
     export_result = run_integrate_export(
         va_data=va_data,
@@ -319,6 +501,21 @@ def run_full(
         lines.append(f"  {eq}")
         lines.append(f"    가상자산: 충남 {c_va} + 자산 추가 {a_va} → 최종 {f_va}")
         lines.append(f"    구성정보: 충남 {c_cfg} + 구성 추가 {g_cfg} → 최종 {f_cfg}")
+    inc = report.get("증분")
+    if inc:
+        lines.extend([
+            "",
+            f"[증분] 신규 {inc['신규']} / 변경 {inc['변경']} / 동일 {inc['동일']} / 삭제 {inc['삭제']}",
+        ])
+    timings = report.get("파일별_로드", [])
+    if timings:
+        total_sec = sum(t["초"] for t in timings)
+        lines.extend([
+            "",
+            f"[파일 로드 시간] {len(timings)}개, 합계 {total_sec:.1f}초 (작업자 {report.get('로드_작업자_수', 1)})",
+        ])
+        for t in sorted(timings, key=lambda x: -x["초"])[:10]:
+            lines.append(f"  {t['초']:.2f}초  {t['행']}행  [{t['그룹']}/{t['장비']}/{t['종류']}] {Path(t['파일']).name}")
     lines.extend([
         "",
         "[출력]",
@@ -343,7 +540,12 @@ def run_full(
 
 if __name__ == "__main__":
     import sys
-    r = run_full(max_workers=4)
+    load_workers = 1
+    for a in sys.argv[1:]:
+        if a.startswith("--workers="):
+            load_workers = int(a.split("=", 1)[1])
+    incremental = "--incremental" in sys.argv[1:]
+    r = run_full(max_workers=4, load_workers=load_workers, incremental=incremental)
     print(r["report_txt"])
     with open(r["report_txt"], encoding="utf-8") as f:
         print(f.read())
@@ -9,6 +9,8 @@
 
 from __future__ import annotations
 
+import weakref
+
 # 가상자산 DB에서 실데이터로 사용할 시트 (장비 4종 + 학교정보)
 VA_DATA_SHEETS_EQUIPMENT = ("PoE", "AP", "스위치", "보안장비")
 VA_DATA_SHEETS_ALL = (*VA_DATA_SHEETS_EQUIPMENT, "학교정보")
@@ -74,6 +76,53 @@ def _series_has_school_code_format(ser: "pd.Series") -> int:
     return int((s.str.contains("-", na=False) & (s.str.len() > 2)).sum())
 
 
+def extract_school_code_prefix(ser: "pd.Series") -> "pd.Series":
+    """
+    관리번호 시리즈에서 학교코드(prefix, '학교코드-장비'의 '-' 앞부분)를 벡터 연산으로 추출.
+    '-'가 없거나 빈 값이면 NaN. 인덱스는 입력과 동일.
+    """
+    import pandas as pd
+    s = ser[ser.notna()].astype(str).str.strip()
+    if s.empty:
+        return pd.Series(None, index=ser.index, dtype=object)
+    parts = s.str.partition("-")
+    prefix = parts[0].str.strip().where(parts[1] == "-")
+    return prefix.reindex(ser.index)
+
+
+# id(DataFrame), 컬럼명 → (DataFrame weakref, prefix 시리즈). DataFrame이 사라지면 항목도 삭제.
+_PREFIX_CACHE: dict[tuple[int, str], tuple[weakref.ref, "pd.Series"]] = {}
+
+
+def remember_school_code_prefixes(df: "pd.DataFrame", prefixes: "pd.Series", mgmt_col: str = "관리번호") -> None:
+    """df의 학교코드 prefix를 캐시에 등록 (필터 결과 등 이미 계산된 값이 있을 때)."""
+    key = (id(df), mgmt_col)
+
+    def _drop(ref: weakref.ref, key: tuple[int, str] = key) -> None:
+        hit = _PREFIX_CACHE.get(key)
+        if hit is not None and hit[0] is ref:
+            del _PREFIX_CACHE[key]
+
+    _PREFIX_CACHE[key] = (weakref.ref(df, _drop), prefixes)
+
+
+def school_code_prefixes(df: "pd.DataFrame", mgmt_col: str = "관리번호") -> "pd.Series":
+    """
+    df[mgmt_col]의 학교코드 prefix 시리즈. 시트(DataFrame)당 한 번만 계산하고 캐시해 필터·학교별 건수 집계에서 재사용.
+    캐시는 DataFrame 객체 기준이므로, 관리번호 컬럼을 제자리 수정한 뒤에는 새 DataFrame으로 호출할 것.
+    """
+    import pandas as pd
+    hit = _PREFIX_CACHE.get((id(df), mgmt_col))
+    if hit is not None and hit[0]() is df and len(hit[1]) == len(df):
+        return hit[1]
+    col = df[mgmt_col]
+    if isinstance(col, pd.DataFrame):
+        col = col.iloc[:, 0]
+    prefixes = extract_school_code_prefix(col)
+    remember_school_code_prefixes(df, prefixes, mgmt_col)
+    return prefixes
+
+
 def resolve_mgmt_column_va(df: "pd.DataFrame") -> str | None:
     """
     가상자산 장비 시트에서 학교코드-장비 형식이 들어 있는 컬럼 이름 반환.
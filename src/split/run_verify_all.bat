@@ -0,0 +1,6 @@
+@echo off
+chcp 65001 >nul
+cd /d "%~dp0"
+echo [검증] 전체 지역 x 장비 - 빠진 학교
+python verify_missing_by_code.py --all
+pause
@@ -3,6 +3,8 @@
 학교 관련 공통 유틸
 - 관리번호 앞 12자리 = 학교코드 (원본에서 학교코드 열 삭제 시 사용)
 - 로그 명명: split_log_{장비}_{지역}_{날짜}.csv (예: split_log_AP_DNI_20260222.csv)
+- 헤더·열 읽기: 헤더 행은 iter_rows로 한 번만 읽고, 데이터 행은 필요한 열 범위만 iter_rows로 순차 읽기
+  (행·열마다 ws.cell() 호출 제거 — read_only 시트에서는 cell() 임의 접근이 매번 시트 처음부터 다시 읽음)
 """
 import os
 from datetime import datetime
@@ -58,16 +60,40 @@ def extract_school_code_from_mgmt_num(mgmt_num):
     return s[:SCHOOL_CODE_LEN]
 
 
+def read_header_values(ws, header_row=2):
+    """헤더 행 값 튜플 (iter_rows 1회, 행이 없으면 빈 튜플)"""
+    for row in ws.iter_rows(min_row=header_row, max_row=header_row, values_only=True):
+        return tuple(row)
+    return ()
+
+
+def header_index(header_values):
+    """
+    헤더 값 목록 → {헤더명(앞뒤 공백 제거): 열 인덱스(1-based)}.
+    같은 헤더명이 여러 열이면 첫 열, 빈 헤더는 제외 (dict 순서 = 열 순서)
+    """
+    index = {}
+    for col, hdr in enumerate(header_values, start=1):
+        name = str(hdr).strip() if hdr else ''
+        if name and name not in index:
+            index[name] = col
+    return index
+
+
+def find_header_col(header_values, keyword):
+    """헤더 값 목록에서 keyword를 포함하는 첫 열 (1-based), 없으면 None"""
+    for name, col in header_index(header_values).items():
+        if keyword in name:
+            return col
+    return None
+
+
 def find_mgmt_col(ws, header_row=2):
     """
     헤더 행에서 '관리번호' 열 인덱스 반환 (1-based).
     없으면 None
     """
-    for col in range(1, ws.max_column + 1):
-        hdr = ws.cell(row=header_row, column=col).value
-        if hdr and '관리번호' in str(hdr).strip():
-            return col
-    return None
+    return find_header_col(read_header_values(ws, header_row), '관리번호')
 
 
 def find_school_code_col(ws, header_row=2):
@@ -75,11 +101,22 @@ def find_school_code_col(ws, header_row=2):
     헤더 행에서 '학교코드' 열 인덱스 반환 (1-based).
     없으면 None (대전 DNI 등 A열에 학교코드 있는 경우 사용)
     """
-    for col in range(1, ws.max_column + 1):
-        hdr = ws.cell(row=header_row, column=col).value
-        if hdr and '학교코드' in str(hdr).strip():
-            return col
-    return None
+    return find_header_col(read_header_values(ws, header_row), '학교코드')
+
+
+def iter_row_values(ws, cols, min_row, max_row=None):
+    """
+    데이터 행에서 지정한 열 값만 (행번호, (값, ...)) 로 차례로 반환 (cols 순서 그대로).
+    cols의 최소~최대 열 범위만 iter_rows(values_only=True)로 읽음. 짧은 행은 None으로 채움
+    """
+    if not cols:
+        return
+    lo, hi = min(cols), max(cols)
+    offsets = [c - lo for c in cols]
+    rows = ws.iter_rows(min_row=min_row, max_row=max_row, min_col=lo, max_col=hi, values_only=True)
+    for r, row in enumerate(rows, start=min_row):
+        n = len(row)
+        yield r, tuple(row[i] if i < n else None for i in offsets)
 
 
 def sort_schools_by_region(schools_with_data, region_key="DNI"):
@@ -116,16 +153,25 @@ def get_split_log_prefix(equipment, region):
     return f"split_log_{eq_name}_{region}_"
 
 
-def get_output_cols(ws, header_row=2, exclude_school_code=True):
+def output_cols_from_header(header_values, max_column, exclude_school_code=True):
     """
-    출력할 열 인덱스 목록 (1-based).
-    exclude_school_code=True면 '학교코드' 열 제외
+    헤더 값 목록 기준 출력할 열 인덱스 목록 (1-based).
+    exclude_school_code=True면 헤더가 정확히 '학교코드'인 열 제외
     """
     cols = []
-    for col in range(1, ws.max_column + 1):
-        hdr = ws.cell(row=header_row, column=col).value
+    for col in range(1, max_column + 1):
+        hdr = header_values[col - 1] if col <= len(header_values) else None
         hdr_str = str(hdr).strip() if hdr else ''
         if exclude_school_code and hdr_str == '학교코드':
             continue
         cols.append(col)
-    return cols if cols else list(range(1, ws.max_column + 1))
+    return cols if cols else list(range(1, max_column + 1))
+
+
+def get_output_cols(ws, header_row=2, exclude_school_code=True):
+    """
+    출력할 열 인덱스 목록 (1-based).
+    exclude_school_code=True면 '학교코드' 열 제외
+    """
+    header_values = read_header_values(ws, header_row)
+    return output_cols_from_header(header_values, ws.max_column or len(header_values), exclude_school_code)
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+원본 장비 목록 읽기 (read_only 스트리밍)
+- load_workbook(read_only=False)는 시트 전체 셀 객체를 메모리에 올리므로, 값·스타일id만 한 번 훑어 수집
+- 스타일: 셀마다 원본 스타일 번호(style id)만 기록, 실제 글꼴/채우기/테두리 등은 번호별로 한 번만 조회 (SourceStyle)
+- 레이아웃(열 너비, 행 높이, 병합): 시트 XML에서 <cols>/<row>/<mergeCells>만 가볍게 파싱 (셀 객체 생성 없음)
+- 헤더 열 찾기·출력 열 규칙은 school_utils(find_header_col, output_cols_from_header) 사용
+"""
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+
+from openpyxl import load_workbook
+from openpyxl.cell.read_only import ReadOnlyCell
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.cell import range_boundaries
+from openpyxl.utils.units import DEFAULT_COLUMN_WIDTH
+
+# copy_cell_style(src_cell, ...)에 셀 대신 그대로 넘길 수 있도록 셀과 같은 속성명 사용
+SourceStyle = namedtuple("SourceStyle", ["font", "fill", "border", "alignment", "number_format"])
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def pick_sheet_name(sheetnames, candidates):
+    """후보 시트명 중 처음 존재하는 것, 없으면 첫 시트 (없으면 None)"""
+    for cand in candidates or []:
+        if cand in sheetnames:
+            return cand
+    return sheetnames[0] if sheetnames else None
+
+
+class StyleTable:
+    """원본 스타일 번호 → SourceStyle. 번호별로 한 번만 조회해 재사용"""
+
+    def __init__(self, ws):
+        self._ws = ws
+        self._styles = {}
+
+    def get(self, sid):
+        st = self._styles.get(sid)
+        if st is None:
+            # 빈 셀(EmptyCell)도 원본에서는 0번 스타일 → 같은 방식으로 조회
+            probe = ReadOnlyCell(self._ws, 0, 0, None, 'n', sid)
+            st = SourceStyle(probe.font, probe.fill, probe.border, probe.alignment, probe.number_format)
+            self._styles[sid] = st
+        return st
+
+    def subset(self, sids):
+        """지정한 번호들만 {sid: SourceStyle} (학교별 블록에 필요한 것만 담을 때)"""
+        return {sid: self.get(sid) for sid in sids}
+
+
+def _sheet_xml_path(zf, sheet_name):
+    """workbook.xml + rels에서 시트 이름 → zip 내부 XML 경로"""
+    wb_xml = ET.fromstring(zf.read("xl/workbook.xml"))
+    rid = None
+    for sh in wb_xml.iter(f"{_NS_MAIN}sheet"):
+        if sh.get("name") == sheet_name:
+            rid = sh.get(f"{_NS_REL}id")
+            break
+    if rid is None:
+        return None
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels.iter(f"{_NS_PKG_REL}Relationship"):
+        if rel.get("Id") == rid:
+            target = rel.get("Target", "")
+            if target.startswith("/"):
+                return target.lstrip("/")
+            return posixpath.normpath(posixpath.join("xl", target))
+    return None
+
+
+def read_sheet_layout(path, sheet_name):
+    """
+    시트 XML에서 레이아웃만 수집 (셀 값/스타일은 건너뜀).
+    Returns: {'row_heights': {행: 높이}, 'column_widths': {열문자: 너비}, 'merged': [범위문자열]}
+    - 열 너비는 openpyxl 로드와 같게 <col min..max>의 min 열 문자에만 기록
+    """
+    layout = {'row_heights': {}, 'column_widths': {}, 'merged': []}
+    with zipfile.ZipFile(path) as zf:
+        xml_path = _sheet_xml_path(zf, sheet_name)
+        if not xml_path:
+            return layout
+        row_idx = 0
+        with zf.open(xml_path) as f:
+            for _, el in ET.iterparse(f, events=("end",)):
+                tag = el.tag
+                if tag == f"{_NS_MAIN}row":
+                    r = el.get("r")
+                    row_idx = int(r) if r else row_idx + 1
+                    ht = el.get("ht")
+                    if ht:
+                        layout['row_heights'][row_idx] = float(ht)
+                    el.clear()
+                elif tag == f"{_NS_MAIN}col":
+                    letter = get_column_letter(int(el.get("min")))
+                    width = el.get("width")
+                    layout['column_widths'][letter] = float(width) if width else DEFAULT_COLUMN_WIDTH
+                elif tag == f"{_NS_MAIN}mergeCell":
+                    ref = el.get("ref")
+                    if ref:
+                        layout['merged'].append(ref)
+    return layout
+
+
+def merged_ranges_on_row(merged, row):
+    """병합 범위 문자열 중 지정 행을 포함하는 것"""
+    out = []
+    for ref in merged:
+        _, min_row, _, max_row = range_boundaries(ref)
+        if min_row <= row <= max_row:
+            out.append(ref)
+    return out
+
+
+def scan_source_rows(path, sheet_candidates, header_row, data_start_row, key_func):
+    """
+    read_only로 원본 시트를 한 번 훑어 필요한 행만 수집.
+    - key_func(header_values) → row_key(values) 또는 None(필수 열 없음)
+      row_key는 행 값 튜플에서 학교 등 묶음 키를 돌려주고, None이면 그 행은 버림
+    Returns: dict 또는 None(시트 없음)
+      sheet_name, title_values/title_sids(1행), header_values/header_sids,
+      rows_by_key {키: [(행번호, 값 튜플, 스타일id 튜플), ...]}, max_column,
+      styles(StyleTable), layout(read_sheet_layout 결과), key_ok(False면 필수 열 없음)
+    """
+    wb = load_workbook(path, read_only=True, data_only=False)
+    try:
+        sheet_name = pick_sheet_name(wb.sheetnames, sheet_candidates)
+        if not sheet_name:
+            return None
+        ws = wb[sheet_name]
+        styles = StyleTable(ws)
+        result = {
+            'sheet_name': sheet_name, 'title_values': (), 'title_sids': (),
+            'header_values': (), 'header_sids': (), 'rows_by_key': {},
+            'max_column': 0, 'styles': styles, 'key_ok': True,
+        }
+        row_key = None
+        rows_by_key = result['rows_by_key']
+        max_column = 0
+        for r, row in enumerate(ws.iter_rows(), start=1):
+            if len(row) > max_column:
+                max_column = len(row)
+            if r < data_start_row and r not in (1, header_row):
+                continue
+            values = tuple(c.value for c in row)
+            if r >= data_start_row:
+                if row_key is None:
+                    continue
+                key = row_key(values)
+                if key is None:
+                    continue
+                sids = tuple(getattr(c, '_style_id', 0) for c in row)
+                rows_by_key.setdefault(key, []).append((r, values, sids))
+                continue
+            sids = tuple(getattr(c, '_style_id', 0) for c in row)
+            if r == 1:
+                result['title_values'], result['title_sids'] = values, sids
+            if r == header_row:
+                result['header_values'], result['header_sids'] = values, sids
+                row_key = key_func(values)
+                if row_key is None:
+                    result['key_ok'] = False
+                    break
+        result['max_column'] = max_column
+        # StyleTable은 스타일 조회에 워크북 공유 스타일 목록만 사용 → close 후에도 유효
+        result['layout'] = read_sheet_layout(path, sheet_name)
+        return result
+    finally:
+        wb.close()
@@ -4,26 +4,42 @@
 - --AP / --switch / --security / --poe: 장비 선택
 - --DNI / --CNE: 지역 선택
 - 원본 경로·시트 규칙: split_config.py 참조
-- 로그: split_log_{장비}_{지역}_{날짜}.csv
+- 로그: split_log_{장비}_{지역}_{날짜}.csv + 처리 상태 인덱스 split_state.sqlite (split_state.py)
+- --streaming: 원본을 read_only로 한 번 훑어 학교별 행 값·스타일id만 수집 후 저장 (원본 전체 로드 안 함)
+- --workers N: 학교별 저장을 N개 프로세스로 병렬 실행 (--streaming 방식으로 읽음)
+- --write-only: 학교별 파일을 write_only 워크북으로 행 단위 저장 (학교 행 수와 무관하게 메모리 일정)
+- --all-equipment: 학교 리스트·로그 1회 로드 후 장비 4종 원본을 병렬 처리, 통합 요약 split_summary_{지역}_{날짜}.csv
+- 변경 감지: 학교별 출력 내용 해시가 지난 저장(split_state)과 같고 파일이 있으면 저장 생략 (--force로 전체 저장)
 """
 import os
 import csv
 import re
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from copy import copy
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Alignment, Border, Side
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from school_utils import (
     extract_school_code_from_mgmt_num, find_mgmt_col, find_school_code_col,
     get_output_cols, sort_schools_by_region, get_school_list_path,
+    find_header_col, output_cols_from_header, iter_row_values,
 )
 from split_config import (
     BASE_DIR, get_source_path, get_sheet_candidates,
     OUTPUT_BASE_BY_REGION, OUTPUT_BASE_TEST,
 )
+from source_reader import (
+    scan_source_rows, merged_ranges_on_row,
+)
+from style_cache import StyleCache, source_style_key
+from split_state import (
+    processed_codes, log_codes, write_log, get_states, content_hash, worksheet_block_hash, is_unchanged,
+    HASH_KEY, UNCHANGED_KEY,
+)
 
 MISSED_SCHOOLS_FILE = os.path.join(BASE_DIR, "missed_schools.csv")
 
@@ -68,6 +84,10 @@ THIN_BORDER = Border(
     top=Side(border_style='thin'), bottom=Side(border_style='thin')
 )
 
+# 원본 구조: 1행 제목, 2행 헤더, 3행~ 데이터
+HEADER_ROW = 2
+DATA_START_ROW = 3
+
 
 def get_log_path(equipment, region_key, suffix=None):
     """split_log_{장비}_{지역}_{날짜}.csv"""
@@ -80,36 +100,8 @@ def get_log_path(equipment, region_key, suffix=None):
 
 
 def get_processed_school_codes(equipment, region_key):
-    """지정 장비·지역의 split_log에서 처리된 학교코드 집합"""
-    cfg = EQUIPMENT_CONFIG.get(equipment, {})
-    log_name = cfg.get("log_name", equipment)
-    prefix = f"split_log_{log_name}_{region_key}_"
-    processed = set()
-    for fname in os.listdir(BASE_DIR):
-        if fname.startswith(prefix) and fname.endswith('.csv'):
-            try:
-                with open(os.path.join(BASE_DIR, fname), 'r', encoding='utf-8-sig') as f:
-                    for row in csv.DictReader(f):
-                        c = row.get('학교코드', '').strip()
-                        if c:
-                            processed.add(c)
-            except Exception:
-                pass
-    return processed
-
-
-def load_existing_log(path):
-    entries = []
-    if path and os.path.exists(path):
-        for enc in ('utf-8-sig', 'utf-8', 'cp949'):
-            try:
-                with open(path, 'r', encoding=enc) as f:
-                    for row in csv.DictReader(f):
-                        entries.append(row)
-                break
-            except UnicodeDecodeError:
-                continue
-    return entries
+    """지정 장비·지역에서 처리된 학교코드 집합 (split_state 인덱스 조회, 첫 사용 때만 기존 split_log 가져옴)"""
+    return processed_codes(equipment, region_key, BASE_DIR)
 
 
 def normalize_code(val):
@@ -175,105 +167,27 @@ def copy_title_row_a1(ws_src, ws_out, src_row=1):
                 pass
 
 
-def main(equipment, missed_only=False, source_file=None, only_schools=None, schools_file=None,
-         today_from_missed=False, from_log=None, new_log=False, test_output=False, region_key='DNI'):
-    cfg = EQUIPMENT_CONFIG.get(equipment)
-    if not cfg:
-        print(f"오류: 지원하지 않는 장비: {equipment}")
-        return
-
-    source_path = source_file or get_source_path(region_key, equipment)
-    output_base = OUTPUT_BASE_TEST if test_output else OUTPUT_BASE_BY_REGION.get(region_key, OUTPUT_BASE_BY_REGION["DNI"])
-    device_label = cfg["device_label"]
-
+def get_school_out_path(school, device_label, output_base, region_key, test_output):
+    """학교별 출력 파일 경로 (폴더 생성 포함)"""
+    code, region, name = school['code'], school['region'], school['name']
+    region_safe = sanitize_filename(region) if region else "기타"
+    display_name = sanitize_filename(name) if name else f"학교_{code}"
+    school_folder = f"{display_name}_{sanitize_filename(code)}"
+    # 테스트: OUTPUT/DNI/시군구/학교폴더, OUTPUT/CNE/시군구/학교폴더
     if test_output:
-        print(f"[테스트] 출력 경로: {output_base}")
-    if not source_path:
-        print(f"오류: 원본 경로 규칙이 정의되지 않았습니다. (지역: {region_key}, 장비: {equipment}) → split_config.py 확인")
-        return
-    if not os.path.exists(source_path):
-        print(f"오류: 원본 파일을 찾을 수 없습니다. {source_path}")
-        return
-
-    school_list_path = get_school_list_path(region_key, BASE_DIR)
-    if not os.path.exists(school_list_path):
-        print(f"오류: 학교 리스트 파일을 찾을 수 없습니다. (지역: {region_key})")
-        return
-
-    # 학교 리스트 로드 (xlsx 또는 csv)
-    school_list = []
-    if school_list_path.lower().endswith('.csv'):
-        with open(school_list_path, 'r', encoding='utf-8-sig') as f:
-            for row in csv.DictReader(f):
-                code = row.get('학교코드', row.get('code', '')).strip()
-                region = row.get('지역', row.get('region', '')).strip()
-                name = row.get('학교명', row.get('name', '')).strip()
-                if code or region or name:
-                    school_list.append({'code': code, 'region': region, 'name': name})
+        out_dir = os.path.join(output_base, region_key, region_safe, school_folder)
     else:
-        from openpyxl import load_workbook as load_wb
-        wb_school = load_wb(school_list_path, read_only=True, data_only=True)
-        for row in wb_school.active.iter_rows(min_row=1, values_only=True):
-            row = list(row) if row else []
-            while len(row) < 3:
-                row.append(None)
-            if row[0] is None and row[1] is None and row[2] is None:
-                continue
-            if row[0] or row[1] or row[2]:
-                school_list.append({
-                    'code': str(row[0]).strip() if row[0] else '',
-                    'region': str(row[1]).strip() if row[1] else '',
-                    'name': str(row[2]).strip() if row[2] else '',
-                })
-        wb_school.close()
-
-    if school_list and (school_list[0].get('code') == '학교코드' or school_list[0].get('region') == '지역' or school_list[0].get('name') == '학교명'):
-        school_list = school_list[1:]
-
-    seen_codes = set()
-    school_list_unique = []
-    for s in school_list:
-        if s.get('code') and s['code'] not in seen_codes:
-            seen_codes.add(s['code'])
-            school_list_unique.append(s)
-    school_list = school_list_unique
-
-    if missed_only:
-        processed = get_processed_school_codes(equipment, region_key)
-        school_list = [s for s in school_list if s['code'] and s['code'] not in processed]
-        print(f"[빠진 학교만] 미처리: {len(school_list)}개")
-        if not school_list:
-            return
+        out_dir = os.path.join(output_base, region_safe, school_folder)
+    os.makedirs(out_dir, exist_ok=True)
+    out_filename = f"{display_name}_{device_label} 장비 현황 상세.XLSX"
+    return os.path.join(out_dir, out_filename)
 
-    only_codes = set()
-    if from_log:
-        log_path = from_log if os.path.isabs(from_log) else os.path.join(BASE_DIR, from_log)
-        if os.path.exists(log_path):
-            schools_file = log_path
-    elif today_from_missed and not schools_file and os.path.exists(MISSED_SCHOOLS_FILE):
-        schools_file = MISSED_SCHOOLS_FILE
-    if only_schools:
-        only_codes.update(c.strip() for c in only_schools.split(',') if c.strip())
-    if schools_file and os.path.exists(schools_file):
-        if schools_file.lower().endswith('.csv'):
-            with open(schools_file, 'r', encoding='utf-8-sig') as f:
-                for row in csv.DictReader(f):
-                    c = row.get('학교코드', '').strip()
-                    if c:
-                        only_codes.add(c)
-        else:
-            with open(schools_file, 'r', encoding='utf-8-sig') as f:
-                for line in f:
-                    c = line.strip()
-                    if c and not c.startswith('#'):
-                        only_codes.add(c)
-    if only_codes:
-        school_list = [s for s in school_list if s['code'] and s['code'] in only_codes]
-        if not school_list:
-            return
-
-    print(f"[{device_label}] 학교 리스트: {len(school_list)}개")
 
+def split_full_load(source_path, equipment, cfg, school_list, region_key, output_base, test_output, force=False):
+    """
+    기존 방식: 원본 전체 로드(read_only=False) 후 셀 단위 복사. Returns: (log_entries, failed_schools) 또는 None
+    출력 내용 해시가 지난 저장과 같으면 저장 생략 (force=True면 모두 저장)
+    """
     wb_src = load_workbook(source_path, read_only=False, data_only=False)
     sheet_name = None
     for cand in get_sheet_candidates(equipment):
@@ -285,38 +199,36 @@ def main(equipment, missed_only=False, source_file=None, only_schools=None, scho
     if not sheet_name:
         print("오류: 시트를 찾을 수 없습니다.")
         wb_src.close()
-        return
+        return None
 
     ws_src = wb_src[sheet_name]
     max_row = ws_src.max_row
-    HEADER_ROW = 2
-    DATA_START_ROW = 3
 
     school_code_col = find_school_code_col(ws_src, HEADER_ROW) if cfg["code_from"] == "school_or_mgmt" else None
     mgmt_col = find_mgmt_col(ws_src, HEADER_ROW)
     if cfg["code_from"] == "mgmt_only" and not mgmt_col:
         print("경고: '관리번호' 열을 찾을 수 없습니다.")
         wb_src.close()
-        return
+        return None
     if cfg["code_from"] == "school_or_mgmt" and not school_code_col and not mgmt_col:
         print("경고: '학교코드' 또는 '관리번호' 열을 찾을 수 없습니다.")
         wb_src.close()
-        return
+        return None
 
     src_cols = get_output_cols(ws_src, HEADER_ROW, exclude_school_code=True)
     school_codes = {normalize_code(s['code']): s for s in school_list if s['code']}
     rows_by_school = {}
 
-    for r in range(DATA_START_ROW, max_row + 1):
-        if cfg["code_from"] == "school_or_mgmt" and school_code_col:
-            extracted = normalize_code(ws_src.cell(row=r, column=school_code_col).value)
+    # 매칭 열(학교코드 또는 관리번호) 하나만 순차로 읽음
+    use_school_col = bool(cfg["code_from"] == "school_or_mgmt" and school_code_col)
+    key_col = school_code_col if use_school_col else mgmt_col
+    for r, (key_val,) in iter_row_values(ws_src, [key_col], DATA_START_ROW, max_row):
+        if use_school_col:
+            extracted = normalize_code(key_val)
         else:
-            if not mgmt_col:
+            if not key_val:
                 continue
-            mgmt_val = ws_src.cell(row=r, column=mgmt_col).value
-            if not mgmt_val:
-                continue
-            extracted = normalize_code(extract_school_code_from_mgmt_num(mgmt_val))
+            extracted = normalize_code(extract_school_code_from_mgmt_num(key_val))
         if extracted and extracted in school_codes:
             rows_by_school.setdefault(extracted, []).append(r)
 
@@ -326,12 +238,13 @@ def main(equipment, missed_only=False, source_file=None, only_schools=None, scho
     if not schools_with_data:
         print("경고: 학교코드와 매칭되는 데이터가 없습니다.")
         wb_src.close()
-        return
+        return None
 
     log_entries = []
     failed_schools = []
     center_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
     use_border = cfg.get("use_border", False)
+    states = get_states(equipment, region_key, BASE_DIR)
 
     for item in schools_with_data:
         school, data = item
@@ -340,17 +253,18 @@ def main(equipment, missed_only=False, source_file=None, only_schools=None, scho
         start_row, end_row = min(data_rows), max(data_rows)
         row_count = len(data_rows)
 
-        region_safe = sanitize_filename(region) if region else "기타"
-        display_name = sanitize_filename(name) if name else f"학교_{code}"
-        school_folder = f"{display_name}_{sanitize_filename(code)}"
-        # 테스트: OUTPUT/DNI/시군구/학교폴더, OUTPUT/CNE/시군구/학교폴더
-        if test_output:
-            out_dir = os.path.join(output_base, region_key, region_safe, school_folder)
-        else:
-            out_dir = os.path.join(output_base, region_safe, school_folder)
-        os.makedirs(out_dir, exist_ok=True)
-        out_filename = f"{display_name}_{device_label} 장비 현황 상세.XLSX"
-        out_path = os.path.join(out_dir, out_filename)
+        out_path = get_school_out_path(school, cfg["device_label"], output_base, region_key, test_output)
+        entry = {
+            '학교명': name, '학교코드': code, '지역': region,
+            '시작행': start_row, '끝행': end_row, '복사행수': row_count, '저장경로': out_path,
+            HASH_KEY: worksheet_block_hash(ws_src, data_rows, src_cols, HEADER_ROW,
+                                           extra=(cfg["sheet_title"], cfg["title_mode"], use_border)),
+        }
+        if not force and is_unchanged(states.get(code), entry[HASH_KEY], out_path):
+            entry[UNCHANGED_KEY] = True
+            log_entries.append(entry)
+            print(f"  변경 없음: {name} ({code}) - {row_count}행 (저장 생략)")
+            continue
 
         try:
             wb_out = Workbook()
@@ -363,14 +277,14 @@ def main(equipment, missed_only=False, source_file=None, only_schools=None, scho
                 copy_title_row_a1(ws_src, ws_out, 1)
 
             # 2행
+            style_cache = StyleCache(copy_cell_style)
+            border = THIN_BORDER if use_border else None
             for c_idx, src_col in enumerate(src_cols, start=1):
                 src_cell = ws_src.cell(row=HEADER_ROW, column=src_col)
                 tgt_cell = ws_out.cell(row=2, column=c_idx)
                 tgt_cell.value = src_cell.value
-                copy_cell_style(src_cell, tgt_cell)
-                tgt_cell.alignment = center_align
-                if use_border:
-                    tgt_cell.border = THIN_BORDER
+                style_cache.apply(tgt_cell, src_cell, ('h', source_style_key(src_cell)),
+                                  alignment=center_align, border=border)
             if HEADER_ROW in ws_src.row_dimensions and ws_src.row_dimensions[HEADER_ROW].height:
                 ws_out.row_dimensions[2].height = ws_src.row_dimensions[HEADER_ROW].height
 
@@ -381,10 +295,8 @@ def main(equipment, missed_only=False, source_file=None, only_schools=None, scho
                     src_cell = ws_src.cell(row=src_row, column=src_col)
                     tgt_cell = ws_out.cell(row=out_row, column=c_idx)
                     tgt_cell.value = src_cell.value
-                    copy_cell_style(src_cell, tgt_cell, copy_fill=False)
-                    tgt_cell.alignment = center_align
-                    if use_border:
-                        tgt_cell.border = THIN_BORDER
+                    style_cache.apply(tgt_cell, src_cell, ('d', source_style_key(src_cell)),
+                                      copy_fill=False, alignment=center_align, border=border)
                 if src_row in ws_src.row_dimensions and ws_src.row_dimensions[src_row].height:
                     ws_out.row_dimensions[out_row].height = ws_src.row_dimensions[src_row].height
                 out_row += 1
@@ -396,34 +308,545 @@ def main(equipment, missed_only=False, source_file=None, only_schools=None, scho
 
             wb_out.save(out_path)
             wb_out.close()
-            log_entries.append({
-                '학교명': name, '학교코드': code, '지역': region,
-                '시작행': start_row, '끝행': end_row, '복사행수': row_count, '저장경로': out_path
-            })
+            log_entries.append(entry)
             print(f"  저장: {name} ({code}) - {row_count}행 -> {out_path}")
         except Exception as e:
             print(f"  [에러] {name} ({code}) {region}: {e}")
             failed_schools.append({'name': name, 'code': code, 'region': region, 'error': str(e)})
 
+    wb_src.close()
+    return log_entries, failed_schools
+
+
+
+def _pick_cols(tup, cols, default=None):
+    return tuple(tup[c - 1] if c <= len(tup) else default for c in cols)
+
+
+def build_school_block(src, cfg, src_cols, rows):
+    """
+    학교 1개 저장에 필요한 값·스타일·레이아웃만 묶음 (원본 워크북 없이 write_school_block 가능).
+    rows: [(원본 행번호, 값 튜플, 스타일id 튜플), ...]
+    """
+    layout = src['layout']
+    heights = layout['row_heights']
+    title_values, title_sids = src['title_values'], src['title_sids']
+    if cfg["title_mode"] == "ap_b1":
+        title_val = title_values[1] if len(title_values) > 1 else None
+        title_val = title_val if title_val else "AP 자산 상세"
+    else:
+        title_val = title_values[0] if title_values else None
+    title_sid = title_sids[0] if title_sids else 0
+    header_sids = _pick_cols(src['header_sids'], src_cols, 0)
+    out_rows = []
+    used = {title_sid, *header_sids}
+    for r, values, sids in rows:
+        row_sids = _pick_cols(sids, src_cols, 0)
+        used.update(row_sids)
+        out_rows.append((_pick_cols(values, src_cols), row_sids, heights.get(r)))
+    widths = layout['column_widths']
+    return {
+        'sheet_title': cfg["sheet_title"],
+        'title_mode': cfg["title_mode"],
+        'use_border': cfg.get("use_border", False),
+        'title': (title_val, title_sid),
+        'title_height': heights.get(1),
+        'title_merges': merged_ranges_on_row(layout['merged'], 1),
+        'header': (_pick_cols(src['header_values'], src_cols), header_sids),
+        'header_height': heights.get(HEADER_ROW),
+        'rows': out_rows,
+        'widths': [widths.get(get_column_letter(c)) for c in src_cols],
+        'styles': src['styles'].subset(sorted(used)),
+    }
+
+
+def write_school_block(block, out_path):
+    """build_school_block 결과를 학교별 엑셀로 저장 (기존 방식과 같은 서식 규칙)"""
+    styles = block['styles']
+    border = THIN_BORDER if block['use_border'] else None
+    center_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
+    style_cache = StyleCache(copy_cell_style)
+
+    wb_out = Workbook()
+    ws_out = wb_out.active
+    ws_out.title = block['sheet_title']
+
+    title_val, title_sid = block['title']
+    ws_out['A1'] = title_val
+    copy_cell_style(styles[title_sid], ws_out['A1'])
+    if block['title_mode'] == "ap_b1":
+        ws_out['A1'].alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
+    if block['title_height']:
+        ws_out.row_dimensions[1].height = block['title_height']
+    for ref in block['title_merges']:
+        try:
+            ws_out.merge_cells(ref)
+        except Exception:
+            pass
+
+    # 2행
+    values, sids = block['header']
+    for c_idx, (val, sid) in enumerate(zip(values, sids), start=1):
+        tgt_cell = ws_out.cell(row=2, column=c_idx)
+        tgt_cell.value = val
+        style_cache.apply(tgt_cell, styles[sid], ('h', sid), alignment=center_align, border=border)
+    if block['header_height']:
+        ws_out.row_dimensions[2].height = block['header_height']
+
+    # 3행~
+    for out_row, (values, sids, height) in enumerate(block['rows'], start=DATA_START_ROW):
+        for c_idx, (val, sid) in enumerate(zip(values, sids), start=1):
+            tgt_cell = ws_out.cell(row=out_row, column=c_idx)
+            tgt_cell.value = val
+            style_cache.apply(tgt_cell, styles[sid], ('d', sid),
+                              copy_fill=False, alignment=center_align, border=border)
+        if height:
+            ws_out.row_dimensions[out_row].height = height
+
+    for c_idx, width in enumerate(block['widths'], start=1):
+        if width:
+            ws_out.column_dimensions[get_column_letter(c_idx)].width = width
+
+    wb_out.save(out_path)
+    wb_out.close()
+
+
+def write_school_block_write_only(block, out_path):
+    """
+    write_school_block과 같은 결과를 write_only 워크북으로 저장 (서식 적용한 셀을 행 단위 append).
+    열 너비·병합·행 높이는 해당 행을 쓰기 전에 지정해야 함
+    """
+    styles = block['styles']
+    border = THIN_BORDER if block['use_border'] else None
+    center_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
+
+    wb_out = Workbook(write_only=True)
+    ws_out = wb_out.create_sheet(block['sheet_title'])
+    style_cache = StyleCache(copy_cell_style)
+
+    for c_idx, width in enumerate(block['widths'], start=1):
+        if width:
+            ws_out.column_dimensions[get_column_letter(c_idx)].width = width
+    for ref in block['title_merges']:
+        try:
+            ws_out.merged_cells.add(ref)
+        except Exception:
+            pass
+
+    # 1행
+    title_val, title_sid = block['title']
+    title_cell = WriteOnlyCell(ws_out, value=title_val)
+    copy_cell_style(styles[title_sid], title_cell)
+    if block['title_mode'] == "ap_b1":
+        title_cell.alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
+    if block['title_height']:
+        ws_out.row_dimensions[1].height = block['title_height']
+    ws_out.append([title_cell])
+
+    # 2행
+    values, sids = block['header']
+    cells = []
+    for val, sid in zip(values, sids):
+        cell = WriteOnlyCell(ws_out, value=val)
+        style_cache.apply(cell, styles[sid], ('h', sid), alignment=center_align, border=border)
+        cells.append(cell)
+    if block['header_height']:
+        ws_out.row_dimensions[2].height = block['header_height']
+    ws_out.append(cells)
+
+    # 3행~
+    for out_row, (values, sids, height) in enumerate(block['rows'], start=DATA_START_ROW):
+        cells = []
+        for val, sid in zip(values, sids):
+            cell = WriteOnlyCell(ws_out, value=val)
+            style_cache.apply(cell, styles[sid], ('d', sid),
+                              copy_fill=False, alignment=center_align, border=border)
+            cells.append(cell)
+        if height:
+            ws_out.row_dimensions[out_row].height = height
+        ws_out.append(cells)
+
+    wb_out.save(out_path)
+    wb_out.close()
+
+
+def _print_school_result(job, err, unchanged=False):
+    school, rows, out_path = job
+    if unchanged:
+        print(f"  변경 없음: {school['name']} ({school['code']}) - {len(rows)}행 (저장 생략)")
+    elif err is None:
+        print(f"  저장: {school['name']} ({school['code']}) - {len(rows)}행 -> {out_path}")
+    else:
+        print(f"  [에러] {school['name']} ({school['code']}) {school['region']}: {err}")
+
+
+def split_streaming(source_path, equipment, cfg, school_list, region_key, output_base, test_output, workers=1,
+                    write_only=False, force=False):
+    """
+    2단계 방식: (1) read_only 스트리밍으로 학교별 행 값·스타일id 수집 (2) 학교별 블록 저장.
+    workers > 1이면 (2)를 프로세스 풀로 병렬 실행 (로그·실패 목록은 학교 순서 그대로).
+    write_only=True면 (2)를 write_only 워크북으로 저장.
+    블록 해시가 지난 저장과 같으면 저장 생략 (force=True면 모두 저장).
+    Returns: (log_entries, failed_schools) 또는 None
+    """
+    school_codes = {normalize_code(s['code']): s for s in school_list if s['code']}
+    code_from = cfg["code_from"]
+
+    def key_func(header_values):
+        school_code_col = find_header_col(header_values, '학교코드') if code_from == "school_or_mgmt" else None
+        mgmt_col = find_header_col(header_values, '관리번호')
+        if code_from == "mgmt_only" and not mgmt_col:
+            return None
+        if code_from == "school_or_mgmt" and not school_code_col and not mgmt_col:
+            return None
+
+        def row_key(values):
+            if code_from == "school_or_mgmt" and school_code_col:
+                extracted = normalize_code(values[school_code_col - 1] if school_code_col <= len(values) else None)
+            else:
+                if not mgmt_col:
+                    return None
+                mgmt_val = values[mgmt_col - 1] if mgmt_col <= len(values) else None
+                if not mgmt_val:
+                    return None
+                extracted = normalize_code(extract_school_code_from_mgmt_num(mgmt_val))
+            return extracted if extracted and extracted in school_codes else None
+        return row_key
+
+    src = scan_source_rows(source_path, get_sheet_candidates(equipment), HEADER_ROW, DATA_START_ROW, key_func)
+    if src is None:
+        print("오류: 시트를 찾을 수 없습니다.")
+        return None
+    if not src['key_ok']:
+        if code_from == "mgmt_only":
+            print("경고: '관리번호' 열을 찾을 수 없습니다.")
+        else:
+            print("경고: '학교코드' 또는 '관리번호' 열을 찾을 수 없습니다.")
+        return None
+
+    src_cols = output_cols_from_header(src['header_values'], src['max_column'], exclude_school_code=True)
+    schools_with_data = [(school_codes[code], rows) for code, rows in src['rows_by_key'].items()]
+    schools_with_data = sort_schools_by_region(schools_with_data, region_key)
+    if not schools_with_data:
+        print("경고: 학교코드와 매칭되는 데이터가 없습니다.")
+        return None
+
+    # (학교, 행 목록, 저장경로) 순서 = 로그 순서
+    jobs = [
+        (school, rows, get_school_out_path(school, cfg["device_label"], output_base, region_key, test_output))
+        for school, rows in schools_with_data
+    ]
+    writer = write_school_block_write_only if write_only else write_school_block
+    states = get_states(equipment, region_key, BASE_DIR)
+    errors = [None] * len(jobs)
+    hashes = [None] * len(jobs)
+    unchanged = [False] * len(jobs)
+
+    def pending_blocks():
+        """저장이 필요한 (순번, 블록)만 차례로 생성 (해시가 같으면 건너뜀)"""
+        for i, (school, rows, out_path) in enumerate(jobs):
+            block = build_school_block(src, cfg, src_cols, rows)
+            hashes[i] = content_hash(block)
+            if not force and is_unchanged(states.get(school['code']), hashes[i], out_path):
+                unchanged[i] = True
+                _print_school_result(jobs[i], None, unchanged=True)
+                continue
+            yield i, block
+
+    if workers <= 1:
+        for i, block in pending_blocks():
+            try:
+                writer(block, jobs[i][2])
+            except Exception as e:
+                errors[i] = e
+            _print_school_result(jobs[i], errors[i])
+    else:
+        # 학교별 블록(값·스타일id·필요한 스타일만)을 넘겨 저장만 병렬 실행
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(writer, block, jobs[i][2]): i for i, block in pending_blocks()}
+            for fut in as_completed(futures):
+                i = futures[fut]
+                errors[i] = fut.exception()
+                _print_school_result(jobs[i], errors[i])
+
+    log_entries = []
+    failed_schools = []
+    for (school, rows, out_path), err, h, same in zip(jobs, errors, hashes, unchanged):
+        code, region, name = school['code'], school['region'], school['name']
+        if err is None:
+            entry = {
+                '학교명': name, '학교코드': code, '지역': region,
+                '시작행': rows[0][0], '끝행': rows[-1][0], '복사행수': len(rows), '저장경로': out_path,
+                HASH_KEY: h,
+            }
+            if same:
+                entry[UNCHANGED_KEY] = True
+            log_entries.append(entry)
+        else:
+            failed_schools.append({'name': name, 'code': code, 'region': region, 'error': str(err)})
+    return log_entries, failed_schools
+
+
+def resolve_source_path(equipment, region_key, source_file=None):
+    """원본 경로 확인 (없으면 오류 출력 후 None)"""
+    source_path = source_file or get_source_path(region_key, equipment)
+    if not source_path:
+        print(f"오류: 원본 경로 규칙이 정의되지 않았습니다. (지역: {region_key}, 장비: {equipment}) → split_config.py 확인")
+        return None
+    if not os.path.exists(source_path):
+        print(f"오류: 원본 파일을 찾을 수 없습니다. {source_path}")
+        return None
+    return source_path
+
+
+def load_school_list(region_key):
+    """지역 학교 리스트 로드 (xlsx 또는 csv, 헤더행·중복 학교코드 제거). 파일 없으면 None"""
+    school_list_path = get_school_list_path(region_key, BASE_DIR)
+    if not os.path.exists(school_list_path):
+        print(f"오류: 학교 리스트 파일을 찾을 수 없습니다. (지역: {region_key})")
+        return None
+
+    school_list = []
+    if school_list_path.lower().endswith('.csv'):
+        with open(school_list_path, 'r', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                code = row.get('학교코드', row.get('code', '')).strip()
+                region = row.get('지역', row.get('region', '')).strip()
+                name = row.get('학교명', row.get('name', '')).strip()
+                if code or region or name:
+                    school_list.append({'code': code, 'region': region, 'name': name})
+    else:
+        from openpyxl import load_workbook as load_wb
+        wb_school = load_wb(school_list_path, read_only=True, data_only=True)
+        for row in wb_school.active.iter_rows(min_row=1, values_only=True):
+            row = list(row) if row else []
+            while len(row) < 3:
+                row.append(None)
+            if row[0] is None and row[1] is None and row[2] is None:
+                continue
+            if row[0] or row[1] or row[2]:
+                school_list.append({
+                    'code': str(row[0]).strip() if row[0] else '',
+                    'region': str(row[1]).strip() if row[1] else '',
+                    'name': str(row[2]).strip() if row[2] else '',
+                })
+        wb_school.close()
+
+    if school_list and (school_list[0].get('code') == '학교코드' or school_list[0].get('region') == '지역' or school_list[0].get('name') == '학교명'):
+        school_list = school_list[1:]
+
+    seen_codes = set()
+    school_list_unique = []
+    for s in school_list:
+        if s.get('code') and s['code'] not in seen_codes:
+            seen_codes.add(s['code'])
+            school_list_unique.append(s)
+    return school_list_unique
+
+
+def get_only_codes(only_schools=None, schools_file=None, today_from_missed=False, from_log=None):
+    """--only-schools / --schools-file / --from-log / --today-from-missed 로 지정한 학교코드 집합 (지정 없으면 빈 집합)"""
+    only_codes = set()
+    if from_log:
+        log_path = from_log if os.path.isabs(from_log) else os.path.join(BASE_DIR, from_log)
+        if os.path.exists(log_path):
+            only_codes.update(log_codes(log_path, BASE_DIR))
+            schools_file = None
+    elif today_from_missed and not schools_file and os.path.exists(MISSED_SCHOOLS_FILE):
+        schools_file = MISSED_SCHOOLS_FILE
+    if only_schools:
+        only_codes.update(c.strip() for c in only_schools.split(',') if c.strip())
+    if schools_file and os.path.exists(schools_file):
+        if schools_file.lower().endswith('.csv'):
+            with open(schools_file, 'r', encoding='utf-8-sig') as f:
+                for row in csv.DictReader(f):
+                    c = row.get('학교코드', '').strip()
+                    if c:
+                        only_codes.add(c)
+        else:
+            with open(schools_file, 'r', encoding='utf-8-sig') as f:
+                for line in f:
+                    c = line.strip()
+                    if c and not c.startswith('#'):
+                        only_codes.add(c)
+    return only_codes
+
+
+def write_split_log(equipment, region_key, log_entries, new_log=False, source_path=None):
+    """
+    이번 처리분을 split_log에 학교코드 기준으로 병합 저장 + split_state 인덱스 갱신.
+    Returns: (로그 경로, 병합 후 전체 건수)
+    """
+    log_path = get_log_path(equipment, region_key) if not new_log else get_log_path(equipment, region_key, datetime.now().strftime('%H%M%S'))
+    total = write_log(equipment, region_key, log_path, log_entries, source_path, fresh=new_log, base_dir=BASE_DIR)
+    return log_path, total
+
+
+def print_failed_schools(failed_schools):
     if failed_schools:
         print(f"\n[실패 {len(failed_schools)}개]")
         for f in failed_schools:
             print(f"  - {f['name']} ({f['code']}) {f['region']}: {f['error']}")
 
-    wb_src.close()
 
-    log_path = get_log_path(equipment, region_key) if not new_log else get_log_path(equipment, region_key, datetime.now().strftime('%H%M%S'))
-    existing = load_existing_log(log_path) if not new_log and os.path.exists(log_path) else []
-    by_code = {e.get('학교코드', '').strip(): e for e in existing}
-    for e in log_entries:
-        by_code[e.get('학교코드', '').strip()] = e
-    merged = list(by_code.values())
-    with open(log_path, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.DictWriter(f, fieldnames=['학교명', '학교코드', '지역', '시작행', '끝행', '복사행수', '저장경로'])
-        writer.writeheader()
-        writer.writerows(merged)
+def get_output_base(region_key, test_output=False):
+    return OUTPUT_BASE_TEST if test_output else OUTPUT_BASE_BY_REGION.get(region_key, OUTPUT_BASE_BY_REGION["DNI"])
+
+
+def main(equipment, missed_only=False, source_file=None, only_schools=None, schools_file=None,
+         today_from_missed=False, from_log=None, new_log=False, test_output=False, region_key='DNI',
+         streaming=False, workers=1, write_only=False, force=False):
+    cfg = EQUIPMENT_CONFIG.get(equipment)
+    if not cfg:
+        print(f"오류: 지원하지 않는 장비: {equipment}")
+        return
+
+    output_base = get_output_base(region_key, test_output)
+    device_label = cfg["device_label"]
+
+    if test_output:
+        print(f"[테스트] 출력 경로: {output_base}")
+    source_path = resolve_source_path(equipment, region_key, source_file)
+    if not source_path:
+        return
+
+    school_list = load_school_list(region_key)
+    if school_list is None:
+        return
+
+    if missed_only:
+        processed = get_processed_school_codes(equipment, region_key)
+        school_list = [s for s in school_list if s['code'] and s['code'] not in processed]
+        print(f"[빠진 학교만] 미처리: {len(school_list)}개")
+        if not school_list:
+            return
+
+    only_codes = get_only_codes(only_schools, schools_file, today_from_missed, from_log)
+    if only_codes:
+        school_list = [s for s in school_list if s['code'] and s['code'] in only_codes]
+        if not school_list:
+            return
 
-    print(f"\n완료. 로그: {log_path} (총 {len(merged)}개, 이번 +{len(log_entries)}개)")
+    print(f"[{device_label}] 학교 리스트: {len(school_list)}개")
+
+    if streaming or workers > 1 or write_only:
+        result = split_streaming(source_path, equipment, cfg, school_list, region_key, output_base, test_output,
+                                 workers=workers, write_only=write_only, force=force)
+    else:
+        result = split_full_load(source_path, equipment, cfg, school_list, region_key, output_base, test_output,
+                                 force=force)
+    if result is None:
+        return
+    log_entries, failed_schools = result
+
+    print_failed_schools(failed_schools)
+    log_path, total = write_split_log(equipment, region_key, log_entries, new_log, source_path)
+    n_unchanged = sum(1 for e in log_entries if e.get(UNCHANGED_KEY))
+    print(f"\n완료. 로그: {log_path} (총 {total}개, 이번 +{len(log_entries)}개, 변경 없음 {n_unchanged}개)")
+
+
+def get_summary_path(region_key, suffix=None):
+    """split_summary_{지역}_{날짜}.csv (--all-equipment 통합 요약)"""
+    base = f"split_summary_{region_key}_{datetime.now().strftime('%Y%m%d')}"
+    if suffix:
+        return os.path.join(BASE_DIR, f"{base}_{suffix}.csv")
+    return os.path.join(BASE_DIR, f"{base}.csv")
+
+
+def _run_equipment_job(equipment, school_list, region_key, test_output, write_only, new_log, force=False):
+    """--all-equipment 작업 1개 (프로세스마다 장비 1종): 원본 스트리밍 읽기 → 학교별 저장 → 장비별 로그 저장"""
+    cfg = EQUIPMENT_CONFIG[equipment]
+    source_path = resolve_source_path(equipment, region_key)
+    if not source_path:
+        return None
+    print(f"[{cfg['device_label']}] 학교 리스트: {len(school_list)}개")
+    result = split_streaming(source_path, equipment, cfg, school_list, region_key,
+                             get_output_base(region_key, test_output), test_output, write_only=write_only,
+                             force=force)
+    if result is None:
+        return None
+    log_entries, failed_schools = result
+    log_path, total = write_split_log(equipment, region_key, log_entries, new_log, source_path)
+    return {'log_entries': log_entries, 'failed_schools': failed_schools, 'log_path': log_path, 'total': total}
+
+
+def main_all_equipment(missed_only=False, only_schools=None, schools_file=None, today_from_missed=False,
+                       from_log=None, new_log=False, test_output=False, region_key='DNI', write_only=False,
+                       force=False):
+    """
+    --all-equipment: 학교 리스트·기존 로그를 한 번만 읽고 장비 4종(AP/스위치/보안/POE) 원본을 프로세스 병렬 처리.
+    학교 폴더마다 장비별 파일 저장, 장비별 split_log + 통합 요약(split_summary_{지역}_{날짜}.csv) 저장
+    """
+    if test_output:
+        print(f"[테스트] 출력 경로: {get_output_base(region_key, test_output)}")
+    school_list = load_school_list(region_key)
+    if school_list is None:
+        return
+    only_codes = get_only_codes(only_schools, schools_file, today_from_missed, from_log)
+    if only_codes:
+        school_list = [s for s in school_list if s['code'] and s['code'] in only_codes]
+        if not school_list:
+            return
+
+    jobs = {}
+    for equipment in EQUIPMENT_CONFIG:
+        targets = school_list
+        if missed_only:
+            processed = get_processed_school_codes(equipment, region_key)
+            targets = [s for s in school_list if s['code'] and s['code'] not in processed]
+            print(f"[빠진 학교만] {EQUIPMENT_CONFIG[equipment]['device_label']} 미처리: {len(targets)}개")
+        if targets:
+            jobs[equipment] = targets
+    if not jobs:
+        return
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = {
+            executor.submit(_run_equipment_job, equipment, targets, region_key, test_output, write_only, new_log,
+                            force): equipment
+            for equipment, targets in jobs.items()
+        }
+        for fut in as_completed(futures):
+            equipment = futures[fut]
+            try:
+                results[equipment] = fut.result()
+            except Exception as e:
+                print(f"  [에러] {equipment}: {e}")
+                results[equipment] = None
+
+    # 통합 요약: 학교별 장비별 복사행수 (실패/미처리 표시)
+    by_code = {}
+    for equipment in EQUIPMENT_CONFIG:
+        res = results.get(equipment)
+        if not res:
+            continue
+        for e in res['log_entries']:
+            by_code.setdefault(e['학교코드'], {'학교명': e['학교명'], '학교코드': e['학교코드'], '지역': e['지역']})[equipment] = e['복사행수']
+        for f in res['failed_schools']:
+            by_code.setdefault(f['code'], {'학교명': f['name'], '학교코드': f['code'], '지역': f['region']})[equipment] = '실패'
+    ordered = sort_schools_by_region([({'code': c, 'region': v['지역']}, v) for c, v in by_code.items()], region_key)
+    summary_path = get_summary_path(region_key, datetime.now().strftime('%H%M%S') if new_log else None)
+    with open(summary_path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=['학교명', '학교코드', '지역'] + list(EQUIPMENT_CONFIG))
+        writer.writeheader()
+        writer.writerows(v for _, v in ordered)
+
+    print(f"\n[통합 요약] 지역: {region_key}")
+    for equipment in EQUIPMENT_CONFIG:
+        label = EQUIPMENT_CONFIG[equipment]['device_label']
+        if equipment not in jobs:
+            print(f"  {label}: 대상 없음")
+            continue
+        res = results.get(equipment)
+        if not res:
+            print(f"  {label}: 처리 안 됨 (원본/시트/열 확인)")
+            continue
+        n_unchanged = sum(1 for e in res['log_entries'] if e.get(UNCHANGED_KEY))
+        print(f"  {label}: 저장 {len(res['log_entries']) - n_unchanged}개, 변경 없음 {n_unchanged}개, "
+              f"실패 {len(res['failed_schools'])}개 | 로그: {res['log_path']} (총 {res['total']}개)")
+        print_failed_schools(res['failed_schools'])
+    print(f"\n완료. 요약: {summary_path} (학교 {len(by_code)}개)")
 
 
 def _normalize_argv(argv):
@@ -453,6 +876,10 @@ if __name__ == "__main__":
   python split_school_all_v1.py --AP --DNI --test
   python split_school_all_v1.py --switch --CNE
   python split_school_all_v1.py -e poe --DNI --missed-only
+  python split_school_all_v1.py --AP --CNE --streaming
+  python split_school_all_v1.py --AP --CNE --workers 8
+  python split_school_all_v1.py --AP --CNE --workers 8 --write-only
+  python split_school_all_v1.py --all-equipment --CNE
         """,
     )
     def _device_type(s):
@@ -467,6 +894,7 @@ if __name__ == "__main__":
     dev.add_argument('--switch', '--Switch', '--SWITCH', action='store_true', help='스위치')
     dev.add_argument('--security', '--Security', '--SECURITY', action='store_true', help='보안(SEUTM)')
     dev.add_argument('--poe', '--Poe', '--POE', action='store_true', help='POE')
+    dev.add_argument('--all-equipment', action='store_true', help='장비 4종 한 번에 (학교 리스트·로그 1회 로드, 원본 병렬 처리)')
     parser.add_argument('-e', '--device', type=_device_type, help='장비 (AP/switch/security/poe, 대소문자 무관)')
     parser.add_argument('--DNI', '--dni', '--Dni', action='store_true', help='대전 (대소문자 무관)')
     parser.add_argument('--CNE', '--cne', '--Cne', action='store_true', help='충남 (대소문자 무관)')
@@ -478,12 +906,22 @@ if __name__ == "__main__":
     parser.add_argument('--new-log', action='store_true', help='별도 로그 파일 생성')
     parser.add_argument('--source', '-s', type=str, default=None, help='원본 파일 경로')
     parser.add_argument('--test', '-t', action='store_true', help='OUTPUT 폴더에 테스트 저장')
+    parser.add_argument('--streaming', action='store_true', help='원본을 read_only로 읽어 학교별 값·스타일만 수집 (대용량 원본용)')
+    parser.add_argument('--workers', type=int, default=1, help='학교별 저장 병렬 프로세스 수 (2 이상이면 --streaming 방식)')
+    parser.add_argument('--write-only', action='store_true', help='write_only 워크북으로 행 단위 저장 (--streaming 방식)')
+    parser.add_argument('--force', action='store_true', help='내용이 바뀌지 않은 학교도 다시 저장')
     args = parser.parse_args()
 
     region_key = 'CNE' if args.CNE else 'DNI'
-    device = args.device or ('AP' if args.AP else 'switch' if args.switch else 'security' if args.security else 'poe')
-
-    main(equipment=device, missed_only=args.missed_only, source_file=args.source,
-         only_schools=args.only_schools, schools_file=args.schools_file,
-         today_from_missed=args.today_from_missed, from_log=args.from_log, new_log=args.new_log,
-         test_output=args.test, region_key=region_key)
+    if args.all_equipment:
+        main_all_equipment(missed_only=args.missed_only, only_schools=args.only_schools,
+                           schools_file=args.schools_file, today_from_missed=args.today_from_missed,
+                           from_log=args.from_log, new_log=args.new_log, test_output=args.test,
+                           region_key=region_key, write_only=args.write_only, force=args.force)
+    else:
+        device = args.device or ('AP' if args.AP else 'switch' if args.switch else 'security' if args.security else 'poe')
+        main(equipment=device, missed_only=args.missed_only, source_file=args.source,
+             only_schools=args.only_schools, schools_file=args.schools_file,
+             today_from_missed=args.today_from_missed, from_log=args.from_log, new_log=args.new_log,
+             test_output=args.test, region_key=region_key, streaming=args.streaming, workers=args.workers,
+             write_only=args.write_only, force=args.force)
@@ -15,7 +15,11 @@ from copy import copy
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Alignment
-from school_utils import extract_school_code_from_mgmt_num, find_mgmt_col, get_output_cols, sort_schools_by_region, get_school_list_path
+from school_utils import extract_school_code_from_mgmt_num, find_mgmt_col, get_output_cols, sort_schools_by_region, get_school_list_path, iter_row_values
+from style_cache import StyleCache, source_style_key
+from split_state import (
+    processed_codes, write_log, get_states, worksheet_block_hash, is_unchanged, HASH_KEY, UNCHANGED_KEY,
+)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 SOURCE_BY_REGION = {
     "DNI": os.path.join(BASE_DIR, "DJE_SEUTM_LIST.xlsx"),
@@ -38,36 +42,8 @@ def get_today_log_path(region='DNI', suffix=None):
 
 
 def get_processed_school_codes(region='DNI'):
-    prefix = f"split_log_security_{region}_"
-    processed = set()
-    for fname in os.listdir(BASE_DIR):
-        if fname.startswith(prefix) and fname.endswith('.csv'):
-            path = os.path.join(BASE_DIR, fname)
-            try:
-                with open(path, 'r', encoding='utf-8-sig') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        code = row.get('학교코드', '').strip()
-                        if code:
-                            processed.add(code)
-            except Exception:
-                pass
-    return processed
-
-
-def load_existing_log(path):
-    entries = []
-    if path and os.path.exists(path):
-        for enc in ('utf-8-sig', 'utf-8', 'cp949'):
-            try:
-                with open(path, 'r', encoding=enc) as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        entries.append(row)
-                break
-            except UnicodeDecodeError:
-                continue
-    return entries
+    """지정 지역의 security 처리 학교코드 집합 (split_state 인덱스 조회, 첫 사용 때만 split_log_security_{지역}_*.csv 가져옴)"""
+    return processed_codes("security", region, BASE_DIR)
 
 
 def normalize_code(val):
@@ -132,7 +108,8 @@ def copy_title_row_with_merge(ws_src, ws_out, src_row=1):
 
 
 def main(missed_only=False, source_file=None, only_schools=None, schools_file=None,
-         today_from_missed=False, from_log=None, new_log=False, test_output=False, region_key='DNI'):
+         today_from_missed=False, from_log=None, new_log=False, test_output=False, region_key='DNI',
+         force=False):
     source_path = source_file or SOURCE_BY_REGION.get(region_key, SOURCE_BY_REGION["DNI"])
     output_base = OUTPUT_BASE_TEST if test_output else OUTPUT_BASE_BY_REGION.get(region_key, OUTPUT_BASE_BY_REGION["DNI"])
     if test_output:
@@ -242,8 +219,7 @@ def main(missed_only=False, source_file=None, only_schools=None, schools_file=No
 
     school_codes = {normalize_code(s['code']): s for s in school_list if s['code']}
     rows_by_school = {}
-    for r in range(DATA_START_ROW, max_row + 1):
-        mgmt_val = ws_src.cell(row=r, column=mgmt_col).value
+    for r, (mgmt_val,) in iter_row_values(ws_src, [mgmt_col], DATA_START_ROW, max_row):
         if not mgmt_val:
             continue
         extracted = normalize_code(extract_school_code_from_mgmt_num(mgmt_val))
@@ -261,6 +237,8 @@ def main(missed_only=False, source_file=None, only_schools=None, schools_file=No
 
     log_entries = []
     failed_schools = []
+    # 지난 저장 해시 (같으면 저장 생략, --force면 모두 저장)
+    states = get_states("security", region_key, BASE_DIR)
     from openpyxl import Workbook
 
     for item in schools_with_data:
@@ -279,6 +257,16 @@ def main(missed_only=False, source_file=None, only_schools=None, schools_file=No
         os.makedirs(out_dir, exist_ok=True)
         out_filename = f"{display_name}_{DEVICE_NAME} 장비 현황 상세.XLSX"
         out_path = os.path.join(out_dir, out_filename)
+        entry = {
+            '학교명': name, '학교코드': code, '지역': region,
+            '시작행': start_row, '끝행': end_row, '복사행수': row_count, '저장경로': out_path,
+            HASH_KEY: worksheet_block_hash(ws_src, data_rows, src_cols, HEADER_ROW),
+        }
+        if not force and is_unchanged(states.get(code), entry[HASH_KEY], out_path):
+            entry[UNCHANGED_KEY] = True
+            log_entries.append(entry)
+            print(f"  변경 없음: {name} ({code}) - {row_count}행 (저장 생략)")
+            continue
 
         try:
             wb_out = Workbook()
@@ -286,25 +274,25 @@ def main(missed_only=False, source_file=None, only_schools=None, schools_file=No
             ws_out.title = f"{DEVICE_NAME} 장비 현황"
 
             copy_title_row_with_merge(ws_src, ws_out, src_row=1)
+            center_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
+            style_cache = StyleCache(copy_cell_style)  # 원본 스타일별로 한 번만 복사
 
             for c_idx, src_col in enumerate(src_cols, start=1):
                 src_cell = ws_src.cell(row=HEADER_ROW, column=src_col)
                 tgt_cell = ws_out.cell(row=2, column=c_idx)
                 tgt_cell.value = src_cell.value
-                copy_cell_style(src_cell, tgt_cell)
-                tgt_cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+                style_cache.apply(tgt_cell, src_cell, ('h', source_style_key(src_cell)), alignment=center_align)
             if HEADER_ROW in ws_src.row_dimensions and ws_src.row_dimensions[HEADER_ROW].height:
                 ws_out.row_dimensions[2].height = ws_src.row_dimensions[HEADER_ROW].height
 
-            center_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
             out_row = 3
             for src_row in data_rows:
                 for c_idx, src_col in enumerate(src_cols, start=1):
                     src_cell = ws_src.cell(row=src_row, column=src_col)
                     tgt_cell = ws_out.cell(row=out_row, column=c_idx)
                     tgt_cell.value = src_cell.value
-                    copy_cell_style(src_cell, tgt_cell, copy_fill=False)
-                    tgt_cell.alignment = center_align
+                    style_cache.apply(tgt_cell, src_cell, ('d', source_style_key(src_cell)),
+                                      copy_fill=False, alignment=center_align)
                 if src_row in ws_src.row_dimensions and ws_src.row_dimensions[src_row].height:
                     ws_out.row_dimensions[out_row].height = ws_src.row_dimensions[src_row].height
                 out_row += 1
@@ -316,10 +304,7 @@ def main(missed_only=False, source_file=None, only_schools=None, schools_file=No
 
             wb_out.save(out_path)
             wb_out.close()
-            log_entries.append({
-                '학교명': name, '학교코드': code, '지역': region,
-                '시작행': start_row, '끝행': end_row, '복사행수': row_count, '저장경로': out_path
-            })
+            log_entries.append(entry)
             print(f"  저장: {name} ({code}) - {row_count}행 -> {out_path}")
         except Exception as e:
             print(f"  [에러] {name} ({code}) {region}: {e}")
@@ -333,17 +318,10 @@ def main(missed_only=False, source_file=None, only_schools=None, schools_file=No
     wb_src.close()
 
     log_path = get_today_log_path(region_key) if not new_log else get_today_log_path(region_key, datetime.now().strftime('%H%M%S'))
-    existing = load_existing_log(log_path) if not new_log and log_path and os.path.exists(log_path) else []
-    by_code = {e.get('학교코드', '').strip(): e for e in existing}
-    for e in log_entries:
-        by_code[e.get('학교코드', '').strip()] = e
-    merged = list(by_code.values())
-    with open(log_path, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.DictWriter(f, fieldnames=['학교명', '학교코드', '지역', '시작행', '끝행', '복사행수', '저장경로'])
-        writer.writeheader()
-        writer.writerows(merged)
+    total = write_log("security", region_key, log_path, log_entries, source_path, fresh=new_log, base_dir=BASE_DIR)
 
-    print(f"\n완료. 로그: {log_path} (총 {len(merged)}개, 이번 +{len(log_entries)}개)")
+    n_unchanged = sum(1 for e in log_entries if e.get(UNCHANGED_KEY))
+    print(f"\n완료. 로그: {log_path} (총 {total}개, 이번 +{len(log_entries)}개, 변경 없음 {n_unchanged}개)")
 
 
 if __name__ == "__main__":
@@ -360,10 +338,11 @@ if __name__ == "__main__":
                         help='테스트: OUTPUT 폴더에 생성. 없으면 실제 목표 저장 폴더에 저장')
     parser.add_argument('--DNI', '--dni', action='store_true', help='대전 (로그: split_log_security_DNI_YYYYMMDD.csv)')
     parser.add_argument('--CNE', '--cne', action='store_true', help='충남 (로그: split_log_security_CNE_YYYYMMDD.csv)')
+    parser.add_argument('--force', action='store_true', help='내용이 바뀌지 않은 학교도 다시 저장')
     args = parser.parse_args()
     region_key = 'CNE' if args.CNE else 'DNI'
     main(missed_only=args.missed_only, source_file=args.source,
          test_output=args.test,
          only_schools=args.only_schools, schools_file=args.schools_file,
          today_from_missed=args.today_from_missed, from_log=args.from_log, new_log=args.new_log,
-         region_key=region_key)
+         region_key=region_key, force=args.force)
@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""
+split 처리 상태 인덱스 (SQLite, BASE_DIR/split_state.sqlite)
+- split_state: (장비, 지역, 학교코드) → 마지막 저장경로, 시작행/끝행, 복사행수, 원본 식별(경로·크기·수정시각), 처리 시각
+- split_log_rows: 로그 파일별 행 (split_log_*.csv와 같은 내용) → 오늘 로그 병합 시 CSV 재파싱 생략
+- split_log_files: 인덱스가 마지막으로 쓴 로그 파일의 크기·수정시각 (다르면 CSV가 밖에서 바뀐 것 → 다시 읽음)
+- 장비·지역별 첫 조회 때 기존 split_log_{장비}_{지역}_*.csv를 한 번 가져오고 이후로는 폴더를 다시 훑지 않음
+- 분리 스크립트는 저장 후 merge_log → CSV 기록 → mark_log_written 순으로 갱신 (각 단계 한 트랜잭션)
+- 변경 감지: 학교별 출력 내용(값·서식·높이·너비·병합) 해시를 content_hash에 저장, 같으면 다음 실행에서 저장 생략
+"""
+import csv
+import hashlib
+import os
+import sqlite3
+import time
+
+from openpyxl.utils import get_column_letter
+
+from school_utils import get_split_log_prefix
+from style_cache import source_style_key
+
+STATE_DB_NAME = "split_state.sqlite"
+# 출력 규칙(서식 적용 방식 등)이 바뀌면 올려서 기존 해시 무효화
+CONTENT_HASH_VERSION = 1
+LOG_FIELDS = ['학교명', '학교코드', '지역', '시작행', '끝행', '복사행수', '저장경로']
+# 로그 항목(dict)의 내부용 키 (CSV에는 쓰지 않음): 출력 내용 해시, 변경 없어 저장 생략 여부
+HASH_KEY = '_content_hash'
+UNCHANGED_KEY = '_unchanged'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS split_state (
+    equipment TEXT NOT NULL,
+    region_key TEXT NOT NULL,
+    code TEXT NOT NULL,
+    name TEXT,
+    region TEXT,
+    start_row INTEGER,
+    end_row INTEGER,
+    row_count INTEGER,
+    out_path TEXT,
+    source_path TEXT,
+    source_size INTEGER,
+    source_mtime_ns INTEGER,
+    log_file TEXT,
+    updated_at REAL,
+    content_hash TEXT,
+    PRIMARY KEY (equipment, region_key, code)
+);
+CREATE TABLE IF NOT EXISTS split_log_rows (
+    log_file TEXT NOT NULL,
+    code TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    name TEXT,
+    region TEXT,
+    start_row TEXT,
+    end_row TEXT,
+    row_count TEXT,
+    out_path TEXT,
+    PRIMARY KEY (log_file, code)
+);
+CREATE TABLE IF NOT EXISTS split_log_files (
+    log_file TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime_ns INTEGER
+);
+CREATE TABLE IF NOT EXISTS split_imported (
+    equipment TEXT NOT NULL,
+    region_key TEXT NOT NULL,
+    imported_at REAL,
+    PRIMARY KEY (equipment, region_key)
+);
+"""
+
+
+def get_state_path(base_dir=None):
+    base_dir = base_dir or os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_dir, STATE_DB_NAME)
+
+
+def connect(base_dir=None):
+    """인덱스 연결 (테이블 없으면 생성). 여러 프로세스가 동시에 써도 되도록 WAL + 대기 시간"""
+    conn = sqlite3.connect(get_state_path(base_dir), timeout=60)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(split_state)")}
+    if 'content_hash' not in cols:
+        conn.execute("ALTER TABLE split_state ADD COLUMN content_hash TEXT")
+    return conn
+
+
+def read_log_csv(path):
+    """split_log CSV 읽기 (utf-8-sig → utf-8 → cp949 순으로 시도)"""
+    entries = []
+    if path and os.path.exists(path):
+        for enc in ('utf-8-sig', 'utf-8', 'cp949'):
+            try:
+                with open(path, 'r', encoding=enc) as f:
+                    entries = list(csv.DictReader(f))
+                break
+            except UnicodeDecodeError:
+                continue
+    return entries
+
+
+def source_fingerprint(path):
+    """원본 식별 정보 (경로, 크기, 수정시각 ns). 파일이 없으면 None"""
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return {'path': os.path.abspath(path), 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def _to_int(val):
+    try:
+        return int(str(val).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _file_stat(path):
+    try:
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+    except OSError:
+        return None
+
+
+def _replace_log_rows(conn, log_file, entries):
+    conn.execute("DELETE FROM split_log_rows WHERE log_file = ?", (log_file,))
+    _upsert_log_rows(conn, log_file, entries)
+
+
+def _upsert_log_rows(conn, log_file, entries):
+    """로그 행 추가/교체. 기존 학교는 순서(seq) 유지, 새 학교는 뒤에 붙임 (CSV 병합 규칙과 동일)"""
+    seq = conn.execute("SELECT COALESCE(MAX(seq), -1) FROM split_log_rows WHERE log_file = ?", (log_file,)).fetchone()[0]
+    for e in entries:
+        code = (e.get('학교코드') or '').strip()
+        row = conn.execute("SELECT seq FROM split_log_rows WHERE log_file = ? AND code = ?", (log_file, code)).fetchone()
+        if row is None:
+            seq += 1
+            cur_seq = seq
+        else:
+            cur_seq = row[0]
+        conn.execute(
+            "INSERT OR REPLACE INTO split_log_rows VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (log_file, code, cur_seq, e.get('학교명'), e.get('지역'), str(e.get('시작행', '')),
+             str(e.get('끝행', '')), str(e.get('복사행수', '')), e.get('저장경로')),
+        )
+
+
+def _upsert_state(conn, equipment, region_key, log_file, entries, fingerprint=None, updated_at=None):
+    fp = fingerprint or {}
+    now = updated_at if updated_at is not None else time.time()
+    conn.executemany(
+        "INSERT OR REPLACE INTO split_state (equipment, region_key, code, name, region, start_row, end_row, "
+        "row_count, out_path, source_path, source_size, source_mtime_ns, log_file, updated_at, content_hash) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (equipment, region_key, code, e.get('학교명'), e.get('지역'),
+             _to_int(e.get('시작행')), _to_int(e.get('끝행')), _to_int(e.get('복사행수')), e.get('저장경로'),
+             fp.get('path'), fp.get('size'), fp.get('mtime_ns'), log_file, now, e.get(HASH_KEY))
+            for e in entries
+            for code in [(e.get('학교코드') or '').strip()] if code
+        ],
+    )
+
+
+def _ensure_imported(conn, equipment, region_key, base_dir):
+    """장비·지역 첫 사용 시 기존 split_log CSV를 인덱스로 가져옴 (파일명 순 → 최근 로그가 마지막에 덮어씀)"""
+    if conn.execute("SELECT 1 FROM split_imported WHERE equipment = ? AND region_key = ?",
+                    (equipment, region_key)).fetchone():
+        return
+    prefix = get_split_log_prefix(equipment, region_key)
+    for fname in sorted(os.listdir(base_dir)):
+        if not (fname.startswith(prefix) and fname.endswith('.csv')):
+            continue
+        path = os.path.join(base_dir, fname)
+        try:
+            entries = read_log_csv(path)
+        except Exception:
+            continue
+        stat = _file_stat(path)
+        _replace_log_rows(conn, fname, entries)
+        if stat:
+            conn.execute("INSERT OR REPLACE INTO split_log_files VALUES (?, ?, ?)", (fname, stat[0], stat[1]))
+        _upsert_state(conn, equipment, region_key, fname, entries, updated_at=stat[1] / 1e9 if stat else None)
+    conn.execute("INSERT OR REPLACE INTO split_imported VALUES (?, ?, ?)", (equipment, region_key, time.time()))
+
+
+def processed_codes(equipment, region_key, base_dir=None):
+    """지정 장비·지역에서 처리(저장)된 학교코드 집합"""
+    base_dir = base_dir or os.path.dirname(os.path.abspath(__file__))
+    conn = connect(base_dir)
+    try:
+        with conn:
+            _ensure_imported(conn, equipment, region_key, base_dir)
+        rows = conn.execute("SELECT code FROM split_state WHERE equipment = ? AND region_key = ?",
+                            (equipment, region_key)).fetchall()
+        return {r[0] for r in rows}
+    finally:
+        conn.close()
+
+
+def get_states(equipment, region_key, base_dir=None):
+    """지정 장비·지역의 학교코드 → 마지막 처리 상태 dict"""
+    base_dir = base_dir or os.path.dirname(os.path.abspath(__file__))
+    conn = connect(base_dir)
+    conn.row_factory = sqlite3.Row
+    try:
+        with conn:
+            _ensure_imported(conn, equipment, region_key, base_dir)
+        rows = conn.execute("SELECT * FROM split_state WHERE equipment = ? AND region_key = ?",
+                            (equipment, region_key)).fetchall()
+        return {r['code']: dict(r) for r in rows}
+    finally:
+        conn.close()
+
+
+def _log_rows_from_index(conn, log_path):
+    """인덱스가 마지막으로 쓴 상태 그대로인 로그면 인덱스의 행, 아니면 None"""
+    log_file = os.path.basename(log_path)
+    known = conn.execute("SELECT size, mtime_ns FROM split_log_files WHERE log_file = ?", (log_file,)).fetchone()
+    if known is None or _file_stat(log_path) != tuple(known):
+        return None
+    rows = conn.execute(
+        "SELECT name, code, region, start_row, end_row, row_count, out_path FROM split_log_rows "
+        "WHERE log_file = ? ORDER BY seq", (log_file,)).fetchall()
+    return [dict(zip(LOG_FIELDS, r)) for r in rows]
+
+
+def log_codes(log_path, base_dir=None):
+    """로그 파일의 학교코드 집합 (--from-log). 인덱스와 일치하면 CSV를 읽지 않음"""
+    conn = connect(base_dir)
+    try:
+        rows = _log_rows_from_index(conn, log_path)
+    finally:
+        conn.close()
+    if rows is None:
+        rows = read_log_csv(log_path)
+    return {(r.get('학교코드') or '').strip() for r in rows if (r.get('학교코드') or '').strip()}
+
+
+def merge_log(equipment, region_key, log_path, log_entries, source_path=None, fresh=False, base_dir=None):
+    """
+    이번 처리분을 인덱스에 반영하고 로그 파일에 쓸 전체 행(기존 순서 유지 + 신규 뒤에) 반환. 한 트랜잭션.
+    fresh=True(--new-log)면 기존 로그 내용 없이 이번 처리분만
+    """
+    base_dir = base_dir or os.path.dirname(os.path.abspath(__file__))
+    log_file = os.path.basename(log_path)
+    fingerprint = source_fingerprint(source_path)
+    conn = connect(base_dir)
+    try:
+        with conn:
+            _ensure_imported(conn, equipment, region_key, base_dir)
+            if fresh or not os.path.exists(log_path):
+                conn.execute("DELETE FROM split_log_rows WHERE log_file = ?", (log_file,))
+            elif _log_rows_from_index(conn, log_path) is None:
+                # 인덱스 밖에서 생성·수정된 로그 → CSV 기준으로 다시 맞춤
+                _replace_log_rows(conn, log_file, read_log_csv(log_path))
+            _upsert_log_rows(conn, log_file, log_entries)
+            _upsert_state(conn, equipment, region_key, log_file, log_entries, fingerprint)
+            rows = conn.execute(
+                "SELECT name, code, region, start_row, end_row, row_count, out_path FROM split_log_rows "
+                "WHERE log_file = ? ORDER BY seq", (log_file,)).fetchall()
+        return [dict(zip(LOG_FIELDS, r)) for r in rows]
+    finally:
+        conn.close()
+
+
+def mark_log_written(log_path, base_dir=None):
+    """로그 CSV 기록 후 크기·수정시각 저장 (다음 병합 때 CSV 재파싱 생략 판단용)"""
+    stat = _file_stat(log_path)
+    if stat is None:
+        return
+    conn = connect(base_dir)
+    try:
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO split_log_files VALUES (?, ?, ?)",
+                         (os.path.basename(log_path), stat[0], stat[1]))
+    finally:
+        conn.close()
+
+
+def write_log(equipment, region_key, log_path, log_entries, source_path=None, fresh=False, base_dir=None):
+    """merge_log → CSV 기록 → mark_log_written. Returns: 로그 전체 건수"""
+    merged = merge_log(equipment, region_key, log_path, log_entries, source_path, fresh, base_dir)
+    with open(log_path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=LOG_FIELDS)
+        writer.writeheader()
+        writer.writerows(merged)
+    mark_log_written(log_path, base_dir)
+    return len(merged)
+
+
+def content_hash(obj):
+    """출력 내용 묶음(값·스타일·레이아웃 등 repr 가능한 객체) 해시"""
+    return hashlib.sha1(repr((CONTENT_HASH_VERSION, obj)).encode('utf-8')).hexdigest()
+
+
+def worksheet_block_hash(ws, data_rows, cols, header_row=2, extra=None):
+    """
+    원본 시트(일반 로드)에서 학교 1개 출력에 쓰이는 범위의 해시.
+    1행 제목(A열부터)·헤더·데이터 행의 값과 서식, 행 높이, 열 너비, 1행 병합 포함 (원본 행 번호는 제외 → 다른 학교 행 추가로 밀려도 같음)
+    """
+    styles = {}
+    parts = [extra]
+    title_cols = range(1, max(cols, default=1) + 1)
+    for r, row_cols in [(1, title_cols), (header_row, cols)] + [(r, cols) for r in data_rows]:
+        cells = []
+        for c in row_cols:
+            cell = ws.cell(row=r, column=c)
+            key = source_style_key(cell)
+            st = styles.get(key)
+            if st is None:
+                st = styles[key] = repr((cell.font, cell.fill, cell.border, cell.alignment, cell.number_format))
+            cells.append((cell.value, st))
+        height = ws.row_dimensions[r].height if r in ws.row_dimensions else None
+        parts.append((cells, height))
+    widths = []
+    for c in cols:
+        letter = get_column_letter(c)
+        widths.append(ws.column_dimensions[letter].width if letter in ws.column_dimensions else None)
+    parts.append(widths)
+    parts.append(sorted(str(m) for m in ws.merged_cells.ranges if m.min_row <= 1 <= m.max_row))
+    return content_hash(parts)
+
+
+def is_unchanged(prev_state, new_hash, out_path):
+    """이전 처리 상태와 해시·저장경로가 같고 출력 파일이 남아 있으면 True (저장 생략 가능)"""
+    return bool(
+        prev_state and new_hash
+        and prev_state.get('content_hash') == new_hash
+        and prev_state.get('out_path') == out_path
+        and os.path.exists(out_path)
+    )
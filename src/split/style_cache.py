@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+분리 스크립트 공통: 출력 셀 서식 캐시
+- 기존: 셀마다 copy_cell_style(font/fill/border/alignment/number_format copy) + 맞춤·테두리 재지정
+  → 셀마다 서식 객체 복사·해시 조회가 반복되어 행이 많은 학교에서 저장 전 단계가 느림
+- 캐시: 원본 스타일 식별값(+ 용도) 별로 처음 한 번만 서식을 적용하고, 결과 StyleArray(출력 워크북의 서식 번호 묶음)를 저장
+  → 같은 키의 다음 셀은 번호 묶음만 복사해 바로 참조
+- 서식 번호는 출력 워크북마다 다르므로 StyleCache는 출력 워크북 1개당 1개 생성
+"""
+from copy import copy
+
+
+def source_style_key(cell):
+    """원본 셀 스타일 식별값 (read_only 셀은 style id, 일반 셀은 StyleArray 튜플, 빈 셀은 0)"""
+    sid = getattr(cell, '_style_id', None)
+    if sid is not None:
+        return sid
+    style = getattr(cell, '_style', None)
+    return tuple(style) if style is not None else 0
+
+
+class StyleCache:
+    """
+    출력 워크북 1개용 서식 캐시.
+    copy_style: 각 스크립트의 copy_cell_style(src, tgt, copy_fill=...) (스크립트별 복사 규칙 그대로 사용)
+    """
+
+    def __init__(self, copy_style):
+        self._copy_style = copy_style
+        self._arrays = {}
+
+    def apply(self, tgt_cell, src, key, copy_fill=True, alignment=None, border=None):
+        """
+        src 서식을 tgt_cell에 적용 (+ alignment/border 덮어쓰기).
+        key는 결과 서식을 구분하는 값: 원본 스타일 식별값 + 용도(헤더/데이터 등)를 함께 넣을 것
+        """
+        arr = self._arrays.get(key)
+        if arr is not None:
+            tgt_cell._style = copy(arr)
+            return
+        self._copy_style(src, tgt_cell, copy_fill=copy_fill)
+        if alignment is not None:
+            tgt_cell.alignment = alignment
+        if border is not None:
+            tgt_cell.border = border
+        self._arrays[key] = copy(tgt_cell._style)
+
+    def __len__(self):
+        return len(self._arrays)
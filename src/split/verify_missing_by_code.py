@@ -5,12 +5,19 @@
 - --AP / --switch / --security / --poe: 장비 유형
 - SCHOOL_REG_LIST와 split_log 비교 → 빠진 학교코드
 - 원본 시트에 해당 코드 존재 여부 확인
+- --all: 지역 2 × 장비 4 조합을 한 번에 검증해 표 하나로 출력
+- 원본 색인: 원본 파일마다 read_only 한 번 훑어 {학교코드: 행 수}를 만들고 원본 옆 JSON으로 저장
+  (파일 크기·수정시각이 같으면 다음 실행부터 원본을 다시 열지 않음, --no-cache로 다시 생성)
 """
 import os
 import csv
+import json
+import time
 import argparse
 from openpyxl import load_workbook
-from school_utils import extract_school_code_from_mgmt_num, find_mgmt_col, find_school_code_col
+from school_utils import (
+    extract_school_code_from_mgmt_num, find_header_col, read_header_values, iter_row_values,
+)
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DNI_DIR = os.path.join(BASE_DIR, "DNI")
@@ -124,6 +131,12 @@ CONFIG = {
 }
 
 DEVICE_LABELS = {"AP": "AP", "switch": "스위치", "security": "보안(SEUTM)", "poe": "POE"}
+DEVICES = ["AP", "switch", "security", "poe"]
+
+# 원본 색인 형식이 바뀌면 올려서 기존 색인 무효화
+SOURCE_INDEX_VERSION = 1
+HEADER_ROW = 2
+DATA_START_ROW = 3
 
 
 def get_processed_codes(region, device):
@@ -193,49 +206,108 @@ def load_all_schools(region):
     return schools
 
 
-def get_source_codes(region, device):
-    """원본 시트에서 학교코드 집합 반환 (장비별 열 처리)"""
+def get_source_index_path(path, code_from):
+    """원본 색인 파일 경로 (원본과 같은 폴더, 예: .DNI_AP_LIST.XLSX.codes_school_col.json)"""
+    folder, name = os.path.split(path)
+    return os.path.join(folder, f".{name}.codes_{code_from}.json")
+
+
+def build_source_index(path, sheets, code_from):
+    """
+    원본을 read_only로 한 번 훑어 (시트명, {학교코드: 행 수}) 반환. 후보 시트가 없으면 (None, {})
+    - school_col: 학교코드 열(없으면 A열) 값, mgmt_col: 관리번호 앞 12자리
+    """
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sn = next((name for name in sheets if name in wb.sheetnames), None)
+        if sn is None:
+            return None, {}
+        ws = wb[sn]
+        header = read_header_values(ws, HEADER_ROW)
+        counts = {}
+        if code_from == "school_col":
+            col = find_header_col(header, "학교코드") or 1
+        else:
+            col = find_header_col(header, "관리번호")
+            if not col:
+                return sn, counts
+        for _, (v,) in iter_row_values(ws, [col], DATA_START_ROW):
+            if v is None:
+                continue
+            code = str(v).strip() if code_from == "school_col" else extract_school_code_from_mgmt_num(v)
+            if code:
+                counts[code] = counts.get(code, 0) + 1
+        return sn, counts
+    finally:
+        wb.close()
+
+
+def load_source_index(path, sheets, code_from, use_cache=True):
+    """
+    원본 색인 (시트명, {학교코드: 행 수}). 색인 파일의 크기·수정시각·시트 후보가 원본과 같으면 그대로 사용,
+    아니면 새로 만들어 저장 (저장 실패는 무시)
+    """
+    st = os.stat(path)
+    idx_path = get_source_index_path(path, code_from)
+    if use_cache:
+        try:
+            with open(idx_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if (cached.get("version") == SOURCE_INDEX_VERSION and cached.get("size") == st.st_size
+                    and cached.get("mtime_ns") == st.st_mtime_ns and cached.get("sheets") == list(sheets)):
+                return cached.get("sheet"), cached.get("counts") or {}
+        except (OSError, ValueError):
+            pass
+    sn, counts = build_source_index(path, sheets, code_from)
+    tmp = f"{idx_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": SOURCE_INDEX_VERSION, "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                "sheets": list(sheets), "sheet": sn, "counts": counts,
+            }, f, ensure_ascii=False)
+        os.replace(tmp, idx_path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return sn, counts
+
+
+def get_source_counts(region, device, use_cache=True):
+    """원본 시트의 {학교코드: 행 수}, 시트명, 원본 경로 (원본 없으면 ({}, None, None))"""
     cfg = CONFIG.get(region, {}).get(device)
     if not cfg:
-        return set(), None, None
-
-    path = None
-    for cand in cfg["source_candidates"]:
-        if os.path.exists(cand):
-            path = cand
-            break
+        return {}, None, None
+    path = next((cand for cand in cfg["source_candidates"] if os.path.exists(cand)), None)
     if not path:
-        return set(), None, None
-
-    wb = load_workbook(path, read_only=False, data_only=True)
-    for sn in cfg["sheets"]:
-        if sn in wb.sheetnames:
-            ws = wb[sn]
-            vals = set()
-            if cfg["code_from"] == "school_col":
-                school_col = find_school_code_col(ws, 2) or 1
-                for row in ws.iter_rows(min_row=3, min_col=school_col, max_col=school_col, values_only=True):
-                    v = row[0] if row else None
-                    if v is not None:
-                        s = str(v).strip()
-                        if s:
-                            vals.add(s)
-            else:
-                mgmt_col = find_mgmt_col(ws, 2)
-                if mgmt_col:
-                    for row in ws.iter_rows(min_row=3, min_col=mgmt_col, max_col=mgmt_col, values_only=True):
-                        v = row[0] if row else None
-                        if v is not None:
-                            code = extract_school_code_from_mgmt_num(v)
-                            if code:
-                                vals.add(code)
-            wb.close()
-            return vals, sn, path
-    wb.close()
-    return set(), None, None
+        return {}, None, None
+    sn, counts = load_source_index(path, cfg["sheets"], cfg["code_from"], use_cache)
+    if sn is None:
+        return {}, None, None
+    return counts, sn, path
+
 
+def get_source_codes(region, device, use_cache=True):
+    """원본 시트에서 학교코드 집합 반환 (장비별 열 처리)"""
+    counts, sn, path = get_source_counts(region, device, use_cache)
+    return set(counts), sn, path
 
-def main(region, device):
+
+def load_unique_schools(region):
+    """학교 리스트 (헤더 행 제외, 학교코드 중복 제거, 순서 유지)"""
+    all_schools = load_all_schools(region)
+    if all_schools and all_schools[0].get("code") == "학교코드":
+        all_schools = all_schools[1:]
+    seen = set()
+    unique = []
+    for s in all_schools:
+        if s["code"] and s["code"] not in seen:
+            seen.add(s["code"])
+            unique.append(s)
+    return unique
+
+
+def main(region, device, use_cache=True):
     cfg = CONFIG.get(region, {}).get(device)
     if not cfg:
         print(f"오류: 지원하지 않는 조합 (region={region}, device={device})")
@@ -245,18 +317,10 @@ def main(region, device):
     print(f"=== {region} / {device_label} 빠진 학교 검증 ===\n")
 
     processed = get_processed_codes(region, device)
-    all_schools = load_all_schools(region)
-    if not all_schools:
+    unique = load_unique_schools(region)
+    if not unique:
         print("SCHOOL_REG_LIST 없음")
         return
-    if all_schools[0].get("code") == "학교코드":
-        all_schools = all_schools[1:]
-    seen = set()
-    unique = []
-    for s in all_schools:
-        if s["code"] and s["code"] not in seen:
-            seen.add(s["code"])
-            unique.append(s)
 
     missed = [s for s in unique if s["code"] not in processed]
     print(f"학교코드 기준 빠진 학교: {len(missed)}개\n")
@@ -268,7 +332,7 @@ def main(region, device):
             print(f"[학교리스트] {cand}")
             break
 
-    source_vals, sheet_name, source_path = get_source_codes(region, device)
+    source_vals, sheet_name, source_path = get_source_codes(region, device, use_cache)
     if source_path:
         print(f"[원본] {source_path}")
     if sheet_name:
@@ -288,26 +352,55 @@ def main(region, device):
             print(f"    - {s['code']} ({s['name']})")
 
 
+def main_all(use_cache=True):
+    """지역 × 장비 전체 조합을 검증해 표 하나로 출력 (학교 리스트는 지역별 1회, 원본은 색인 사용)"""
+    t0 = time.time()
+    print("=== 빠진 학교 검증 (전체 지역 × 장비) ===\n")
+    header = f"{'지역':<4} {'장비':<10} {'학교':>5} {'처리':>5} {'빠짐':>5} {'원본O':>5} {'원본X':>5} {'원본행':>7}  원본 시트"
+    print(header)
+    print("-" * 80)
+    for region in CONFIG:
+        unique = load_unique_schools(region)
+        for device in DEVICES:
+            label = DEVICE_LABELS.get(device, device)
+            if not unique:
+                print(f"{region:<4} {label:<10}  SCHOOL_REG_LIST 없음")
+                continue
+            processed = get_processed_codes(region, device)
+            counts, sheet_name, source_path = get_source_counts(region, device, use_cache)
+            missed = [s for s in unique if s["code"] not in processed]
+            in_src = sum(1 for s in missed if s["code"] in counts)
+            src_desc = f"{os.path.basename(source_path)} / {sheet_name}" if sheet_name else "원본 없음"
+            print(f"{region:<4} {label:<10} {len(unique):>5} {len(unique) - len(missed):>5} {len(missed):>5} "
+                  f"{in_src:>5} {len(missed) - in_src:>5} {sum(counts.values()):>7}  {src_desc}")
+    print("\n원본O: 빠진 학교 중 원본에 코드가 있는 학교(다시 분리 대상), 원본X: 원본에도 없는 학교")
+    print(f"상세 목록: python verify_missing_by_code.py --DNI --AP 등 | 소요 {time.time() - t0:.1f}초")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="학교코드 기준 빠진 학교 검증 (지역·장비별)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
-[지역] --DNI 또는 --CNE 중 하나 필수
-[장비] --AP, --switch, --security, --poe 중 하나 필수 (디폴트 없음)
+[지역] --DNI 또는 --CNE 중 하나 필수 (--all 제외)
+[장비] --AP, --switch, --security, --poe 중 하나 필수 (디폴트 없음, --all 제외)
+[전체] --all: 지역 2 × 장비 4 조합 요약 표
 
 예시:
   python verify_missing_by_code.py --DNI --AP
   python verify_missing_by_code.py --CNE --switch
   python verify_missing_by_code.py --dni -e security
   python verify_missing_by_code.py --cne --poe
+  python verify_missing_by_code.py --all
         """,
     )
-    reg = parser.add_mutually_exclusive_group(required=True)
+    parser.add_argument("--all", action="store_true", help="전체 지역 × 장비 조합을 표 하나로 검증")
+    parser.add_argument("--no-cache", action="store_true", help="원본 색인(JSON)을 쓰지 않고 원본을 다시 읽어 새로 저장")
+    reg = parser.add_mutually_exclusive_group()
     reg.add_argument("--DNI", "--dni", action="store_true", help="대전 (DJE) 지역")
     reg.add_argument("--CNE", "--cne", action="store_true", help="충남 지역")
 
-    dev = parser.add_mutually_exclusive_group(required=True)
+    dev = parser.add_mutually_exclusive_group()
     dev.add_argument("--AP", "--ap", action="store_true", help="AP 장비")
     dev.add_argument("--switch", "--Switch", "--SWITCH", action="store_true", help="스위치 장비")
     dev.add_argument("--security", "--Security", "--SECURITY", action="store_true", help="보안(SEUTM) 장비")
@@ -323,9 +416,17 @@ if __name__ == "__main__":
                      help="장비 지정 (AP/switch/security/poe, 대소문자 무관)")
 
     args = parser.parse_args()
+    use_cache = not args.no_cache
+    if args.all:
+        main_all(use_cache)
+    else:
+        if not (args.DNI or args.CNE):
+            parser.error("--DNI 또는 --CNE 중 하나가 필요합니다 (전체는 --all)")
+        if not (args.device or args.AP or args.switch or args.security or args.poe):
+            parser.error("--AP, --switch, --security, --poe, -e 중 하나가 필요합니다 (전체는 --all)")
 
-    region = "CNE" if args.CNE else "DNI"
+        region = "CNE" if args.CNE else "DNI"
 
-    device = args.device if args.device else ("AP" if args.AP else "switch" if args.switch else "security" if args.security else "poe")
+        device = args.device if args.device else ("AP" if args.AP else "switch" if args.switch else "security" if args.security else "poe")
 
-    main(region, device)
+        main(region, device, use_cache)
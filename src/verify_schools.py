@@ -14,6 +14,7 @@ import pandas as pd
 
 from .load_excel import load_va_data_sheets
 from .data_quality import run_va_quality_checks, DEFAULT_VA_PATH
+from .sheet_defs import remember_school_code_prefixes, school_code_prefixes
 
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
@@ -113,13 +114,10 @@ def filter_va_data_by_target(
         if sheet not in va_data or "관리번호" not in va_data[sheet].columns:
             continue
         df = va_data[sheet]
-        def prefix(row):
-            v = row.get("관리번호")
-            if pd.isna(v) or "-" not in str(v):
-                return None
-            return str(v).strip().split("-", 1)[0].strip()
-        prefixes = df.apply(prefix, axis=1)
-        out[sheet] = df[prefixes.isin(target_codes)].copy()
+        prefixes = school_code_prefixes(df)
+        mask = prefixes.isin(target_codes)
+        out[sheet] = df[mask].copy()
+        remember_school_code_prefixes(out[sheet], prefixes[mask])
     return out
 
 